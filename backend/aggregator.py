@@ -5,122 +5,117 @@ Computes derived metrics from raw mentions:
   - Platform breakdown (where mentions come from)
   - Trending topics extraction (deduplicated)
   - Net Sentiment Score
+  - Reach index (engagement percentile within each mention's platform)
   - Weekly trend snapshots
 """
 
 import re
+import statistics
 from collections import Counter
+
+import reach
 from config import BRAND_NAME
+from metrics import timed
 
 
-def compute_sentiment_distribution(mentions: list[dict]) -> list[dict]:
-    """
-    Compute positive / negative / neutral percentage breakdown.
-    """
-    if not mentions:
-        return [
-            {"label": "Positive", "value": 0, "count": 0},
-            {"label": "Negative", "value": 0, "count": 0},
-            {"label": "Neutral", "value": 0, "count": 0},
-        ]
+def sentiment_label(score: float) -> str:
+    if score > 0.15:
+        return "Positive"
+    if score < -0.15:
+        return "Negative"
+    return "Neutral"
 
-    positive = sum(1 for m in mentions if m["sentiment_score"] > 0.15)
-    negative = sum(1 for m in mentions if m["sentiment_score"] < -0.15)
-    neutral = len(mentions) - positive - negative
-    total = len(mentions)
 
+def sentiment_distribution_from_counts(counts: Counter) -> list[dict]:
+    """Distribution rows from {label: count} (kept incrementally by retention.py)."""
+    total = sum(counts.values())
     return [
-        {"label": "Positive", "value": round(positive / total * 100, 1), "count": positive},
-        {"label": "Negative", "value": round(negative / total * 100, 1), "count": negative},
-        {"label": "Neutral", "value": round(neutral / total * 100, 1), "count": neutral},
+        {
+            "label": label,
+            "value": round(counts.get(label, 0) / total * 100, 1) if total else 0,
+            "count": counts.get(label, 0),
+        }
+        for label in ("Positive", "Negative", "Neutral")
     ]
 
 
-def compute_platform_breakdown(mentions: list[dict]) -> list[dict]:
+@timed("leappulse_aggregate_seconds", stage="sentiment_distribution")
+def compute_sentiment_distribution(mentions: list[dict]) -> list[dict]:
     """
-    Count mentions per platform and return percentage breakdown.
+    Compute positive / negative / neutral percentage breakdown.
     """
-    if not mentions:
-        return []
+    return sentiment_distribution_from_counts(
+        Counter(sentiment_label(m["sentiment_score"]) for m in mentions)
+    )
 
-    platform_counts: Counter[str] = Counter()
-    for m in mentions:
-        platform_counts[m.get("platform", "Unknown")] += 1
 
-    total = sum(platform_counts.values())
+def platform_breakdown_from_counts(counts: Counter) -> list[dict]:
+    total = sum(counts.values())
     return [
         {
             "platform": platform,
             "mention_count": count,
             "percentage": round((count / total) * 100, 1),
         }
-        for platform, count in platform_counts.most_common()
+        for platform, count in sorted(counts.items(), key=lambda x: (-x[1], x[0]))
+        if count > 0
     ]
 
 
-def extract_trending_topics(mentions: list[dict], top_n: int = 8) -> list[dict]:
+@timed("leappulse_aggregate_seconds", stage="platform_breakdown")
+def compute_platform_breakdown(mentions: list[dict]) -> list[dict]:
     """
-    Extract hashtags and high-frequency keywords from mentions.
-    Returns top_n trending topics, deduplicated and merged.
+    Count mentions per platform and return percentage breakdown.
     """
-    tag_counter: Counter[str] = Counter()
-
-    for m in mentions:
-        content = m.get("content", "")
-        # Extract explicit hashtags
-        tags = re.findall(r"#(\w{3,30})", content)
-        for tag in tags:
-            tag_counter[f"#{tag.lower()}"] += 1
-
-    # Scan for common study-abroad domain keywords
-    # Use NON-OVERLAPPING categories to prevent duplicate counting
-    domain_keywords = {
-        "#visaupdates": ["visa update", "visa delay", "visa approved", "visa reject", "student visa"],
-        "#ielts": ["ielts"],
-        "#studyabroad": ["study abroad", "masters abroad", "ms abroad"],
-        "#scholarship": ["scholarship"],
-        "#universityranking": ["university ranking", "qs ranking"],
-        "#counselor": ["counselor", "counselling", "advisor"],
-        "#admissions": ["admission", "acceptance", "accepted", "got admitted"],
-        "#sopwriting": ["sop", "statement of purpose", "personal statement"],
-    }
-
-    for tag, keywords in domain_keywords.items():
-        count = sum(
-            1 for m in mentions
-            if any(kw in m.get("content", "").lower() for kw in keywords)
-        )
-        if count > 0:
-            tag_counter[tag] += count
-
-    # Merge similar/overlapping tags to prevent duplicates
-    # Build a map of canonical tag -> aliases
-    merge_map: dict[str, list[str]] = {
+    return platform_breakdown_from_counts(Counter(m.get("platform", "Unknown") for m in mentions))
+
+
+# Scan for common study-abroad domain keywords
+# Use NON-OVERLAPPING categories to prevent duplicate counting
+_DOMAIN_KEYWORDS = {
+    "#visaupdates": ["visa update", "visa delay", "visa approved", "visa reject", "student visa"],
+    "#ielts": ["ielts"],
+    "#studyabroad": ["study abroad", "masters abroad", "ms abroad"],
+    "#scholarship": ["scholarship"],
+    "#universityranking": ["university ranking", "qs ranking"],
+    "#counselor": ["counselor", "counselling", "advisor"],
+    "#admissions": ["admission", "acceptance", "accepted", "got admitted"],
+    "#sopwriting": ["sop", "statement of purpose", "personal statement"],
+}
+
+# Merge similar/overlapping tags to prevent duplicates: alias → canonical tag
+_TAG_ALIASES = {
+    alias: canonical
+    for canonical, aliases in {
         "#ielts": ["#ieltsprep", "#ieltstips", "#ieltsexam", "#ieltstest"],
         "#visaupdates": ["#studentvisa", "#visaupdate", "#visadelay"],
         "#studyabroad": ["#mastersabroad", "#msabroad", "#studyoverseas"],
         "#scholarship": ["#scholarshipalert", "#scholarships"],
         "#universityranking": ["#universityrankings", "#qsranking"],
-    }
+    }.items()
+    for alias in aliases
+}
 
-    # Merge aliases into canonical tags
-    merged: dict[str, int] = {}
-    used: set[str] = set()
-    for canonical, aliases in merge_map.items():
-        total = tag_counter.get(canonical, 0)
-        for alias in aliases:
-            total += tag_counter.get(alias, 0)
-            used.add(alias)
-        used.add(canonical)
-        if total > 0:
-            merged[canonical] = total
-
-    # Add remaining tags that weren't merged
-    for tag, count in tag_counter.items():
-        if tag not in used:
-            merged[tag] = merged.get(tag, 0) + count
-
-    topics = sorted(merged.items(), key=lambda x: x[1], reverse=True)[:top_n]
+_HASHTAG_RE = re.compile(r"#(\w{3,30})")
+
+
+def mention_topics(m: dict) -> list[str]:
+    """
+    Canonical topic tags one mention contributes: each explicit hashtag
+    occurrence, plus one per matching domain-keyword category.
+    """
+    content = m.get("content", "")
+    tags = [f"#{tag.lower()}" for tag in _HASHTAG_RE.findall(content)]
+    lower = content.lower()
+    tags.extend(
+        tag for tag, keywords in _DOMAIN_KEYWORDS.items()
+        if any(kw in lower for kw in keywords)
+    )
+    return [_TAG_ALIASES.get(tag, tag) for tag in tags]
+
+
+def topics_from_counts(counts: Counter, top_n: int = 8) -> list[dict]:
+    topics = sorted(((t, c) for t, c in counts.items() if c > 0), key=lambda x: x[1], reverse=True)[:top_n]
     return [
         {
             "tag": tag,
@@ -131,39 +126,90 @@ def extract_trending_topics(mentions: list[dict], top_n: int = 8) -> list[dict]:
     ]
 
 
-def compute_dashboard_metrics(mentions: list[dict]) -> dict:
+@timed("leappulse_aggregate_seconds", stage="trending_topics")
+def extract_trending_topics(mentions: list[dict], top_n: int = 8) -> list[dict]:
     """
-    Compute aggregate metrics for the dashboard hero section.
-    All mentions are LeapScholar-only (no competitors).
+    Extract hashtags and high-frequency keywords from mentions.
+    Returns top_n trending topics, deduplicated and merged.
     """
-    if not mentions:
+    counts: Counter[str] = Counter()
+    for m in mentions:
+        counts.update(mention_topics(m))
+    return topics_from_counts(counts, top_n)
+
+
+def dashboard_from_totals(
+    total: int,
+    sentiment_sum: float,
+    median_engagement: float,
+    reach_index: int,
+    previous_net_sentiment: int | None = None,
+) -> dict:
+    """Dashboard metrics from running totals (kept incrementally by retention.py)."""
+    if not total:
         return {
             "net_sentiment": 50,
             "sentiment_change": 0.0,
             "total_mentions": 0,
             "avg_engagement": 0.0,
+            "reach_index": 50,
         }
 
     # Net Sentiment Score: map [-1, 1] → [0, 100]
-    avg_sentiment = sum(m["sentiment_score"] for m in mentions) / len(mentions)
+    avg_sentiment = sentiment_sum / total
     net_sentiment = int(round((avg_sentiment + 1) * 50))  # 0-100 scale
     net_sentiment = max(0, min(100, net_sentiment))
 
-    # Total engagement
-    total_engagement = sum(
-        m.get("likes", 0) + m.get("shares", 0) + m.get("comments", 0)
-        for m in mentions
-    )
-    avg_engagement = round(total_engagement / len(mentions) / 1000, 1) if mentions else 0
+    # The median, in thousands: one viral post would own a mean
+    avg_engagement = round(median_engagement / 1000, 3)
+
+    sentiment_change = 0.0
+    if previous_net_sentiment:
+        sentiment_change = round((net_sentiment - previous_net_sentiment) / previous_net_sentiment * 100, 1)
 
     return {
         "net_sentiment": net_sentiment,
-        "sentiment_change": round((avg_sentiment + 0.05) * 10, 1),  # Simulated weekly delta
-        "total_mentions": len(mentions),
+        "sentiment_change": sentiment_change,  # % vs last week
+        "total_mentions": total,
         "avg_engagement": avg_engagement,
+        "reach_index": reach_index,
     }
 
 
+def median_engagement(mentions: list[dict]) -> float:
+    """Engagement of the typical mention (likes + shares + comments)."""
+    return statistics.median(reach.engagement(m) for m in mentions) if mentions else 0.0
+
+
+def reach_index(mentions: list[dict]) -> int:
+    """
+    Mean platform percentile → 0-100, so YouTube view counts don't drown
+    out Reddit upvotes (50 while a platform is still unsampled).
+    """
+    if not mentions:
+        return 50
+    percentiles = [reach.percentile(m["platform"], reach.engagement(m)) for m in mentions]
+    return int(round(sum(0.5 if p is None else p for p in percentiles) / len(mentions) * 100))
+
+
+@timed("leappulse_aggregate_seconds", stage="dashboard_metrics")
+def compute_dashboard_metrics(mentions: list[dict], previous_net_sentiment: int | None = None) -> dict:
+    """
+    Compute aggregate metrics for the dashboard hero section.
+    All mentions are LeapScholar-only (no competitors).
+    `previous_net_sentiment` is last week's score (see history.py); the
+    week-over-week change is 0 when it's unknown.
+    """
+    return dashboard_from_totals(
+        len(mentions),
+        sum(m["sentiment_score"] for m in mentions),
+        median_engagement(mentions),
+        reach_index(mentions),
+        previous_net_sentiment,
+    )
+
+
+@timed("leappulse_aggregate_seconds", stage="weekly_trend")
 def compute_weekly_trend(mentions: list[dict]) -> list[dict]:
     """
     Generates a 7-day trend based on sentiment of recent mentions.
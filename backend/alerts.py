@@ -0,0 +1,264 @@
+"""
+LeapPulse — Priority alert fast path
+CRITICAL ALERT / MARKETING GOLD mentions are published the moment the
+pipeline scores them, without waiting for the rest of the cycle:
+
+  pipeline.process → publish() → recent-alert queue
+                               → webhook dispatcher (background thread)
+                               → server push stream (SSE subscribers)
+
+In SCRAPE_MODE=workers, worker processes relay alert-worthy mentions
+through the job queue to one bus in the dispatcher, and the API replays
+what it published (relay()).
+
+Repeats of the same mention are dropped, and a token bucket per story
+(platform + content fingerprint) plus a global bucket keep one viral
+thread from flooding the channel. Suppressed alerts are counted and the
+count rides along on the next one that gets through; they are not
+remembered as seen, so the same mention can alert once tokens refill.
+
+bench/alert_check.py exercises delivery, retries and rate limiting
+against a local webhook sink.
+"""
+
+import asyncio
+import json
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+
+import metrics
+from config import ALERT_BURST, ALERT_RATE_PER_MINUTE, ALERT_WEBHOOK_URL
+from keys import mention_key
+
+ALERT_PRIORITIES = ("CRITICAL ALERT", "MARKETING GOLD")
+
+# Alert keys remembered for dedupe
+_DEDUPE_LIMIT = 10_000
+# Alerts kept for GET /api/alerts
+_RECENT_LIMIT = 200
+# Pending webhook deliveries before new ones are dropped
+_WEBHOOK_QUEUE_SIZE = 1000
+_WEBHOOK_RETRIES = 3
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_URL_RE = re.compile(r"https?://\S+|[@#]\w+")
+
+
+def story_key(m: dict) -> str:
+    """
+    Rough grouping of near-identical posts (retweets, quote chains, the
+    same headline across outlets): the first few words with links,
+    handles and hashtags stripped.
+    """
+    words = _WORD_RE.findall(_URL_RE.sub(" ", m.get("content", "").lower()))
+    return f"{m.get('platform')}|{' '.join(words[:8])}"
+
+
+class TokenBucket:
+    def __init__(self, rate_per_minute: float, burst: int):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def ready(self) -> bool:
+        """Refill, then say whether a token is available without taking it."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return self.tokens >= 1
+
+    def take(self) -> bool:
+        if self.ready():
+            self.tokens -= 1
+            return True
+        return False
+
+
+class AlertBus:
+    def __init__(
+        self,
+        webhook_url: str = ALERT_WEBHOOK_URL,
+        rate_per_minute: float = ALERT_RATE_PER_MINUTE,
+        burst: int = ALERT_BURST,
+    ):
+        self.webhook_url = webhook_url
+        self.rate_per_minute = rate_per_minute
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._seen: OrderedDict[str, None] = OrderedDict()
+        self._stories: OrderedDict[str, TokenBucket] = OrderedDict()
+        # The global bucket allows a few concurrent stories at once
+        self._global = TokenBucket(rate_per_minute * 4, burst * 4)
+        self._suppressed = 0
+        self.recent: deque[dict] = deque(maxlen=_RECENT_LIMIT)
+        self._subscribers: list[tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+        self._outbox: queue.Queue = queue.Queue(maxsize=_WEBHOOK_QUEUE_SIZE)
+        self._worker: threading.Thread | None = None
+
+    # ── Publishing ──
+
+    def publish(self, mention: dict) -> dict | None:
+        """
+        Offer a scored mention. Returns the alert if it was published,
+        None if it isn't alert-worthy, a duplicate or rate-limited.
+        Never blocks the pipeline.
+        """
+        priority = mention.get("priority")
+        if priority not in ALERT_PRIORITIES:
+            return None
+
+        key = mention_key(mention)
+        with self._lock:
+            if key in self._seen:
+                metrics.inc("leappulse_alerts_total", priority=priority, outcome="duplicate")
+                return None
+
+            story = story_key(mention)
+            bucket = self._stories.get(story)
+            if bucket is None:
+                bucket = self._stories[story] = TokenBucket(self.rate_per_minute, self.burst)
+                while len(self._stories) > _DEDUPE_LIMIT:
+                    self._stories.popitem(last=False)
+            self._stories.move_to_end(story)
+
+            # Both buckets must have a token before either is spent, and a
+            # suppressed mention stays unseen so a later re-scrape can alert
+            if not (bucket.ready() and self._global.ready()):
+                self._suppressed += 1
+                metrics.inc("leappulse_alerts_total", priority=priority, outcome="rate_limited")
+                return None
+            bucket.take()
+            self._global.take()
+            self._seen[key] = None
+            while len(self._seen) > _DEDUPE_LIMIT:
+                self._seen.popitem(last=False)
+
+            alert = {
+                "priority": priority,
+                "published_at": datetime.now().isoformat(),
+                "suppressed_since_last": self._suppressed,
+                "mention": mention,
+            }
+            self._suppressed = 0
+            self.recent.append(alert)
+            subscribers = list(self._subscribers)
+
+        metrics.inc("leappulse_alerts_total", priority=priority, outcome="published")
+        for loop, q in subscribers:
+            loop.call_soon_threadsafe(_offer, q, alert)
+        if self.webhook_url:
+            try:
+                self._outbox.put_nowait(alert)
+            except queue.Full:
+                metrics.inc("leappulse_alert_webhook_total", status="dropped")
+        return alert
+
+    def relay(self, alert: dict) -> None:
+        """
+        Show an alert another process published (the worker dispatcher):
+        recent list and push stream only, no dedupe or webhook here.
+        """
+        with self._lock:
+            self.recent.append(alert)
+            subscribers = list(self._subscribers)
+        for loop, q in subscribers:
+            loop.call_soon_threadsafe(_offer, q, alert)
+
+    # ── Push stream ──
+
+    def subscribe(self, maxsize: int = 100) -> asyncio.Queue:
+        """Register a queue on the running event loop that receives every alert."""
+        q: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        with self._lock:
+            self._subscribers.append((asyncio.get_running_loop(), q))
+        return q
+
+    def unsubscribe(self, q: asyncio.Queue) -> None:
+        with self._lock:
+            self._subscribers = [(loop, s) for loop, s in self._subscribers if s is not q]
+
+    # ── Webhook dispatcher ──
+
+    def start(self) -> None:
+        """Start the webhook dispatcher thread (no-op without a webhook URL)."""
+        if not self.webhook_url or (self._worker and self._worker.is_alive()):
+            return
+        self._worker = threading.Thread(target=self._dispatch_loop, name="alert-webhook", daemon=True)
+        self._worker.start()
+
+    def drain(self, timeout: float = 10) -> bool:
+        """Wait for queued webhook deliveries. True if the queue emptied in time."""
+        deadline = time.monotonic() + timeout
+        while self._outbox.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.05)
+        return not self._outbox.unfinished_tasks
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            alert = self._outbox.get()
+            try:
+                self._deliver(alert)
+            finally:
+                self._outbox.task_done()
+
+    def _deliver(self, alert: dict) -> None:
+        import requests  # deferred: only needed once a webhook fires
+
+        body = json.dumps(alert, default=str)
+        for attempt in range(_WEBHOOK_RETRIES):
+            try:
+                resp = requests.post(
+                    self.webhook_url,
+                    data=body,
+                    headers={"Content-Type": "application/json"},
+                    timeout=5,
+                )
+                metrics.inc("leappulse_alert_webhook_total", status=str(resp.status_code))
+                if resp.status_code < 500:
+                    return
+            except requests.RequestException:
+                metrics.inc("leappulse_alert_webhook_total", status="error")
+            time.sleep(2 ** attempt)
+        print(f"  ✗ Alert webhook failed after {_WEBHOOK_RETRIES} attempts")
+
+
+def _offer(q: asyncio.Queue, alert: dict) -> None:
+    # A slow stream client loses its oldest alerts rather than stalling others
+    if q.full():
+        q.get_nowait()
+    q.put_nowait(alert)
+
+
+_bus: AlertBus | None = None
+_bus_lock = threading.Lock()
+
+
+def get_bus() -> AlertBus:
+    global _bus
+    with _bus_lock:
+        if _bus is None:
+            _bus = AlertBus()
+    return _bus
+
+
+# Set in scrape worker processes: alert-worthy mentions go to the
+# dispatcher's bus instead of one per worker (see worker.py)
+_relay = None
+
+
+def set_relay(offer) -> None:
+    global _relay
+    _relay = offer
+
+
+def publish(mention: dict) -> dict | None:
+    if _relay is not None:
+        if mention.get("priority") in ALERT_PRIORITIES:
+            _relay(mention)
+        return None
+    return get_bus().publish(mention)
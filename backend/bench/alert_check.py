@@ -0,0 +1,81 @@
+"""
+LeapPulse — Alert delivery check
+Drives an AlertBus against the local webhook sink and checks the three
+things a real endpoint can't easily show: every published alert is
+delivered, 5xx answers are retried, and a rate-limited mention neither
+spends tokens nor is remembered as seen.
+
+Usage (from backend/):
+  python -m bench.alert_check          # exits 1 if a check fails
+"""
+
+import sys
+
+from alerts import AlertBus
+from bench.webhook_sink import WebhookSink
+
+
+def _mention(i: int, story: str = "story", priority: str = "CRITICAL ALERT") -> dict:
+    return {
+        "platform": "Reddit",
+        # Same opening words, so one story per `story`
+        "content": f"{story} LeapScholar refund scam complaint thread on reddit, post {i}",
+        "source_url": f"https://reddit.com/r/x/{story}/{i}",
+        "priority": priority,
+    }
+
+
+def check_delivery() -> bool:
+    with WebhookSink() as sink:
+        bus = AlertBus(sink.url, rate_per_minute=60, burst=10)
+        bus.start()
+        published = [bus.publish(_mention(i, f"story{i}")) for i in range(5)]
+        bus.drain()
+        bodies = [r["mention"]["source_url"] for r in sink.received]
+    return all(published) and bodies == [a["mention"]["source_url"] for a in published]
+
+
+def check_retries() -> bool:
+    with WebhookSink(fail_first=2) as sink:
+        bus = AlertBus(sink.url, rate_per_minute=60, burst=10)
+        bus.start()
+        bus.publish(_mention(0))
+        bus.drain()
+    return sink.attempts == 3 and len(sink.received) == 1
+
+
+def check_rate_limit() -> bool:
+    bus = AlertBus("", rate_per_minute=0, burst=2)
+    viral = [bus.publish(_mention(i, "viral")) for i in range(4)]
+    # Global bucket empty: the story is rejected without spending its own tokens
+    bus._global.tokens = 0
+    blocked = bus.publish(_mention(0, "quiet"))
+    bus._global.tokens = bus._global.capacity
+    # The rejected mention stayed unseen, so offered again it alerts
+    quiet = [bus.publish(_mention(i, "quiet")) for i in range(2)]
+    return (
+        sum(a is not None for a in viral) == 2
+        and blocked is None
+        and all(quiet)
+        and quiet[0]["suppressed_since_last"] == 3
+    )
+
+
+CHECKS = {
+    "delivery": check_delivery,
+    "retries": check_retries,
+    "rate_limit": check_rate_limit,
+}
+
+
+def main() -> None:
+    failed = 0
+    for name, check in CHECKS.items():
+        ok = check()
+        failed += not ok
+        print(f"  {'✓' if ok else '✗'} {name}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
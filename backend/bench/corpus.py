@@ -0,0 +1,82 @@
+"""
+LeapPulse — Synthetic mention corpora
+Deterministic generator of raw items shaped like scraper output, for
+benchmarking the pipeline and aggregator at 1k – 1M items.
+"""
+
+import random
+
+PLATFORMS = ["Reddit", "Twitter", "LinkedIn", "GoogleNews", "YouTube"]
+
+_BRANDS = ["LeapScholar", "leapscholar", "Leap Scholar", "leap scholar"]
+
+_OPENERS = [
+    "{brand} counselor", "My experience with {brand}", "{brand} IELTS prep",
+    "{brand} visa team", "Update on {brand}", "{brand} scholarship desk",
+    "Thoughts on {brand}", "{brand} SOP review",
+]
+_POSITIVE = [
+    "was excellent and super helpful", "made the whole process seamless",
+    "is amazing, highly recommend", "got admitted to my dream university",
+    "helped me score band 8, thank you", "was smooth and fantastic",
+]
+_NEGATIVE = [
+    "is terrible, no response for weeks", "has hidden fees and is misleading",
+    "was rude and unprofessional", "delayed my visa update again",
+    "feels like a scam, avoid", "was disappointing and confusing",
+]
+_NEUTRAL = [
+    "webinar is on Friday", "posted new deadlines for the fall intake",
+    "is hiring counsellors in Pune", "shared a list of universities",
+    "changed their office hours", "published a study abroad guide",
+]
+_CRISIS = [
+    "data breach leaked my passport details", "consumer court case filed",
+    "legal action over refund fraud", "going viral for the wrong reasons",
+]
+_TAGS = [
+    "#studyabroad", "#ielts", "#visaupdates", "#scholarship", "#admissions",
+    "#mastersabroad", "#canada", "#germany", "#ukvisa", "#sop",
+]
+_NOISE = [
+    "Leap year plans for the long weekend",
+    "Scholar's library opening hours changed",
+    "Yocket vs IDP for Germany, which is better?",
+]
+
+
+def generate(n: int, seed: int = 42, relevant_ratio: float = 0.9) -> list[dict]:
+    """Return `n` raw items (platform, key, content, likes, shares, comments, …)."""
+    rng = random.Random(seed)
+    items: list[dict] = []
+    for i in range(n):
+        platform = rng.choice(PLATFORMS)
+        if rng.random() > relevant_ratio:
+            content = rng.choice(_NOISE)
+        else:
+            bucket = rng.random()
+            if bucket < 0.35:
+                tail = rng.choice(_POSITIVE)
+            elif bucket < 0.65:
+                tail = rng.choice(_NEGATIVE)
+            elif bucket < 0.7:
+                tail = rng.choice(_CRISIS)
+            else:
+                tail = rng.choice(_NEUTRAL)
+            opener = rng.choice(_OPENERS).format(brand=rng.choice(_BRANDS))
+            tags = " ".join(rng.sample(_TAGS, rng.randint(0, 3)))
+            content = f"{opener} {tail}. {tags}".strip()
+
+        # Heavy-tailed engagement, like real social data
+        likes = int(rng.paretovariate(1.2) * 5) - 5
+        items.append({
+            "platform": platform,
+            "key": f"syn-{seed}-{i}",
+            "content": content[:500],
+            "likes": max(0, likes),
+            "shares": max(0, likes // rng.randint(3, 10)),
+            "comments": max(0, likes // rng.randint(2, 8)),
+            "author": f"user_{rng.randint(1, n // 3 + 1)}",
+            "source_url": f"https://example.com/{platform.lower()}/{i}",
+        })
+    return items
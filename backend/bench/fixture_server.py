@@ -0,0 +1,85 @@
+"""
+LeapPulse — Benchmark fixture server
+Serves recorded responses for every upstream the scrapers hit, so the
+pipeline can be exercised end-to-end with no network access.
+
+Requests are rewritten from  https://<host>/<path>  to
+http://127.0.0.1:<port>/<host>/<path>  via scrapers.http.set_url_rewriter.
+"""
+
+import fnmatch
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+# (host glob, path glob) → (fixture file, content type)
+ROUTES = [
+    ("www.reddit.com", "/search.json", "reddit_search.json", "application/json"),
+    ("www.reddit.com", "/r/*/search.json", "reddit_search.json", "application/json"),
+    ("www.reddit.com", "/comments/*.json", "reddit_comments.json", "application/json"),
+    ("www.reddit.com", "/api/morechildren.json", "reddit_morechildren.json", "application/json"),
+    ("nitter.*", "/search", "nitter_search.html", "text/html; charset=utf-8"),
+    ("nitter.*", "/", "nitter_home.html", "text/html; charset=utf-8"),
+    ("news.google.com", "/rss/search", "google_news.rss", "application/rss+xml"),
+    ("www.google.com", "/search", "google_serp.html", "text/html; charset=utf-8"),
+    ("www.youtube.com", "/results", "youtube_results.html", "text/html; charset=utf-8"),
+]
+
+
+def _resolve(host: str, path: str) -> tuple[bytes, str] | None:
+    for host_glob, path_glob, name, ctype in ROUTES:
+        if fnmatch.fnmatch(host, host_glob) and fnmatch.fnmatch(path, path_glob):
+            return (FIXTURES / name).read_bytes(), ctype
+    return None
+
+
+class FixtureServer:
+    """Threaded local HTTP server. Use as a context manager."""
+
+    def __init__(self, latency_ms: float = 0):
+        self.latency = latency_ms / 1000
+        self.hits = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                host, _, rest = parts.path.lstrip("/").partition("/")
+                found = _resolve(host, "/" + rest)
+                if server.latency:
+                    time.sleep(server.latency)
+                server.hits += 1
+                if found is None:
+                    self.send_error(404, f"No fixture for {host}/{rest}")
+                    return
+                body, ctype = found
+                self.send_response(200)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_port}"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def rewrite(self, url: str) -> str:
+        parts = urlsplit(url)
+        if parts.hostname in ("127.0.0.1", "localhost"):
+            return url
+        return f"{self.url}/{parts.hostname}{parts.path or '/'}" + (f"?{parts.query}" if parts.query else "")
+
+    def __enter__(self) -> "FixtureServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
@@ -0,0 +1,90 @@
+"""
+LeapPulse — Record / replay load harness
+Replays an HTTP archive recorded with `main.py --record` (see
+scrapers/replay.py) through the real pipeline, optionally at a multiple
+of the recorded volume: --volume N runs N copies of every source
+concurrently, each fetching (and parsing, filtering, scoring) the whole
+recording. Copies share the process-wide caches (language, reach), the
+same as repeat scrapes of unchanged posts would.
+
+Usage (from backend/):
+  python main.py --record recordings/cycle.jsonl.gz       # one live cycle
+  python -m bench.replay recordings/cycle.jsonl.gz                     # real speed
+  python -m bench.replay recordings/cycle.jsonl.gz --speed 0 --volume 50
+  python -m bench.replay recordings/cycle.jsonl.gz --full   # main.run_scrape_cycle, publishes!
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+import metrics
+from config import BRAND_NAME
+from pipeline import collect_all
+from scrapers import http
+from scrapers.registry import all_sources
+from scrapers.replay import Replayer
+
+
+async def _load(volume: int) -> list[int]:
+    runs = [collect_all(all_sources(), BRAND_NAME, deadline=None) for _ in range(volume)]
+    return [sum(len(ms) for ms in out.values()) for out in await asyncio.gather(*runs)]
+
+
+def run(path: str, speed: float, volume: int, full: bool = False) -> dict:
+    replayer = Replayer(path, speed=speed)
+    http.set_replayer(replayer)
+    metrics.reset()
+    start = time.perf_counter()
+    try:
+        if full:
+            import main
+
+            main.run_scrape_cycle()
+            mentions = None
+        else:
+            mentions = sum(asyncio.run(_load(volume)))
+    finally:
+        http.set_replayer(None)
+    elapsed = time.perf_counter() - start
+    return {
+        **replayer.stats(),
+        "volume": 1 if full else volume,
+        "mentions": mentions,
+        "seconds": round(elapsed, 3),
+        "requests_per_sec": round(replayer.served / elapsed, 1) if elapsed else None,
+        "mentions_per_sec": round(mentions / elapsed, 1) if mentions and elapsed else None,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay a recorded scrape through the pipeline")
+    parser.add_argument("archive", help="archive written by main.py --record")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="latency divisor: 1 = as recorded, 10 = ten times faster, 0 = no waiting")
+    parser.add_argument("--volume", type=int, default=1, help="concurrent copies of every source")
+    parser.add_argument("--full", action="store_true",
+                        help="run main.run_scrape_cycle instead (publishes to the configured storage)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    result = run(args.archive, args.speed, max(1, args.volume), args.full)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 0
+
+    print(f"\nReplayed {result['path']} (recorded {result['recorded_at']})")
+    print(f"  {result['served']} responses served, {result['misses']} missing, "
+          f"{result['volume']}× volume at {result['speed']:g}× speed")
+    print(f"  {result['seconds']:.2f}s — {result['requests_per_sec']} req/s"
+          + (f", {result['mentions']} mentions ({result['mentions_per_sec']}/s)" if result["mentions"] else ""))
+    print("\nStage timings recorded by metrics.py:")
+    for series, s in sorted(metrics.summary().items()):
+        print(f"  {series:<70} n={s['count']:<8} mean={s['mean'] * 1e3:.3f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+"""
+LeapPulse — Offline benchmark suite
+
+  1. Replays recorded Reddit / Nitter / Google News / Google SERP / YouTube
+     responses from a local fixture server through every registered
+     source (fetch → parse → filter → score), with politeness delays off.
+  2. Runs synthetic corpora through each pipeline stage and the
+     aggregator, reporting throughput and per-item latency.
+  3. Compares against a saved baseline and exits non-zero when any stage
+     regresses past the threshold.
+
+No network access is needed — every outgoing URL is rewritten to the
+fixture server.
+
+Usage (from backend/):
+  python -m bench.run                              # 1k + 10k corpora
+  python -m bench.run --sizes 1000,100000,1000000 --score-limit 100000
+  python -m bench.run --save-baseline bench/baseline.json
+  python -m bench.run --baseline bench/baseline.json --threshold 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+
+import metrics
+import pipeline
+from aggregator import (
+    compute_sentiment_distribution,
+    compute_platform_breakdown,
+    extract_trending_topics,
+    compute_dashboard_metrics,
+    compute_weekly_trend,
+)
+from bench import corpus
+from bench.fixture_server import FixtureServer
+from config import BRAND_NAME, is_relevant_mention
+from scrapers import http
+from scrapers.base import Source
+from scrapers.registry import all_sources
+from sentiment import (
+    analyze_sentiment,
+    cascade_sentiment,
+    compute_priority_contextual,
+    escalation_fraction,
+)
+
+_CHUNK = 256
+_NOISE_FLOOR_SECONDS = 0.01
+
+
+class CorpusSource(Source):
+    """Feeds a pre-generated corpus through the real pipeline."""
+
+    name = "corpus"
+    label = "Corpus"
+    delay = 0.0
+
+    def __init__(self, items: list[dict]):
+        self.items = items
+
+    def jobs(self, brand: str) -> list[dict]:
+        return [{"query": "corpus"}]
+
+    async def fetch(self, brand: str, job: dict):
+        for item in self.items:
+            yield item
+
+
+def _measure(fn, items: list) -> dict:
+    """Run `fn` over items in chunks; report throughput and per-item latency."""
+    per_item: list[float] = []
+    start = time.perf_counter()
+    for i in range(0, len(items), _CHUNK):
+        chunk = items[i:i + _CHUNK]
+        t0 = time.perf_counter()
+        for item in chunk:
+            fn(item)
+        per_item.append((time.perf_counter() - t0) / len(chunk))
+    elapsed = time.perf_counter() - start
+    return _result(len(items), elapsed, per_item)
+
+
+def _result(n: int, elapsed: float, per_item: list[float] | None = None) -> dict:
+    out = {
+        "items": n,
+        "seconds": round(elapsed, 4),
+        "items_per_sec": round(n / elapsed, 1) if elapsed else float("inf"),
+    }
+    if per_item:
+        per_item = sorted(per_item)
+        out["p50_us"] = round(statistics.median(per_item) * 1e6, 2)
+        out["p95_us"] = round(per_item[min(len(per_item) - 1, int(len(per_item) * 0.95))] * 1e6, 2)
+    return out
+
+
+def bench_sources(latency_ms: float) -> dict:
+    """End-to-end replay of every registered source against the fixtures."""
+    results = {}
+    with FixtureServer(latency_ms=latency_ms) as server:
+        http.set_url_rewriter(server.rewrite)
+        try:
+            for source in all_sources():
+                source.delay = 0.0
+                start = time.perf_counter()
+                mentions = asyncio.run(pipeline.collect(source, BRAND_NAME))
+                elapsed = time.perf_counter() - start
+                results[f"source.{source.name}"] = _result(len(mentions), elapsed)
+        finally:
+            http.set_url_rewriter(None)
+    return results
+
+
+def bench_corpus(n: int, score_limit: int) -> dict:
+    items = corpus.generate(n)
+    scored_items = items[:score_limit]
+    results = {}
+
+    results[f"relevance@{n}"] = _measure(
+        lambda r: is_relevant_mention(r["content"], BRAND_NAME), items
+    )
+    results[f"sentiment@{len(scored_items)}"] = _measure(
+        lambda r: analyze_sentiment(r["content"]), scored_items
+    )
+    results[f"cascade@{len(scored_items)}"] = _measure(
+        lambda r: cascade_sentiment(r["content"], r["likes"]), scored_items
+    )
+    results[f"priority@{len(scored_items)}"] = _measure(
+        lambda r: compute_priority_contextual(-0.4, r["likes"], r["content"]), scored_items
+    )
+
+    start = time.perf_counter()
+    mentions = asyncio.run(pipeline.collect(CorpusSource(scored_items), BRAND_NAME))
+    results[f"pipeline@{len(scored_items)}"] = _result(len(scored_items), time.perf_counter() - start)
+
+    # Aggregates run over the full corpus size, reusing scores cyclically
+    if len(mentions) < n and mentions:
+        mentions = (mentions * (n // len(mentions) + 1))[:n]
+    for label, fn in [
+        ("sentiment_distribution", compute_sentiment_distribution),
+        ("platform_breakdown", compute_platform_breakdown),
+        ("trending_topics", extract_trending_topics),
+        ("dashboard_metrics", compute_dashboard_metrics),
+        ("weekly_trend", compute_weekly_trend),
+    ]:
+        start = time.perf_counter()
+        fn(mentions)
+        results[f"aggregate.{label}@{len(mentions)}"] = _result(len(mentions), time.perf_counter() - start)
+
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return a message for every stage slower than baseline by > threshold."""
+    regressions = []
+    for stage, base in baseline.items():
+        current = results.get(stage)
+        # Sub-10ms stages are dominated by timer noise
+        if not current or base["seconds"] < _NOISE_FLOOR_SECONDS:
+            continue
+        floor = base["items_per_sec"] * (1 - threshold)
+        if current["items_per_sec"] < floor:
+            drop = 1 - current["items_per_sec"] / base["items_per_sec"]
+            regressions.append(
+                f"{stage}: {current['items_per_sec']:.1f}/s vs baseline "
+                f"{base['items_per_sec']:.1f}/s ({drop:.0%} slower)"
+            )
+    return regressions
+
+
+def _print_table(results: dict) -> None:
+    print(f"\n{'stage':<44} {'items':>9} {'seconds':>9} {'items/s':>12} {'p50 µs':>9} {'p95 µs':>9}")
+    print("─" * 96)
+    for stage, r in results.items():
+        print(
+            f"{stage:<44} {r['items']:>9} {r['seconds']:>9.3f} {r['items_per_sec']:>12.1f}"
+            f" {r.get('p50_us', ''):>9} {r.get('p95_us', ''):>9}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="LeapPulse offline benchmarks")
+    parser.add_argument("--sizes", default="1000,10000", help="comma-separated corpus sizes")
+    parser.add_argument("--score-limit", type=int, default=100_000,
+                        help="cap on items sent through sentiment / full pipeline per size")
+    parser.add_argument("--latency-ms", type=float, default=0, help="simulated upstream latency")
+    parser.add_argument("--skip-sources", action="store_true", help="skip fixture replay")
+    parser.add_argument("--baseline", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed throughput drop (0.2 = 20%%)")
+    parser.add_argument("--save-baseline", help="write results to this JSON file")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    metrics.reset()
+    results: dict = {}
+    if not args.skip_sources:
+        results.update(bench_sources(args.latency_ms))
+    for n in (int(s) for s in args.sizes.split(",") if s):
+        results.update(bench_corpus(n, args.score_limit))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        _print_table(results)
+        print(f"\nSentiment cascade escalated {escalation_fraction():.1%} of items")
+        print("\nStage timings recorded by metrics.py:")
+        for series, s in sorted(metrics.summary().items()):
+            print(f"  {series:<70} n={s['count']:<8} mean={s['mean'] * 1e3:.3f} ms")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline written to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n✗ {len(regressions)} stage(s) regressed past {args.threshold:.0%}:")
+            for msg in regressions:
+                print(f"  {msg}")
+            return 1
+        print(f"\n✓ No regressions past {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+LeapPulse — Sentiment scorer comparison
+Throughput and accuracy of TextBlob vs the ONNX transformer backend,
+each alone and behind the lexicon cascade.
+
+  - accuracy: 3-class (negative / neutral / positive) agreement with a
+    hand-labelled set of brand mentions, including sarcasm and Hinglish
+  - false alarms: non-negative items scored below -0.2, which is what
+    lets compute_priority_contextual raise a CRITICAL ALERT
+  - priority agreement: share of items (labelled set plus corpus) given
+    the same compute_priority_contextual priority as the scorer alone,
+    so a cascade that pushes items over an alert threshold shows up even
+    when 3-class accuracy doesn't move
+  - throughput: items/s over a synthetic corpus
+
+Usage (from backend/):
+  python -m bench.sentiment_eval
+  SENTIMENT_MODEL_DIR=models/sentiment python -m bench.sentiment_eval --size 20000
+"""
+
+import argparse
+import json
+import time
+
+import metrics
+import sentiment
+from bench import corpus
+from bench.fixture_server import FIXTURES
+from sentiment import compute_priority_contextual, escalation_fraction, lexicon_sentiment, textblob_sentiment
+
+LABELLED = FIXTURES / "sentiment_labeled.jsonl"
+
+# Scores inside ±NEUTRAL_BAND count as neutral
+NEUTRAL_BAND = 0.1
+
+
+def _cls(score: float) -> int:
+    if score > NEUTRAL_BAND:
+        return 1
+    if score < -NEUTRAL_BAND:
+        return -1
+    return 0
+
+
+def cascaded(score_many):
+    """Wrap a batch scorer with the lexicon tier: only escalated texts reach it."""
+    def run(texts: list[str]) -> list[float]:
+        settled = [lexicon_sentiment(t) for t in texts]
+        escalated = [t for t, s in zip(texts, settled) if s is None]
+        scores = iter(score_many(escalated) if escalated else [])
+        return [s if s is not None else next(scores) for s in settled]
+    return run
+
+
+def priorities(score_many, items: list[dict]) -> list[str]:
+    scores = score_many([i["content"] for i in items])
+    return [compute_priority_contextual(s, i.get("likes", 0), i["content"]) for s, i in zip(scores, items)]
+
+
+def evaluate(name: str, score_many, texts: list[str], reference: list[str], items: list[dict]) -> dict:
+    rows = [json.loads(line) for line in LABELLED.read_text().splitlines() if line.strip()]
+    predicted = score_many([r["text"] for r in rows])
+    correct = sum(_cls(p) == r["label"] for p, r in zip(predicted, rows))
+    non_negative = [p for p, r in zip(predicted, rows) if r["label"] >= 0]
+    false_alarms = sum(p < -0.2 for p in non_negative)
+    agree = sum(p == r for p, r in zip(priorities(score_many, items), reference))
+
+    score_many(texts[:64])  # warm-up
+    metrics.reset()
+    start = time.perf_counter()
+    score_many(texts)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "scorer": name,
+        "accuracy": round(correct / len(rows), 3),
+        "false_alarm_rate": round(false_alarms / len(non_negative), 3) if non_negative else 0.0,
+        "priority_agreement": round(agree / len(items), 3),
+        "items": len(texts),
+        "items_per_sec": round(len(texts) / elapsed, 1) if elapsed else float("inf"),
+        "escalated": escalation_fraction(),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare sentiment scorers")
+    parser.add_argument("--size", type=int, default=5000, help="corpus size for throughput")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+    # Measure the cascade even though SENTIMENT_CASCADE is off by default
+    sentiment.SENTIMENT_CASCADE = True
+
+    generated = corpus.generate(args.size)
+    texts = [item["content"] for item in generated]
+    labelled = [{"content": json.loads(line)["text"]} for line in LABELLED.read_text().splitlines() if line.strip()]
+    items = labelled + generated
+    textblob_many = lambda ts: [textblob_sentiment(t) for t in ts]
+    reference = priorities(textblob_many, items)
+    results = [
+        evaluate("textblob", textblob_many, texts, reference, items),
+        evaluate("cascade+textblob", cascaded(textblob_many), texts, reference, items),
+    ]
+
+    from sentiment_onnx import load_scorer
+
+    scorer = load_scorer()
+    if scorer is not None:
+        reference = priorities(scorer.score_many, items)
+        results.append(evaluate("onnx", scorer.score_many, texts, reference, items))
+        results.append(evaluate("cascade+onnx", cascaded(scorer.score_many), texts, reference, items))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"\n{'scorer':<18} {'accuracy':>9} {'false alarms':>13} {'priority agr.':>14}"
+          f" {'items':>8} {'items/s':>10} {'escalated':>10}")
+    print("─" * 88)
+    for r in results:
+        escalated = f"{r['escalated']:.1%}" if r["escalated"] is not None else "—"
+        print(f"{r['scorer']:<18} {r['accuracy']:>9.1%} {r['false_alarm_rate']:>13.1%}"
+              f" {r['priority_agreement']:>14.1%} {r['items']:>8} {r['items_per_sec']:>10.1f} {escalated:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+LeapPulse — Local webhook stand-in
+Records every JSON POST it receives, so the alert dispatcher can be
+exercised without a real Slack / PagerDuty endpoint.
+
+Usage (from backend/):
+  python -m bench.webhook_sink --port 9009
+  ALERT_WEBHOOK_URL=http://127.0.0.1:9009/hook python main.py
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class WebhookSink:
+    """Threaded local HTTP server that stores received payloads. Use as a context manager."""
+
+    def __init__(self, port: int = 0, status: int = 200, verbose: bool = False, fail_first: int = 0):
+        self.received: list[dict] = []
+        self.status = status
+        self.fail_first = fail_first   # answer 500 to this many POSTs first
+        self.attempts = 0
+        sink = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"null")
+                sink.attempts += 1
+                if sink.attempts <= sink.fail_first:
+                    self.send_response(500)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                sink.received.append(payload)
+                if verbose:
+                    mention = (payload or {}).get("mention", {})
+                    print(f"  ← {payload.get('priority')}: {mention.get('platform')} "
+                          f"{mention.get('content', '')[:80]!r}")
+                self.send_response(sink.status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_port}/hook"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def wait_for(self, n: int, timeout: float = 5) -> bool:
+        deadline = time.monotonic() + timeout
+        while len(self.received) < n and time.monotonic() < deadline:
+            time.sleep(0.02)
+        return len(self.received) >= n
+
+    def __enter__(self) -> "WebhookSink":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local alert webhook stand-in")
+    parser.add_argument("--port", type=int, default=9009)
+    parser.add_argument("--status", type=int, default=200, help="HTTP status to answer with")
+    args = parser.parse_args()
+    with WebhookSink(args.port, args.status, verbose=True) as sink:
+        print(f"Listening on {sink.url} — Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print(f"\nReceived {len(sink.received)} alerts")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,10 +12,130 @@ load_dotenv()
 SUPABASE_URL: str = os.getenv("SUPABASE_URL", "")
 SUPABASE_SERVICE_KEY: str = os.getenv("SUPABASE_SERVICE_KEY", "")
 
+# Where scraped data is stored: "supabase" (remote) or "sqlite" (embedded local file)
+STORAGE_BACKEND: str = os.getenv("STORAGE_BACKEND", "supabase").lower()
+SQLITE_PATH: str = os.getenv("SQLITE_PATH", "leappulse.db")
+
+# Per-source circuit breakers: open when BREAKER_ERROR_RATE of the last
+# BREAKER_WINDOW jobs failed (after at least BREAKER_MIN_CALLS)
+BREAKER_WINDOW: int = int(os.getenv("BREAKER_WINDOW", "10"))
+BREAKER_MIN_CALLS: int = int(os.getenv("BREAKER_MIN_CALLS", "4"))
+BREAKER_ERROR_RATE: float = float(os.getenv("BREAKER_ERROR_RATE", "0.5"))
+BREAKER_COOLDOWN_SECONDS: float = float(os.getenv("BREAKER_COOLDOWN_SECONDS", "300"))
+BREAKER_MAX_COOLDOWN_SECONDS: float = float(os.getenv("BREAKER_MAX_COOLDOWN_SECONDS", "3600"))
+
+# Whole-cycle time limit; sources still fetching are cancelled (0 = none)
+CYCLE_DEADLINE_SECONDS: float = float(os.getenv("CYCLE_DEADLINE_SECONDS", "180"))
+
+# Who scrapes: "inline" (the API's leader process) or "workers" (worker.py
+# processes fed from a durable job queue; the API only reads snapshots)
+SCRAPE_MODE: str = os.getenv("SCRAPE_MODE", "inline").lower()
+SCRAPE_WORKERS: int = int(os.getenv("SCRAPE_WORKERS", str(os.cpu_count() or 2)))
+JOBQUEUE_PATH: str = os.getenv("JOBQUEUE_PATH", "leappulse_jobs.db")
+# A claimed job is handed to another worker if not finished within the lease
+JOB_LEASE_SECONDS: float = float(os.getenv("JOB_LEASE_SECONDS", "300"))
+JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+# Shared dashboard snapshot + leader lock for multi-worker API deployments
+SNAPSHOT_PATH: str = os.getenv("SNAPSHOT_PATH", "leappulse_snapshot.bin")
+LEADER_LOCK_PATH: str = os.getenv("LEADER_LOCK_PATH", "leappulse.leader.lock")
+
+# Full-text search index (SQLite FTS5), kept whichever storage backend is used
+SEARCH_DB_PATH: str = os.getenv("SEARCH_DB_PATH", "leappulse_search.db")
+
 BRAND_NAME: str = os.getenv("BRAND_NAME", "LeapScholar")
 
 SCRAPE_INTERVAL: int = int(os.getenv("SCRAPE_INTERVAL_MINUTES", "15"))
 
+# Random ± fraction applied to every per-source interval
+SCHEDULE_JITTER: float = float(os.getenv("SCHEDULE_JITTER", "0.1"))
+
+# How long sources poll at their minimum interval after a new CRITICAL ALERT
+CRISIS_MODE_MINUTES: int = int(os.getenv("CRISIS_MODE_MINUTES", "60"))
+
+# Sentiment scorer: "textblob" (default) or "onnx" (transformer, see sentiment_onnx.py)
+SENTIMENT_BACKEND: str = os.getenv("SENTIMENT_BACKEND", "textblob").lower()
+SENTIMENT_MODEL_DIR: str = os.getenv("SENTIMENT_MODEL_DIR", "models/sentiment")
+SENTIMENT_THREADS: int = int(os.getenv("SENTIMENT_THREADS", "2"))
+SENTIMENT_MAX_BATCH: int = int(os.getenv("SENTIMENT_MAX_BATCH", "32"))
+SENTIMENT_MAX_WAIT_MS: float = float(os.getenv("SENTIMENT_MAX_WAIT_MS", "5"))
+SENTIMENT_QUEUE_SIZE: int = int(os.getenv("SENTIMENT_QUEUE_SIZE", "1024"))
+
+# Sentiment cascade: a compiled keyword lexicon settles mild praise and
+# only the rest go to the scorer above. Off by default: it only pays off in
+# front of the transformer backend, and most items escalate anyway
+SENTIMENT_CASCADE: bool = os.getenv("SENTIMENT_CASCADE", "false").lower() in ("1", "true", "yes")
+# Keyword hits one side must lead by for the lexicon to settle an item;
+# a bigger lead is escalated, since the full scorer may give it a priority
+CASCADE_MIN_MARGIN: int = int(os.getenv("CASCADE_MIN_MARGIN", "1"))
+# Items with at least this reach always escalate (CRITICAL ALERT fires above 50)
+CASCADE_ESCALATE_REACH: int = int(os.getenv("CASCADE_ESCALATE_REACH", "25"))
+# Always escalate items with crisis keywords
+CASCADE_ESCALATE_CRISIS: bool = os.getenv("CASCADE_ESCALATE_CRISIS", "true").lower() in ("1", "true", "yes")
+
+# Target for `import server` (see startup.py); over-budget startups are logged
+STARTUP_BUDGET_MS: float = float(os.getenv("STARTUP_BUDGET_MS", "600"))
+
+# Priority alerts: webhook target (empty = disabled) and per-story rate limit
+ALERT_WEBHOOK_URL: str = os.getenv("ALERT_WEBHOOK_URL", "")
+ALERT_RATE_PER_MINUTE: float = float(os.getenv("ALERT_RATE_PER_MINUTE", "2"))
+ALERT_BURST: int = int(os.getenv("ALERT_BURST", "3"))
+
+# Mention retention: keep mentions across cycles within a window and
+# memory budget, archiving evicted ones to gzip JSONL. Off (0 hours) by
+# default: /api/mentions then shows the latest cycle only
+RETENTION_WINDOW_HOURS: float = float(os.getenv("RETENTION_WINDOW_HOURS", "0"))
+RETENTION_MAX_ITEMS: int = int(os.getenv("RETENTION_MAX_ITEMS", "2000"))
+RETENTION_MAX_BYTES: int = int(os.getenv("RETENTION_MAX_BYTES", str(8 * 1024 * 1024)))
+RETENTION_DIR: str = os.getenv("RETENTION_DIR", "archive")
+RETENTION_ARCHIVE_DAYS: float = float(os.getenv("RETENTION_ARCHIVE_DAYS", "30"))
+
+# Reach normalization: per-platform engagement percentiles (see reach.py)
+REACH_STATE_PATH: str = os.getenv("REACH_STATE_PATH", "leappulse_reach.json")
+REACH_HALF_LIFE_HOURS: float = float(os.getenv("REACH_HALF_LIFE_HOURS", "72"))
+REACH_MIN_SAMPLES: int = int(os.getenv("REACH_MIN_SAMPLES", "20"))
+# Percentile within its platform at which a mention counts as viral
+REACH_VIRAL_PERCENTILE: float = float(os.getenv("REACH_VIRAL_PERCENTILE", "0.9"))
+
+# Language stage: detect Hindi / Hinglish / other Indian languages, score
+# them with the Hindi lexicon and normalize Indian-script brand spellings
+LANGUAGE_DETECTION: bool = os.getenv("LANGUAGE_DETECTION", "true").lower() in ("1", "true", "yes")
+LANGUAGE_CACHE_SIZE: int = int(os.getenv("LANGUAGE_CACHE_SIZE", "20000"))  # results, keyed by content hash
+LANGUAGE_BATCH_SIZE: int = int(os.getenv("LANGUAGE_BATCH_SIZE", "64"))  # raw items per stage call
+
+# Scrape-cycle profiling (see profiling.py): off, sample or cprofile
+PROFILE_MODE: str = os.getenv("PROFILE_MODE", "off").lower()
+PROFILE_DIR: str = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_INTERVAL_MS: float = float(os.getenv("PROFILE_INTERVAL_MS", "5"))  # sampling period
+PROFILE_KEEP: int = int(os.getenv("PROFILE_KEEP", "20"))  # newest profile files kept
+# Required as the X-Admin-Token header on /api/admin/*; unset, those endpoints
+# refuse every request (CORS is open)
+ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")
+
+# Streaming cycle (see pipeline.stream): mentions per micro-batch written
+# to the database, and micro-batches queued before scrapers wait for the sink
+STREAM_BATCH_SIZE: int = int(os.getenv("STREAM_BATCH_SIZE", "50"))
+STREAM_QUEUE_BATCHES: int = int(os.getenv("STREAM_QUEUE_BATCHES", "8"))
+
+# Trending topics: burst detection over hashtags and word n-grams (see
+# trends.py). Short window vs long baseline, by half-life
+TRENDS_SHORT_HALF_LIFE_HOURS: float = float(os.getenv("TRENDS_SHORT_HALF_LIFE_HOURS", "3"))
+TRENDS_LONG_HALF_LIFE_HOURS: float = float(os.getenv("TRENDS_LONG_HALF_LIFE_HOURS", "72"))
+TRENDS_CAPACITY: int = int(os.getenv("TRENDS_CAPACITY", "300"))  # heavy-hitter candidates tracked
+TRENDS_MIN_COUNT: float = float(os.getenv("TRENDS_MIN_COUNT", "3"))  # recent mentions before a topic shows
+# Short/long share ratio at which a topic is "up" (its inverse means "down")
+TRENDS_BURST_RATIO: float = float(os.getenv("TRENDS_BURST_RATIO", "1.5"))
+
+# Reddit comment expansion: also fetch the comment threads of relevant
+# posts and of posts with at least REDDIT_COMMENT_MIN_COMMENTS comments
+REDDIT_EXPAND_COMMENTS: bool = os.getenv("REDDIT_EXPAND_COMMENTS", "false").lower() in ("1", "true", "yes")
+REDDIT_COMMENT_BUDGET: int = int(os.getenv("REDDIT_COMMENT_BUDGET", "30"))  # requests per cycle
+REDDIT_COMMENT_CONCURRENCY: int = int(os.getenv("REDDIT_COMMENT_CONCURRENCY", "3"))
+REDDIT_COMMENT_MIN_COMMENTS: int = int(os.getenv("REDDIT_COMMENT_MIN_COMMENTS", "10"))
+
+# How long cached Nitter mirror health scores stay valid before re-probing
+NITTER_HEALTH_TTL: int = int(os.getenv("NITTER_HEALTH_TTL_SECONDS", "300"))
+
 # User-Agent for polite scraping
 HEADERS = {
     "User-Agent": (
@@ -1,61 +1,72 @@
 """
-LeapPulse — Supabase Client
-Thin wrapper around supabase-py for inserting scraped data.
+LeapPulse — Database writes
+Thin helpers for pushing scraped data. Writes go to the backend chosen by
+STORAGE_BACKEND (see storage.py); get_client() is the Supabase client
+used by the supabase backend.
 """
 
-from supabase import create_client, Client
+from typing import TYPE_CHECKING
+
 from config import SUPABASE_URL, SUPABASE_SERVICE_KEY
+from metrics import timed
+from storage import get_storage
+
+if TYPE_CHECKING:
+    from supabase import Client
 
-_client: Client | None = None
+_client: "Client | None" = None
 
 
-def get_client() -> Client:
+def get_client() -> "Client":
     global _client
     if _client is None:
         if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
             raise RuntimeError(
                 "SUPABASE_URL and SUPABASE_SERVICE_KEY must be set in .env"
             )
+        # Imported here: supabase-py is slow to import and unused with STORAGE_BACKEND=sqlite
+        from supabase import create_client
+
         _client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
     return _client
 
 
 # ── Insert helpers ───────────────────────────────────────────
 
+@timed("leappulse_db_write_seconds", table="social_mentions")
 def upsert_mentions(mentions: list[dict]) -> None:
     """Insert new social mentions (dedupes on content hash)."""
     if not mentions:
         return
-    client = get_client()
-    client.table("social_mentions").insert(mentions).execute()
+    get_storage().insert("social_mentions", mentions)
     print(f"  ✓ Inserted {len(mentions)} mentions")
 
 
+@timed("leappulse_db_write_seconds", table="sentiment_distribution")
 def upsert_sentiment_distribution(data: list[dict]) -> None:
-    client = get_client()
-    client.table("sentiment_distribution").insert(data).execute()
+    get_storage().insert("sentiment_distribution", data)
     print(f"  ✓ Inserted {len(data)} sentiment distribution records")
 
 
+@timed("leappulse_db_write_seconds", table="platform_breakdown")
 def upsert_platform_breakdown(data: list[dict]) -> None:
-    client = get_client()
-    client.table("platform_breakdown").insert(data).execute()
+    get_storage().insert("platform_breakdown", data)
     print(f"  ✓ Inserted {len(data)} platform breakdown records")
 
 
+@timed("leappulse_db_write_seconds", table="trending_topics")
 def upsert_trending_topics(topics: list[dict]) -> None:
-    client = get_client()
-    client.table("trending_topics").insert(topics).execute()
+    get_storage().insert("trending_topics", topics)
     print(f"  ✓ Inserted {len(topics)} trending topics")
 
 
+@timed("leappulse_db_write_seconds", table="dashboard_metrics")
 def upsert_dashboard_metrics(metrics: dict) -> None:
-    client = get_client()
-    client.table("dashboard_metrics").insert(metrics).execute()
+    get_storage().insert("dashboard_metrics", [metrics])
     print("  ✓ Updated dashboard metrics")
 
 
+@timed("leappulse_db_write_seconds", table="weekly_trend")
 def upsert_weekly_trend(data: list[dict]) -> None:
-    client = get_client()
-    client.table("weekly_trend").insert(data).execute()
+    get_storage().insert("weekly_trend", data)
     print(f"  ✓ Inserted {len(data)} weekly trend points")
@@ -0,0 +1,120 @@
+"""
+LeapPulse — Historical queries
+Sentiment / volume time series and week-over-week deltas, computed from
+the hourly and daily rollup tables rather than raw mentions.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from storage import get_storage
+
+
+def _net(sentiment_sum: float, mentions: int) -> int | None:
+    """Map an average sentiment in [-1, 1] onto the 0–100 dashboard scale."""
+    if not mentions:
+        return None
+    return max(0, min(100, int(round((sentiment_sum / mentions + 1) * 50))))
+
+
+def _range(since: str | None, until: str | None, default_days: int) -> tuple[str, str]:
+    end = until or datetime.now(timezone.utc).isoformat()
+    start = since or (datetime.fromisoformat(end) - timedelta(days=default_days)).isoformat()
+    return start, end
+
+
+def sentiment_series(
+    since: str | None = None,
+    until: str | None = None,
+    granularity: str = "day",
+    platform: str | None = None,
+    priority: str | None = None,
+) -> list[dict]:
+    """Per-bucket mentions, average / net sentiment and engagement."""
+    since, until = _range(since, until, default_days=7)
+    buckets: dict[str, list] = defaultdict(lambda: [0, 0.0, 0])
+    for r in get_storage().rollups(granularity, since, until, platform, priority):
+        b = buckets[str(r["bucket"])]
+        b[0] += r["mentions"]
+        b[1] += r["sentiment_sum"]
+        b[2] += r["engagement_sum"]
+    return [
+        {
+            "bucket": bucket,
+            "mentions": n,
+            "avg_sentiment": round(s / n, 3) if n else 0.0,
+            "net_sentiment": _net(s, n),
+            "engagement": e,
+        }
+        for bucket, (n, s, e) in sorted(buckets.items())
+    ]
+
+
+def volume_series(
+    since: str | None = None,
+    until: str | None = None,
+    granularity: str = "day",
+    platform: str | None = None,
+) -> list[dict]:
+    """Per-bucket mention counts, split by platform and priority."""
+    since, until = _range(since, until, default_days=7)
+    buckets: dict[str, dict] = {}
+    for r in get_storage().rollups(granularity, since, until, platform):
+        b = buckets.setdefault(
+            str(r["bucket"]), {"total": 0, "by_platform": defaultdict(int), "by_priority": defaultdict(int)}
+        )
+        b["total"] += r["mentions"]
+        b["by_platform"][r["platform"]] += r["mentions"]
+        b["by_priority"][r["priority"]] += r["mentions"]
+    return [
+        {
+            "bucket": bucket,
+            "mentions": b["total"],
+            "by_platform": dict(b["by_platform"]),
+            "by_priority": dict(b["by_priority"]),
+        }
+        for bucket, b in sorted(buckets.items())
+    ]
+
+
+def _window_totals(since: datetime, until: datetime, platform: str | None) -> tuple[int, float, int]:
+    rows = get_storage().rollups("hour", since.isoformat(), until.isoformat(), platform)
+    return (
+        sum(r["mentions"] for r in rows),
+        sum(r["sentiment_sum"] for r in rows),
+        sum(r["engagement_sum"] for r in rows),
+    )
+
+
+def week_over_week(platform: str | None = None, now: datetime | None = None) -> dict:
+    """This week (last 7 days) vs the 7 days before, from hourly rollups."""
+    now = now or datetime.now(timezone.utc)
+    week_ago = now - timedelta(days=7)
+    cur_n, cur_s, cur_e = _window_totals(week_ago, now, platform)
+    prev_n, prev_s, prev_e = _window_totals(week_ago - timedelta(days=7), week_ago, platform)
+
+    cur_net, prev_net = _net(cur_s, cur_n), _net(prev_s, prev_n)
+
+    def pct(cur, prev):
+        return round((cur - prev) / prev * 100, 1) if prev else None
+
+    return {
+        "current": {"mentions": cur_n, "net_sentiment": cur_net, "engagement": cur_e},
+        "previous": {"mentions": prev_n, "net_sentiment": prev_net, "engagement": prev_e},
+        "mentions_change_pct": pct(cur_n, prev_n),
+        "sentiment_change_pct": pct(cur_net, prev_net) if cur_net is not None and prev_net else None,
+        "engagement_change_pct": pct(cur_e, prev_e),
+    }
+
+
+def previous_week_net_sentiment() -> int | None:
+    """
+    Net sentiment of the 7 days before the current week, or None when
+    there's no history (or the store is unreachable).
+    """
+    now = datetime.now(timezone.utc)
+    try:
+        n, s, _ = _window_totals(now - timedelta(days=14), now - timedelta(days=7), None)
+    except Exception:
+        return None
+    return _net(s, n)
@@ -0,0 +1,314 @@
+"""
+LeapPulse — Durable scrape job queue
+SQLite-backed queue shared by the dispatcher and worker processes (see
+worker.py). A cycle is one row per (source, job); workers claim jobs
+with a lease, so a crashed worker's job is picked up again once its
+lease expires. Results are stored per job until the dispatcher publishes
+the cycle.
+
+Job states: queued → running → done | failed
+
+The same file carries what the API process can't see for itself in
+SCRAPE_MODE=workers: alert-worthy mentions offered by workers, the
+alerts the dispatcher published from them, and each process's breaker
+states and metrics.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from config import JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS, JOBQUEUE_PATH
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cycles (
+  id           TEXT PRIMARY KEY,
+  created_at   REAL NOT NULL,
+  published_at REAL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+  id           INTEGER PRIMARY KEY,
+  cycle_id     TEXT NOT NULL REFERENCES cycles(id),
+  source       TEXT NOT NULL,
+  job          TEXT NOT NULL,
+  state        TEXT NOT NULL DEFAULT 'queued',
+  attempts     INTEGER NOT NULL DEFAULT 0,
+  lease_until  REAL,
+  worker       TEXT,
+  error        TEXT,
+  finished_at  REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (state, lease_until, id);
+CREATE INDEX IF NOT EXISTS idx_jobs_cycle ON jobs (cycle_id, state);
+CREATE TABLE IF NOT EXISTS results (
+  job_id       INTEGER PRIMARY KEY REFERENCES jobs(id),
+  cycle_id     TEXT NOT NULL,
+  mentions     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_cycle ON results (cycle_id);
+CREATE TABLE IF NOT EXISTS alert_offers (
+  id           INTEGER PRIMARY KEY,
+  mention      TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS alerts (
+  id           INTEGER PRIMARY KEY,
+  published_at REAL NOT NULL,
+  alert        TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS processes (
+  name         TEXT PRIMARY KEY,
+  role         TEXT NOT NULL,
+  updated_at   REAL NOT NULL,
+  breakers     TEXT NOT NULL,
+  metrics      TEXT NOT NULL
+);
+"""
+
+# Reports older than this come from processes that are gone
+_PROCESS_TTL_SECONDS = 300
+
+
+class JobQueue:
+    def __init__(self, path: str = JOBQUEUE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread *and* process (connections don't survive fork)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    # ── Dispatcher side ──
+
+    def enqueue_cycle(self, jobs: list[tuple[str, dict]]) -> str:
+        """Queue one cycle of (source name, job) pairs. Returns the cycle id."""
+        cycle_id = uuid.uuid4().hex[:12]
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("INSERT INTO cycles (id, created_at) VALUES (?, ?)", (cycle_id, time.time()))
+            conn.executemany(
+                "INSERT INTO jobs (cycle_id, source, job) VALUES (?, ?, ?)",
+                [(cycle_id, source, json.dumps(job)) for source, job in jobs],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return cycle_id
+
+    def open_cycle(self) -> str | None:
+        """The oldest cycle not yet published, if any."""
+        row = self._conn().execute(
+            "SELECT id FROM cycles WHERE published_at IS NULL ORDER BY created_at LIMIT 1"
+        ).fetchone()
+        return row["id"] if row else None
+
+    def cycle_status(self, cycle_id: str) -> dict[str, int]:
+        rows = self._conn().execute(
+            "SELECT state, COUNT(*) AS n FROM jobs WHERE cycle_id = ? GROUP BY state", (cycle_id,)
+        ).fetchall()
+        return {r["state"]: r["n"] for r in rows}
+
+    def source_status(self, cycle_id: str) -> dict[str, dict[str, int]]:
+        """{source name: {job state: count}} for one cycle."""
+        out: dict[str, dict[str, int]] = {}
+        rows = self._conn().execute(
+            "SELECT source, state, COUNT(*) AS n FROM jobs WHERE cycle_id = ? GROUP BY source, state",
+            (cycle_id,),
+        )
+        for r in rows:
+            out.setdefault(r["source"], {})[r["state"]] = r["n"]
+        return out
+
+    def cycle_finished(self, cycle_id: str) -> bool:
+        status = self.cycle_status(cycle_id)
+        return not status.get("queued") and not status.get("running")
+
+    def cycle_results(self, cycle_id: str) -> dict[str, list[dict]]:
+        """{source name: mentions} over every finished job of the cycle."""
+        out: dict[str, list[dict]] = {}
+        rows = self._conn().execute(
+            "SELECT j.source, r.mentions FROM results r JOIN jobs j ON j.id = r.job_id "
+            "WHERE r.cycle_id = ? ORDER BY j.id",
+            (cycle_id,),
+        )
+        for r in rows:
+            out.setdefault(r["source"], []).extend(json.loads(r["mentions"]))
+        return out
+
+    def mark_published(self, cycle_id: str) -> None:
+        """Mark a cycle published and drop its stored results."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("UPDATE cycles SET published_at = ? WHERE id = ?", (time.time(), cycle_id))
+            conn.execute("DELETE FROM results WHERE cycle_id = ?", (cycle_id,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    # ── Worker side ──
+
+    def claim(
+        self,
+        worker: str,
+        lease_seconds: float = JOB_LEASE_SECONDS,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+    ) -> dict | None:
+        """
+        Atomically take the oldest queued job, or one whose lease expired
+        (its worker died). Returns {id, cycle_id, source, job, attempts} or None.
+        An expired job that already had `max_attempts` is failed instead, so a
+        job that kills its worker can't hold its cycle open forever.
+        """
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "UPDATE jobs SET state = 'failed', error = 'lease expired', lease_until = NULL, "
+                "finished_at = ? WHERE state = 'running' AND lease_until < ? AND attempts >= ?",
+                (now, now, max_attempts),
+            )
+            row = conn.execute(
+                "SELECT id, cycle_id, source, job, attempts FROM jobs "
+                "WHERE state = 'queued' OR (state = 'running' AND lease_until < ?) "
+                "ORDER BY id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET state = 'running', attempts = attempts + 1, "
+                "lease_until = ?, worker = ? WHERE id = ?",
+                (now + lease_seconds, worker, row["id"]),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return {
+            "id": row["id"],
+            "cycle_id": row["cycle_id"],
+            "source": row["source"],
+            "job": json.loads(row["job"]),
+            "attempts": row["attempts"] + 1,
+        }
+
+    def complete(self, job: dict, mentions: list[dict]) -> None:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (job_id, cycle_id, mentions) VALUES (?, ?, ?)",
+                (job["id"], job["cycle_id"], json.dumps(mentions)),
+            )
+            conn.execute(
+                "UPDATE jobs SET state = 'done', finished_at = ?, error = NULL WHERE id = ?",
+                (time.time(), job["id"]),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def fail(self, job: dict, error: str, max_attempts: int = JOB_MAX_ATTEMPTS) -> None:
+        """Re-queue the job, or mark it failed after `max_attempts`."""
+        state = "failed" if job["attempts"] >= max_attempts else "queued"
+        self._conn().execute(
+            "UPDATE jobs SET state = ?, error = ?, lease_until = NULL, finished_at = ? WHERE id = ?",
+            (state, error[:500], time.time() if state == "failed" else None, job["id"]),
+        )
+
+    # ── Alert relay (workers → dispatcher → API) ──
+
+    def offer_alert(self, mention: dict) -> None:
+        """Worker side: hand an alert-worthy mention to the dispatcher's alert bus."""
+        self._conn().execute("INSERT INTO alert_offers (mention) VALUES (?)", (json.dumps(mention, default=str),))
+
+    def take_alert_offers(self, limit: int = 500) -> list[dict]:
+        """Dispatcher side: remove and return the oldest offered mentions."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute("SELECT id, mention FROM alert_offers ORDER BY id LIMIT ?", (limit,)).fetchall()
+            if rows:
+                conn.execute("DELETE FROM alert_offers WHERE id <= ?", (rows[-1]["id"],))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return [json.loads(r["mention"]) for r in rows]
+
+    def add_alert(self, alert: dict) -> None:
+        self._conn().execute(
+            "INSERT INTO alerts (published_at, alert) VALUES (?, ?)",
+            (time.time(), json.dumps(alert, default=str)),
+        )
+
+    def alerts_since(self, after_id: int = 0, limit: int = 200) -> list[tuple[int, dict]]:
+        """Published alerts with id > `after_id`, oldest first (at most the newest `limit`)."""
+        rows = self._conn().execute(
+            "SELECT id, alert FROM alerts WHERE id > ? ORDER BY id DESC LIMIT ?", (after_id, limit)
+        ).fetchall()
+        return [(r["id"], json.loads(r["alert"])) for r in reversed(rows)]
+
+    # ── Process reports ──
+
+    def report_process(self, name: str, role: str, breakers: dict, metrics: dict) -> None:
+        self._conn().execute(
+            "INSERT OR REPLACE INTO processes (name, role, updated_at, breakers, metrics) VALUES (?, ?, ?, ?, ?)",
+            (name, role, time.time(), json.dumps(breakers), json.dumps(metrics)),
+        )
+
+    def processes(self, max_age: float = _PROCESS_TTL_SECONDS) -> list[dict]:
+        """Latest report of every live process: {name, role, updated_at, breakers, metrics}."""
+        rows = self._conn().execute(
+            "SELECT * FROM processes WHERE updated_at >= ? ORDER BY name", (time.time() - max_age,)
+        ).fetchall()
+        return [
+            {
+                "name": r["name"],
+                "role": r["role"],
+                "updated_at": r["updated_at"],
+                "breakers": json.loads(r["breakers"]),
+                "metrics": json.loads(r["metrics"]),
+            }
+            for r in rows
+        ]
+
+    def stats(self) -> dict[str, int]:
+        rows = self._conn().execute("SELECT state, COUNT(*) AS n FROM jobs GROUP BY state").fetchall()
+        return {r["state"]: r["n"] for r in rows}
+
+    def prune(self, keep_seconds: float = 86400) -> None:
+        """Delete published cycles (and their jobs) and alerts older than `keep_seconds`."""
+        cutoff = time.time() - keep_seconds
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM jobs WHERE cycle_id IN "
+                "(SELECT id FROM cycles WHERE published_at IS NOT NULL AND published_at < ?)",
+                (cutoff,),
+            )
+            conn.execute("DELETE FROM cycles WHERE published_at IS NOT NULL AND published_at < ?", (cutoff,))
+            conn.execute("DELETE FROM alerts WHERE published_at < ?", (cutoff,))
+            conn.execute("DELETE FROM processes WHERE updated_at < ?", (time.time() - _PROCESS_TTL_SECONDS,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
@@ -0,0 +1,12 @@
+"""
+LeapPulse — Mention identity
+One key per post, shared by everything that dedupes mentions: the
+database's unique column, the scheduler's new-vs-seen check, alert
+cooldowns, the retention window, reach digests and trend counts. A leaf
+module, so any of them can import it at the top without cycles.
+"""
+
+
+def mention_key(m: dict) -> str:
+    """Platform plus source URL, or the start of the content when there's no URL."""
+    return f"{m.get('platform')}|{m.get('source_url') or m.get('content', '')[:120]}"
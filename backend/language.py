@@ -0,0 +1,374 @@
+"""
+LeapPulse — Language detection, transliteration & routing
+A pipeline stage in front of relevance filtering, run on batches of raw
+items and cached by content hash (LANGUAGE_CACHE_SIZE entries), so a post
+seen again next cycle costs one dict lookup:
+
+  - detect(): Indian scripts by Unicode block (every Indic block shares
+    Devanagari's layout, so one table covers them all); Latin text is
+    split into English vs romanized Hindi ("hi-Latn", Hinglish) by a
+    small naive-Bayes classifier over words and character trigrams.
+  - normalize_brand(): brand names written in an Indian script
+    ("लीप स्कॉलर") are transliterated, compared with the brand by
+    consonant skeleton and replaced with the brand's Latin form, so
+    is_relevant_mention() can see them.
+  - Routing: English goes through the usual cascade (returns no score);
+    Hindi in either script is scored from a weighted Hindi lexicon plus
+    the English keywords, with "nahi" / "नहीं" negation, on the same
+    scale as the English full scorer. TextBlob reads neither and would
+    call them all neutral.
+"""
+
+import hashlib
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from typing import NamedTuple
+
+import metrics
+from config import LANGUAGE_CACHE_SIZE, LANGUAGE_DETECTION
+from sentiment import keyword_hits
+
+# ── Script detection ──
+
+# Unicode block start → language of its script. Each block is 0x80 wide
+# and laid out like Devanagari's.
+_INDIC_BLOCKS = {
+    0x0900: "hi",  # Devanagari (Hindi, Marathi)
+    0x0980: "bn",
+    0x0A00: "pa",  # Gurmukhi
+    0x0A80: "gu",
+    0x0B00: "or",
+    0x0B80: "ta",
+    0x0C00: "te",
+    0x0C80: "kn",
+    0x0D00: "ml",
+}
+_INDIC_RE = re.compile(r"[\u0900-\u0D7F]+")
+
+
+def _script_language(text: str) -> str | None:
+    """Language of the dominant Indian script, if at least a third of the letters use one."""
+    counts: Counter[int] = Counter()
+    letters = 0
+    for ch in text:
+        cp = ord(ch)
+        if 0x0900 <= cp < 0x0D80:
+            counts[cp & ~0x7F] += 1
+            letters += 1
+        elif ch.isalpha():
+            letters += 1
+    if not counts:
+        return None
+    block, n = counts.most_common(1)[0]
+    return _INDIC_BLOCKS[block] if n * 3 >= letters else None
+
+
+# ── Transliteration ──
+
+_VOWELS = {
+    0x05: "a", 0x06: "aa", 0x07: "i", 0x08: "ee", 0x09: "u", 0x0A: "oo", 0x0B: "ri",
+    0x0D: "e", 0x0E: "e", 0x0F: "e", 0x10: "ai", 0x11: "o", 0x12: "o", 0x13: "o", 0x14: "au",
+}
+_MATRAS = {
+    0x3E: "aa", 0x3F: "i", 0x40: "ee", 0x41: "u", 0x42: "oo", 0x43: "ri",
+    0x45: "e", 0x46: "e", 0x47: "e", 0x48: "ai", 0x49: "o", 0x4A: "o", 0x4B: "o", 0x4C: "au",
+}
+_CONSONANTS = dict(zip(range(0x15, 0x3A), [
+    "k", "kh", "g", "gh", "n", "ch", "chh", "j", "jh", "n",
+    "t", "th", "d", "dh", "n", "t", "th", "d", "dh", "n",
+    "n", "p", "ph", "b", "bh", "m", "y", "r", "r", "l",
+    "l", "l", "v", "sh", "sh", "s", "h",
+]))
+_CONSONANTS.update({0x58: "q", 0x59: "kh", 0x5A: "g", 0x5B: "z", 0x5C: "d", 0x5D: "dh", 0x5E: "f", 0x5F: "y"})
+_NASALS = {0x01: "n", 0x02: "n", 0x03: "h"}
+_HALANT = 0x4D
+
+
+class _Unit:
+    __slots__ = ("consonant", "vowel", "inherent")
+
+    def __init__(self, consonant: str, vowel: str, inherent: bool):
+        self.consonant = consonant
+        self.vowel = vowel
+        self.inherent = inherent
+
+
+def _transliterate_word(word: str) -> str:
+    units: list[_Unit] = []
+    tail: dict[int, str] = {}  # nasal / visarga after unit i
+    for ch in word:
+        off = ord(ch) & 0x7F
+        if off in _CONSONANTS:
+            units.append(_Unit(_CONSONANTS[off], "a", True))
+        elif off in _MATRAS and units:
+            units[-1].vowel, units[-1].inherent = _MATRAS[off], False
+        elif off == _HALANT and units:
+            units[-1].vowel, units[-1].inherent = "", False
+        elif off in _VOWELS:
+            units.append(_Unit("", _VOWELS[off], False))
+        elif off in _NASALS and units:
+            tail[len(units) - 1] = tail.get(len(units) - 1, "") + _NASALS[off]
+        # Nukta, avagraha, digits and the rest carry nothing we need
+
+    # Schwa deletion: drop the word-final inherent "a", then any inner one
+    # between a vowel and a consonant-vowel pair ("बकवास" → bakvaas)
+    if len(units) > 1 and units[-1].inherent:
+        units[-1].vowel = ""
+    for i in range(len(units) - 2, 0, -1):
+        u, nxt = units[i], units[i + 1]
+        if u.inherent and units[i - 1].vowel and nxt.consonant and nxt.vowel:
+            u.vowel = ""
+    return "".join(u.consonant + u.vowel + tail.get(i, "") for i, u in enumerate(units))
+
+
+def transliterate(text: str) -> str:
+    """Romanize every run of Indian-script letters, leaving the rest as is."""
+    return _INDIC_RE.sub(lambda m: _transliterate_word(m.group()), text)
+
+
+def _key(word: str) -> str:
+    """
+    Spelling-insensitive key for romanized Hindi: "accha", "achha" and
+    "अच्छा" (→ "achchhaa") all become "aka".
+    """
+    w = word.lower().replace("h", "").replace("ee", "i").replace("oo", "u")
+    w = w.translate(_KEY_TABLE)
+    return re.sub(r"(.)\1+", r"\1", w)
+
+
+_KEY_TABLE = str.maketrans({"c": "k", "q": "k", "v": "w", "z": "j"})
+
+
+def _skeleton(word: str) -> str:
+    """Consonants of _key(word) only — what survives every transliteration of a name."""
+    return re.sub(r"[aeiouy]", "", _key(word))
+
+
+# ── Brand normalization ──
+
+@lru_cache(maxsize=8)
+def _brand_forms(brand: str) -> tuple[str, str]:
+    words = re.sub(r"([a-z])([A-Z])", r"\1 \2", brand).split()
+    return _skeleton("".join(words)), " ".join(words)
+
+
+def normalize_brand(text: str, brand: str) -> str:
+    """Replace Indian-script spellings of the brand with its Latin name."""
+    skeleton, latin = _brand_forms(brand)
+    if len(skeleton) < 3 or not _INDIC_RE.search(text):
+        return text
+    tokens = list(_INDIC_RE.finditer(text))
+    out, pos, i = [], 0, 0
+    while i < len(tokens):
+        tok = tokens[i]
+        span = None
+        # The brand as two words ("लीप स्कॉलर") or one ("लीपस्कॉलर")
+        if i + 1 < len(tokens) and not text[tok.end():tokens[i + 1].start()].strip():
+            pair = _transliterate_word(tok.group()) + _transliterate_word(tokens[i + 1].group())
+            if _skeleton(pair) == skeleton:
+                span = (tok.start(), tokens[i + 1].end())
+                i += 1
+        if span is None and _skeleton(_transliterate_word(tok.group())) == skeleton:
+            span = (tok.start(), tok.end())
+        if span is not None:
+            out.append(text[pos:span[0]])
+            out.append(latin)
+            pos = span[1]
+            metrics.inc("leappulse_brand_normalized_total")
+        i += 1
+    out.append(text[pos:])
+    return "".join(out)
+
+
+# ── English vs romanized Hindi ──
+
+_ENGLISH_SEED = """
+the and is are was were this that with for have has had not but you your they their what when
+which would could should about from there been will just more very really also only some any
+i applied through the platform and the counselor was helpful with my application
+the visa process took longer than expected but the team kept me updated
+worst experience ever they never respond to emails and the fees are hidden
+got my admit from a great university thanks to the guidance
+is it worth paying for the premium plan or should i apply on my own
+the ielts coaching was good and i scored well in the exam
+my friend recommended them and i am happy with the service so far
+does anyone know how long the loan approval takes these days
+they keep calling me even after i said i am not interested
+the app is smooth and the mentors answer questions quickly
+update on the scholarship desk they published a study abroad guide
+my sop review was delayed again and nobody explained why
+consumer court case filed against the agency over refunds
+feels like a scam so avoid them and read the reviews first
+shared my story of getting into a masters program in canada
+"""
+
+_HINGLISH_SEED = """
+hai hain tha thi the nahi nahin nhi kya kyu kyun aur bhi toh to ko ka ki ke se mein me mai
+main hum tum aap mera meri mere tera apna apni kuch koi sab bahut bohot bahot abhi phir
+kar karo karna kiya raha rahi rahe hoga hogi wala wali yaar bhai dost accha acha theek thik
+mujhe mujhko humko unko mila mili gaya gayi diya liya wale de do ho gaye kab kaise kitna
+unka service bahut accha hai unhone bahut help kiya
+bhai koi bataye ye log paisa lene ke baad call nahi uthate
+mera visa abhi tak nahi aaya bahut pareshan hu
+yaar ye platform sahi hai ya faltu hai koi experience share karo
+unhone bola tha refund milega par abhi tak kuch nahi mila
+ielts ki tayari ke liye inka course le lo mast hai
+kya kisi ko pata hai loan kitne din mein approve hota hai
+sab kuch online ho gaya bahut aasaan tha
+inke counselor bilkul bakwas hai time waste mat karo
+"""
+
+
+_TAGS_URLS_RE = re.compile(r"https?://\S+|[@#]\w+")
+
+
+def _features(text: str) -> list[str]:
+    feats = []
+    for w in re.findall(r"[a-z]+", _TAGS_URLS_RE.sub(" ", text.lower())):
+        feats.append(w)
+        padded = f"_{w}_"
+        feats.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+    return feats
+
+
+class _NaiveBayes:
+    def __init__(self, samples: dict[str, str]):
+        self.counts = {label: Counter(_features(text)) for label, text in samples.items()}
+        self.vocab = len(set().union(*self.counts.values()))
+        self.totals = {label: sum(c.values()) for label, c in self.counts.items()}
+
+    def log_odds(self, text: str, a: str, b: str) -> float:
+        """log P(text | a) - log P(text | b), add-one smoothed."""
+        ca, cb = self.counts[a], self.counts[b]
+        da, db = self.totals[a] + self.vocab, self.totals[b] + self.vocab
+        return sum(math.log((ca[f] + 1) / da) - math.log((cb[f] + 1) / db) for f in _features(text))
+
+
+_CLASSIFIER = _NaiveBayes({"en": _ENGLISH_SEED, "hi-Latn": _HINGLISH_SEED})
+# Evidence per feature needed before Latin text counts as Hinglish, not English
+_HINGLISH_MARGIN = 0.15
+
+
+def detect(text: str) -> str:
+    """"en", "hi-Latn" (romanized Hindi) or the language of an Indian script."""
+    lang = _script_language(text)
+    if lang is not None:
+        return lang
+    n = len(_features(text))
+    if n < 8:
+        return "en"
+    return "hi-Latn" if _CLASSIFIER.log_odds(text, "hi-Latn", "en") > _HINGLISH_MARGIN * n else "en"
+
+
+# ── Hindi lexicon scorer ──
+
+# Polarity of each word, on TextBlob's scale so Hindi and English scores
+# mean the same thing: a lone mild word ("accha") stays short of MARKETING
+# GOLD, a lone fraud word ("dhokha") is well past HIGH PRIORITY
+_HINDI_LEXICON = {
+    "behtareen": 0.9, "zabardast": 0.8, "shandaar": 0.8, "kamaal": 0.8,
+    "badhiya": 0.5, "badiya": 0.5, "mast": 0.5, "khush": 0.5, "pyaar": 0.5,
+    "accha": 0.4, "achha": 0.4, "acha": 0.4, "aasaan": 0.4, "sukoon": 0.4,
+    "shukriya": 0.3, "dhanyavaad": 0.3, "sahi": 0.3, "madad": 0.2,
+    "अच्छा": 0.4, "बढ़िया": 0.5, "शानदार": 0.8, "धन्यवाद": 0.3, "शुक्रिया": 0.3,
+    "खुश": 0.5, "मदद": 0.2,
+    "dhokha": -0.9, "thagi": -0.9, "chor": -0.8, "loot": -0.8, "barbaad": -0.8,
+    "bakwas": -0.8, "bakwaas": -0.8, "ghatiya": -0.8, "bekaar": -0.7,
+    "bura": -0.6, "buri": -0.6, "kharab": -0.6, "kharaab": -0.6, "jhooth": -0.6,
+    "jhootha": -0.6, "faltu": -0.5, "nuksaan": -0.5, "pareshan": -0.4, "gussa": -0.4,
+    "धोखा": -0.9, "ठगी": -0.9, "चोर": -0.8, "लूट": -0.8, "बर्बाद": -0.8,
+    "बकवास": -0.8, "घटिया": -0.8, "बेकार": -0.7, "बुरा": -0.6, "खराब": -0.6,
+    "झूठ": -0.6, "फालतू": -0.5, "परेशान": -0.4,
+}
+_NEGATORS = {_key(transliterate(w)) for w in ["nahi", "nahin", "nhi", "mat", "नहीं", "मत", "not", "never"]}
+_POLARITY = {_key(transliterate(w)): p for w, p in _HINDI_LEXICON.items()}
+
+
+def hindi_sentiment(text: str, lang: str) -> float | None:
+    """
+    Score Hindi (either script) the way sentiment.textblob_sentiment scores
+    English: the mean polarity of lexicon hits plus 0.15 per net keyword,
+    Hindi and English alike. A negator right before or within two words
+    after flips a hit and halves it ("accha nahi hai"), as TextBlob does.
+    None when there is nothing to read: romanized text goes through the
+    usual cascade, and other Indian scripts to the full scorer.
+    """
+    if lang not in ("hi", "hi-Latn"):
+        return None
+    keys = [_key(w) for w in re.findall(r"[a-z]+", transliterate(text).lower())]
+    pos, neg = keyword_hits(text.lower())
+    polarities = []
+    for i, k in enumerate(keys):
+        polarity = _POLARITY.get(k)
+        if polarity is None:
+            continue
+        if any(n in _NEGATORS for n in keys[max(0, i - 1):i] + keys[i + 1:i + 3]):
+            polarity *= -0.5
+        polarities.append(polarity)
+        if polarity > 0:
+            pos += 1
+        else:
+            neg += 1
+    if not polarities:
+        # Native script: TextBlob can't read it either, so neutral is the honest answer
+        return None if lang == "hi-Latn" else 0.0
+    base = sum(polarities) / len(polarities)
+    return round(max(-1.0, min(1.0, base + (pos - neg) * 0.15)), 3)
+
+
+# ── Batched, cached stage ──
+
+class Analysis(NamedTuple):
+    lang: str
+    text: str  # content with the brand normalized, for relevance filtering
+    sentiment: float | None  # None: leave scoring to the cascade
+
+
+_cache: OrderedDict[bytes, Analysis] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _analyze(text: str, brand: str) -> Analysis:
+    lang = detect(text)
+    if lang == "en":
+        return Analysis(lang, text, None)
+    return Analysis(lang, normalize_brand(text, brand), hindi_sentiment(text, lang))
+
+
+def analyze_batch(texts: list[str], brand: str) -> list[Analysis]:
+    """Language, normalized text and (for non-English) sentiment of each text."""
+    if not LANGUAGE_DETECTION:
+        return [Analysis("en", t, None) for t in texts]
+    keys = [hashlib.blake2b(f"{brand}\0{t}".encode(), digest_size=16).digest() for t in texts]
+    out: list[Analysis | None] = []
+    with _cache_lock:
+        for k in keys:
+            hit = _cache.get(k)
+            if hit is not None:
+                _cache.move_to_end(k)
+            out.append(hit)
+    hits = sum(a is not None for a in out)
+    metrics.inc("leappulse_cache_total", hits, cache="language", result="hit")
+    metrics.inc("leappulse_cache_total", len(texts) - hits, cache="language", result="miss")
+
+    with metrics.timer("leappulse_language_seconds"):
+        fresh: dict[bytes, Analysis] = {}
+        for i, (k, t) in enumerate(zip(keys, texts)):
+            if out[i] is None:
+                if k not in fresh:
+                    fresh[k] = _analyze(t, brand)
+                out[i] = fresh[k]
+    if fresh:
+        with _cache_lock:
+            _cache.update(fresh)
+            while len(_cache) > LANGUAGE_CACHE_SIZE:
+                _cache.popitem(last=False)
+
+    for a in out:
+        metrics.inc("leappulse_language_total", lang=a.lang)
+        if a.sentiment is not None:
+            metrics.inc("leappulse_sentiment_route_total", route="language", reason=a.lang)
+    return out
@@ -5,16 +5,33 @@ Monitors only LeapScholar across all platforms.
 
 Usage:
   python main.py              # Run once
-  python main.py --schedule   # Run continuously on interval
+  python main.py --schedule   # Run continuously, adaptive per-source intervals
+  python main.py --record cycle.jsonl.gz             # ...saving every HTTP response
+  python main.py --replay cycle.jsonl.gz --speed 10  # ...served from a recording
+
+With PROFILE_MODE=sample (or cprofile) every --schedule run is profiled;
+see profiling.py.
+
+A run streams: each micro-batch of scored mentions is written to the
+database, search index, reach digests and snapshot as it arrives (see
+pipeline.stream), and the aggregates are pushed once at the end. Every
+--schedule run does the same over its due sources, writing only mentions
+new since their earlier runs. For
+production, worker.py runs the same pipeline as a dispatcher plus
+parallel worker processes, publishing through publish_cycle().
 """
 
+import asyncio
 import sys
 import time
 from datetime import datetime
 
-import schedule
-
-from config import SCRAPE_INTERVAL, BRAND_NAME
+import alerts
+import profiling
+import reach
+from config import BRAND_NAME
+from scrapers import http
+from scrapers.replay import Recorder, Replayer
 from db import (
     upsert_mentions,
     upsert_platform_breakdown,
@@ -23,11 +40,12 @@ from db import (
     upsert_dashboard_metrics,
     upsert_weekly_trend,
 )
-from scrapers.reddit_scraper import scrape_reddit_all
-from scrapers.twitter_scraper import scrape_twitter_brand
-from scrapers.linkedin_scraper import scrape_linkedin_brand
-from scrapers.google_news_scraper import scrape_news_brand
-from scrapers.youtube_scraper import scrape_youtube_brand
+from history import previous_week_net_sentiment
+from pipeline import stream
+from scheduler import AdaptiveScheduler
+from scrapers.registry import all_sources
+from search import get_index
+from snapshot import SnapshotStore, SnapshotStream, build_snapshot, mark_source
 from aggregator import (
     compute_sentiment_distribution,
     compute_platform_breakdown,
@@ -37,6 +55,10 @@ from aggregator import (
 )
 
 
+# How each stream() status is shown
+_STATUS_MARKS = {"fresh": "✓", "failed": "✗", "stale": "⏱"}
+
+
 def run_scrape_cycle():
     """Execute one full scrape → analyze → push cycle."""
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -45,40 +67,144 @@ def run_scrape_cycle():
     print(f"  Monitoring: {BRAND_NAME}")
     print(f"{'='*60}\n")
 
-    all_mentions: list[dict] = []
+    # ── 1. Stream every registered source into the sinks ──
+    print("[1/2] Scraping all sources (each batch written as it is scored)...")
+    _seed_reach()
+    sink = CycleSink()
+    asyncio.run(_stream_cycle(all_sources(), sink))
 
-    # ── 1. Scrape all platforms for LeapScholar ──
-    print("[1/5] Scraping Reddit...")
-    all_mentions.extend(scrape_reddit_all(BRAND_NAME))
+    print(f"\n{'─'*40}")
+    print(f"  Total mentions scraped: {sink.count}")
+    print(f"{'─'*40}\n")
 
-    print("\n[2/5] Scraping Twitter/X...")
-    all_mentions.extend(scrape_twitter_brand(BRAND_NAME))
+    if not sink.count:
+        print("  ⚠ No mentions found — skipping database push")
+        return
 
-    print("\n[3/5] Scraping LinkedIn...")
-    all_mentions.extend(scrape_linkedin_brand(BRAND_NAME))
+    print("\n[2/2] Pushing aggregates...")
+    sink.close()
 
-    print("\n[4/5] Scraping Google News...")
-    all_mentions.extend(scrape_news_brand(BRAND_NAME))
 
-    print("\n[5/5] Scraping YouTube...")
-    all_mentions.extend(scrape_youtube_brand(BRAND_NAME))
+def _seed_reach() -> None:
+    """
+    The saved reach digests already hold the last published cycle; mark
+    its mentions seen so this process doesn't count them a second time.
+    """
+    try:
+        payload = SnapshotStore().load_if_changed()
+    except Exception as e:
+        print(f"  ⚠ Could not read the last snapshot: {e}")
+        return
+    if payload:
+        reach.get_model().mark_seen(payload["mentions"])
 
-    print(f"\n{'─'*40}")
-    print(f"  Total mentions scraped: {len(all_mentions)}")
-    print(f"{'─'*40}\n")
 
-    if not all_mentions:
-        print("  ⚠ No mentions found — skipping database push")
-        return
+async def _stream_cycle(sources: list, sink: "CycleSink") -> None:
+    async for source, batch in stream(sources, BRAND_NAME, on_done=sink.source_done):
+        # Off the event loop, so scrapers keep fetching while a batch is written
+        await asyncio.to_thread(sink.write, source, batch)
+
+
+class CycleSink:
+    """
+    Where a streamed cycle lands, one micro-batch at a time: the database,
+    the full-text index, the reach digests and the snapshot. Keeps counts,
+    not mentions; close() pushes the aggregates and publishes.
+
+    With a `scheduler` (--schedule) the cycle covers only the due
+    `sources`: only mentions new since their earlier runs are written,
+    and each source's run feeds its interval.
+    """
+
+    def __init__(self, scheduler: AdaptiveScheduler | None = None, sources: list | None = None):
+        self.scheduler = scheduler
+        self.snapshot = SnapshotStream([s.name for s in sources] if scheduler is not None else None)
+        self.count = 0
+        self.critical = 0
+        self.gold = 0
+
+    def source_done(self, source, count: int, status: str) -> None:
+        mark_source(source.name, source.label, status, count)
+        line = f"  {_STATUS_MARKS.get(status, '?')} {source.label}: {count} mentions ({status})"
+        if self.scheduler is not None:
+            new = self.scheduler.finish(source)
+            sched = self.scheduler.schedules[source.name]
+            line += f", {new} new — next in {sched.interval / 60:.1f} min"
+        print(line)
+
+    def write(self, source, batch: list[dict]) -> None:
+        if self.scheduler is not None:
+            batch = self.scheduler.observe(source, batch)
+            if not batch:
+                return
+        try:
+            upsert_mentions(batch)
+        except Exception as e:
+            print(f"  ✗ Error pushing mentions: {e}")
+        try:
+            get_index().add(batch)
+        except Exception as e:
+            print(f"  ✗ Error updating search index: {e}")
+        try:
+            reach.get_model().observe(batch)
+        except Exception as e:
+            print(f"  ✗ Error updating reach digests: {e}")
+        self.snapshot.add(batch, source.name)
+        self.count += len(batch)
+        self.critical += sum(1 for m in batch if m["priority"] == "CRITICAL ALERT")
+        self.gold += sum(1 for m in batch if m["priority"] == "MARKETING GOLD")
+
+    def close(self) -> None:
+        try:
+            reach.get_model().save()
+        except Exception as e:
+            print(f"  ✗ Error saving reach digests: {e}")
+        payload = self.snapshot.payload()
+        push_aggregates(payload)
+        try:
+            SnapshotStore().publish(payload)
+        except Exception as e:
+            print(f"  ✗ Error publishing snapshot: {e}")
+        _print_summary(self.count, self.critical, self.gold)
+
+
+def _observe_reach(mentions: list[dict]) -> None:
+    try:
+        reach.observe_cycle(mentions)
+    except Exception as e:
+        print(f"  ✗ Error updating reach digests: {e}")
 
-    # ── 2. Push raw mentions to Supabase ──
+
+def publish_cycle(all_mentions: list[dict]) -> None:
+    """
+    Publish one finished cycle everywhere readers look: the database, the
+    full-text index and the snapshot file the API serves.
+    """
+    _observe_reach(all_mentions)
+    push_results(all_mentions, all_mentions)
+    try:
+        get_index().add(all_mentions)
+    except Exception as e:
+        print(f"  ✗ Error updating search index: {e}")
+    try:
+        SnapshotStore().publish(build_snapshot(all_mentions))
+    except Exception as e:
+        print(f"  ✗ Error publishing snapshot: {e}")
+
+
+def push_results(new_mentions: list[dict], all_mentions: list[dict]) -> None:
+    """
+    Insert `new_mentions`, then recompute and push every aggregate over
+    `all_mentions` (the latest results across all sources).
+    """
+    # ── Push raw mentions to Supabase ──
     print("[DB] Pushing mentions...")
     try:
-        upsert_mentions(all_mentions)
+        upsert_mentions(new_mentions)
     except Exception as e:
         print(f"  ✗ Error pushing mentions: {e}")
 
-    # ── 3. Compute & push aggregates ──
+    # ── Compute & push aggregates ──
     print("[DB] Computing Sentiment Distribution...")
     try:
         sentiment_dist = compute_sentiment_distribution(all_mentions)
@@ -102,7 +228,7 @@ def run_scrape_cycle():
 
     print("[DB] Computing Dashboard Metrics...")
     try:
-        metrics = compute_dashboard_metrics(all_mentions)
+        metrics = compute_dashboard_metrics(all_mentions, previous_week_net_sentiment())
         upsert_dashboard_metrics(metrics)
     except Exception as e:
         print(f"  ✗ Error with metrics: {e}")
@@ -117,29 +243,97 @@ def run_scrape_cycle():
     # ── Summary ──
     critical = sum(1 for m in all_mentions if m["priority"] == "CRITICAL ALERT")
     gold = sum(1 for m in all_mentions if m["priority"] == "MARKETING GOLD")
+    _print_summary(len(all_mentions), critical, gold)
+
+
+# Snapshot payload key → (label, writer) for the aggregate tables
+_AGGREGATE_TABLES = {
+    "sentiment_distribution": ("sentiment distribution", upsert_sentiment_distribution),
+    "platform_breakdown": ("platform breakdown", upsert_platform_breakdown),
+    "trending_topics": ("topics", upsert_trending_topics),
+    "dashboard_metrics": ("metrics", upsert_dashboard_metrics),
+    "weekly_trend": ("weekly trend", upsert_weekly_trend),
+}
+
+
+def push_aggregates(payload: dict) -> None:
+    """Push the aggregates of a snapshot payload, already computed over its window."""
+    for key, (label, upsert) in _AGGREGATE_TABLES.items():
+        print(f"[DB] Pushing {label}...")
+        try:
+            upsert(payload[key])
+        except Exception as e:
+            print(f"  ✗ Error with {label}: {e}")
+
+
+def _print_summary(total: int, critical: int, gold: int) -> None:
     print(f"\n{'='*60}")
     print(f"  ✓ Cycle complete!")
-    print(f"    Mentions: {len(all_mentions)} | Critical: {critical} | Gold: {gold}")
+    print(f"    Mentions: {total} | Critical: {critical} | Gold: {gold}")
     print(f"{'='*60}\n")
 
 
-def main():
-    if "--schedule" in sys.argv:
-        print(f"Starting scheduled scraping every {SCRAPE_INTERVAL} minutes...")
-        print("Press Ctrl+C to stop.\n")
+def run_scheduled():
+    """
+    Poll each source on its own adaptive interval. Each run streams its
+    due sources like run_scrape_cycle(); the aggregates and snapshot
+    then cover the latest results of every source.
+    """
+    scheduler = AdaptiveScheduler(all_sources())
+    _seed_reach()
+
+    while True:
+        due = scheduler.due()
+        if due:
+            timestamp = datetime.now().strftime("%H:%M:%S")
+            print(f"\n[{timestamp}] Scraping: {', '.join(s.label for s in due)}")
+            with profiling.cycle("scheduled"):
+                sink = CycleSink(scheduler, due)
+                asyncio.run(_stream_cycle(due, sink))
+                if sink.count:
+                    sink.close()
 
-        # Run immediately on start
-        run_scrape_cycle()
+        # Wake for the next due source (short cap keeps Ctrl+C responsive)
+        time.sleep(min(scheduler.seconds_until_next(), 30) or 1)
 
-        # Schedule recurring runs
-        schedule.every(SCRAPE_INTERVAL).minutes.do(run_scrape_cycle)
 
-        while True:
-            schedule.run_pending()
-            time.sleep(30)
-    else:
-        # Single run
-        run_scrape_cycle()
+def _arg(flag: str) -> str | None:
+    """Value following `flag` on the command line, if given."""
+    if flag in sys.argv[:-1]:
+        return sys.argv[sys.argv.index(flag) + 1]
+    return None
+
+
+def main():
+    alerts.get_bus().start()
+    recorder = None
+    if _arg("--replay"):
+        replayer = Replayer(_arg("--replay"), speed=float(_arg("--speed") or 1))
+        http.set_replayer(replayer)
+        print(f"Replaying {len(replayer)} recorded responses from {replayer.path} at {replayer.speed:g}×")
+    elif _arg("--record"):
+        recorder = Recorder(_arg("--record"))
+        http.set_recorder(recorder)
+        print(f"Recording HTTP responses to {recorder.path}")
+    if "--schedule" in sys.argv:
+        print("Starting adaptive per-source scheduling...")
+        for s in all_sources():
+            print(f"  {s.label:<12} every {s.interval_minutes} min "
+                  f"(range {s.min_interval_minutes}–{s.max_interval_minutes})")
+        print("Press Ctrl+C to stop.\n")
+    try:
+        if "--schedule" in sys.argv:
+            run_scheduled()
+        else:
+            # Single run
+            run_scrape_cycle()
+            # Let queued alert webhooks go out before the process exits
+            alerts.get_bus().drain()
+    finally:
+        if recorder is not None:
+            http.set_recorder(None)
+            recorder.close()
+            print(f"Recorded {recorder.count} responses to {recorder.path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,210 @@
+"""
+LeapPulse — Instrumentation
+Low-overhead in-process counters and histograms, rendered in the
+Prometheus text exposition format for the server's /metrics endpoint.
+
+Stage histograms recorded across the backend:
+  leappulse_fetch_seconds{host}          HTTP fetch latency
+  leappulse_parse_seconds{source}        HTML / JSON / RSS parsing
+  leappulse_sentiment_seconds            sentiment scoring, per item
+  leappulse_sentiment_batch_seconds      batched (transformer) scoring, per batch
+  leappulse_language_seconds             language stage, per batch of cache misses
+  leappulse_aggregate_seconds{stage}     aggregator functions
+  leappulse_db_write_seconds{table}      storage writes
+  leappulse_search_index_seconds         full-text index updates
+Counters:
+  leappulse_http_responses_total{host,status}
+  leappulse_cache_total{cache,result}    hit / miss
+  leappulse_sentiment_route_total{route,reason}   lexicon-settled vs escalated (or language)
+  leappulse_language_total{lang}                  raw items per detected language
+  leappulse_brand_normalized_total                Indian-script brand spellings rewritten
+  leappulse_reddit_comment_requests_total{kind}   thread / "load more" fetches
+  leappulse_reddit_comment_budget_exhausted_total comment fetches denied by the budget
+  leappulse_reddit_threads_unchanged_total        threads skipped, nothing new
+  leappulse_reddit_threads_shared_total           threads already expanded by another job this cycle
+  leappulse_retention_evicted_total{reason}       window / items / bytes
+  leappulse_reach_observed_total                  mentions fed into the reach digests
+  leappulse_breaker_transitions_total{source,state}
+  leappulse_breaker_rejected_total{source}        jobs skipped by an open breaker
+  leappulse_cycle_deadline_total{source}          sources cut off by the cycle deadline
+  leappulse_stream_batches_total{source}          micro-batches handed to the cycle's sink
+  leappulse_alerts_total{priority,outcome}        published / duplicate / rate_limited
+  leappulse_alert_webhook_total{status}
+"""
+
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Buckets in seconds, spanning sub-millisecond scoring to slow fetches
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+_lock = threading.Lock()
+_counters: dict[str, dict[tuple, float]] = {}
+_histograms: dict[str, dict[tuple, list]] = {}
+_help: dict[str, str] = {}
+
+
+def _labels_key(labels: dict) -> tuple:
+    return tuple(sorted(labels.items()))
+
+
+def describe(name: str, help_text: str) -> None:
+    _help[name] = help_text
+
+
+def inc(name: str, value: float = 1, **labels) -> None:
+    key = _labels_key(labels)
+    with _lock:
+        series = _counters.setdefault(name, {})
+        series[key] = series.get(key, 0) + value
+
+
+def observe(name: str, value: float, **labels) -> None:
+    """Record one sample into a histogram: [bucket counts…, sum, count]."""
+    key = _labels_key(labels)
+    idx = bisect_left(DEFAULT_BUCKETS, value)
+    with _lock:
+        series = _histograms.setdefault(name, {})
+        h = series.get(key)
+        if h is None:
+            h = series[key] = [0] * len(DEFAULT_BUCKETS) + [0.0, 0]
+        if idx < len(DEFAULT_BUCKETS):
+            h[idx] += 1
+        h[-2] += value
+        h[-1] += 1
+
+
+@contextmanager
+def timer(name: str, **labels):
+    """Time a block into histogram `name`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+
+def timed(name: str, **labels):
+    """Decorator form of `timer`."""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            with timer(name, **labels):
+                return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+
+def cache_result(cache: str, hit: bool) -> None:
+    inc("leappulse_cache_total", cache=cache, result="hit" if hit else "miss")
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(key: tuple, extra: tuple = ()) -> str:
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def export() -> dict:
+    """This process's series as JSON-safe data, for merging into another's render()."""
+    with _lock:
+        return {
+            "counters": {n: [[list(k), v] for k, v in s.items()] for n, s in _counters.items()},
+            "histograms": {n: [[list(k), list(h)] for k, h in s.items()] for n, s in _histograms.items()},
+        }
+
+
+def render(merge: list[dict] = ()) -> str:
+    """
+    Render every metric in Prometheus text format (v0.0.4), summed with
+    the export() of other processes in `merge` (scrape workers).
+    """
+    with _lock:
+        counters = {n: dict(s) for n, s in _counters.items()}
+        histograms = {n: {k: list(v) for k, v in s.items()} for n, s in _histograms.items()}
+    for state in merge:
+        for name, series in state.get("counters", {}).items():
+            merged = counters.setdefault(name, {})
+            for key, value in series:
+                key = tuple(tuple(pair) for pair in key)
+                merged[key] = merged.get(key, 0) + value
+        for name, series in state.get("histograms", {}).items():
+            merged = histograms.setdefault(name, {})
+            for key, h in series:
+                key = tuple(tuple(pair) for pair in key)
+                if key in merged:
+                    merged[key] = [a + b for a, b in zip(merged[key], h)]
+                else:
+                    merged[key] = list(h)
+
+    lines: list[str] = []
+    for name, series in sorted(counters.items()):
+        if name in _help:
+            lines.append(f"# HELP {name} {_help[name]}")
+        lines.append(f"# TYPE {name} counter")
+        for key, value in series.items():
+            lines.append(f"{name}{_fmt_labels(key)} {value:g}")
+
+    for name, series in sorted(histograms.items()):
+        if name in _help:
+            lines.append(f"# HELP {name} {_help[name]}")
+        lines.append(f"# TYPE {name} histogram")
+        for key, h in series.items():
+            cumulative = 0
+            for bound, count in zip(DEFAULT_BUCKETS, h):
+                cumulative += count
+                lines.append(f"{name}_bucket{_fmt_labels(key, (('le', f'{bound:g}'),))} {cumulative}")
+            lines.append(f"{name}_bucket{_fmt_labels(key, (('le', '+Inf'),))} {h[-1]}")
+            lines.append(f"{name}_sum{_fmt_labels(key)} {h[-2]:.6f}")
+            lines.append(f"{name}_count{_fmt_labels(key)} {h[-1]}")
+
+    return "\n".join(lines) + "\n"
+
+
+def summary() -> dict:
+    """Per-series totals (count, sum, mean) — handy for logs and benchmarks."""
+    with _lock:
+        out = {}
+        for name, series in _histograms.items():
+            for key, h in series.items():
+                label = name + _fmt_labels(key)
+                out[label] = {
+                    "count": h[-1],
+                    "sum": round(h[-2], 6),
+                    "mean": round(h[-2] / h[-1], 6) if h[-1] else 0.0,
+                }
+        return out
+
+
+def counter(name: str, **labels) -> float:
+    """Sum of every series of counter `name` whose labels include `labels`."""
+    want = set(labels.items())
+    with _lock:
+        return sum(v for k, v in _counters.get(name, {}).items() if want <= set(k))
+
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+describe("leappulse_fetch_seconds", "HTTP fetch latency by host")
+describe("leappulse_parse_seconds", "Response parsing time by source")
+describe("leappulse_sentiment_seconds", "Sentiment scoring time per item")
+describe("leappulse_aggregate_seconds", "Aggregate computation time by stage")
+describe("leappulse_db_write_seconds", "Database write time by table")
+describe("leappulse_http_responses_total", "HTTP responses by host and status")
+describe("leappulse_cache_total", "Cache lookups by cache and result")
+describe("leappulse_sentiment_route_total", "Sentiment cascade routing: settled by the lexicon or escalated, by reason")
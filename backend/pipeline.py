@@ -0,0 +1,395 @@
+"""
+LeapPulse — Scrape Pipeline
+The one hot loop shared by every source:
+
+  raw items → language → relevance filter → dedup → sentiment → priority → batches
+                                                    (Hindi lexicon, or  ↘ alerts (immediately)
+                                                     lexicon, then full
+                                                     scorer if escalated)
+
+Sources run concurrently; jobs within a source are bounded by the
+source's own `concurrency`. Each source's jobs go through its circuit
+breaker, and a full cycle is cut off at CYCLE_DEADLINE_SECONDS.
+
+Every stage hands on through a bounded queue (raw items, then
+STREAM_QUEUE_BATCHES micro-batches of STREAM_BATCH_SIZE in stream()), so
+a slow consumer stalls fetching rather than growing memory. main.py
+writes each micro-batch to the database as it arrives; collect_all()
+gathers the same stream into lists for callers that want them.
+"""
+
+import asyncio
+from contextlib import aclosing
+from typing import AsyncIterator, Callable
+
+import alerts
+import language
+import metrics
+import reach
+from config import (
+    BRAND_NAME,
+    CYCLE_DEADLINE_SECONDS,
+    LANGUAGE_BATCH_SIZE,
+    STREAM_BATCH_SIZE,
+    STREAM_QUEUE_BATCHES,
+    is_relevant_mention,
+)
+from sentiment import (
+    analyze_sentiment,
+    analyze_sentiment_batch,
+    compute_priority_contextual,
+    lexicon_sentiment,
+    sentiment_batch_size,
+)
+from scrapers.base import Source
+from scrapers.breaker import get_breaker
+
+_DONE = object()
+
+
+async def iter_raw_batches(
+    source: Source,
+    brand: str,
+    jobs: list[dict] | None = None,
+    max_batch: int = 1,
+    errors: list[str] | None = None,
+) -> AsyncIterator[list[dict]]:
+    """
+    Merge the raw items of a source's jobs (default: all of them) into one
+    stream, yielding whatever has arrived (up to `max_batch`) without
+    waiting for a batch to fill. Failed jobs (including ones skipped by an
+    open breaker) are appended to `errors` when given.
+    """
+    # Deferred: requests adds ~75 ms to importing the API server
+    from scrapers import http
+
+    if jobs is None:
+        jobs = await asyncio.to_thread(source.jobs, brand)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=256)
+    sem = asyncio.Semaphore(max(1, source.concurrency))
+    breaker = get_breaker(source.name)
+
+    async def run_job(job: dict) -> None:
+        async with sem:
+            # An open breaker skips the job without touching the network
+            if not breaker.allow():
+                if errors is not None:
+                    errors.append(f"{source.name} circuit open")
+                return
+            try:
+                async for item in source.fetch(brand, job):
+                    await queue.put(item)
+            except asyncio.CancelledError:
+                # Cut off by the cycle deadline: counts against the source
+                breaker.record(False, "cycle deadline")
+                raise
+            except Exception as e:
+                breaker.record(False, str(e)[:200])
+                print(f"  ✗ {source.label} scrape error for {job}: {e}")
+                if errors is not None:
+                    errors.append(str(e)[:200])
+            else:
+                breaker.record(True)
+            await asyncio.sleep(http.politeness_delay(source.delay))
+
+    async def run_all() -> None:
+        try:
+            await asyncio.gather(*(run_job(job) for job in jobs))
+        except asyncio.CancelledError:
+            raise  # consumer stopped reading: nobody waits for _DONE, and the queue may be full
+        except Exception as e:
+            print(f"  ✗ {source.label} failed: {e}")
+        await queue.put(_DONE)
+
+    producer = asyncio.create_task(run_all())
+    try:
+        done = False
+        while not done:
+            item = await queue.get()
+            if item is _DONE:
+                break
+            batch = [item]
+            while len(batch) < max_batch and not queue.empty():
+                item = queue.get_nowait()
+                if item is _DONE:
+                    done = True
+                    break
+                batch.append(item)
+            yield batch
+    finally:
+        producer.cancel()
+
+
+async def iter_raw(source: Source, brand: str, jobs: list[dict] | None = None) -> AsyncIterator[dict]:
+    """Merge the raw items of a source's jobs (default: all of them) into one stream."""
+    async for batch in iter_raw_batches(source, brand, jobs):
+        for item in batch:
+            yield item
+
+
+def score(raw: dict, sentiment: float | None = None) -> dict:
+    """Turn a raw item into a scored mention dict (reusing `sentiment` if given)."""
+    content = raw["content"]
+    likes = raw.get("likes", 0)
+    reach_value = raw.get("reach", likes)
+    if sentiment is None:
+        with metrics.timer("leappulse_sentiment_seconds"):
+            sentiment = lexicon_sentiment(content, reach_value)
+            if sentiment is None:
+                sentiment = analyze_sentiment(content)
+    reach_pct = reach.percentile(raw["platform"], reach.engagement(raw))
+    priority = compute_priority_contextual(sentiment, reach_value, content, reach_pct)
+    return {
+        "platform": raw["platform"],
+        "content": content,
+        "sentiment_score": sentiment,
+        "likes": likes,
+        "shares": raw.get("shares", 0),
+        "comments": raw.get("comments", 0),
+        "author": raw.get("author", "unknown"),
+        "source_url": raw.get("source_url", ""),
+        "priority": priority,
+    }
+
+
+async def score_batch(raws: list[dict]) -> list[dict]:
+    """Score several raw items with one batched sentiment call, off the event loop."""
+    with metrics.timer("leappulse_sentiment_batch_seconds"):
+        sentiments = await asyncio.to_thread(analyze_sentiment_batch, [r["content"] for r in raws])
+    return [score(r, s) for r, s in zip(raws, sentiments)]
+
+
+async def process(
+    source: Source,
+    brand: str,
+    batch_size: int = 50,
+    seen: set[tuple[str, str]] | None = None,
+    jobs: list[dict] | None = None,
+    errors: list[str] | None = None,
+) -> AsyncIterator[list[dict]]:
+    """
+    Run one source through filter → dedup → score and yield mention batches.
+    Pass a shared `seen` set to dedupe across sources or runs, `jobs` to
+    run only some of the source's jobs, and `errors` to collect job failures.
+    """
+    seen = seen if seen is not None else set()
+    batch: list[dict] = []
+    # Items are scored one at a time with TextBlob, in micro-batches with
+    # the transformer backend
+    scoring_batch = sentiment_batch_size()
+    pending: list[dict] = []
+
+    async for raws in iter_raw_batches(source, brand, jobs, LANGUAGE_BATCH_SIZE, errors):
+        # Language stage: relevance sees Indian-script brand spellings, and
+        # Hindi / Hinglish items arrive already scored
+        analyses = language.analyze_batch([r["content"] for r in raws], brand)
+        for raw, lang in zip(raws, analyses):
+            # Comments under a post that names the brand count as mentions
+            if not raw.get("relevant") and not is_relevant_mention(lang.text, brand):
+                continue
+            key = (raw["platform"], raw.get("key") or raw.get("source_url", ""))
+            if key in seen:
+                continue
+            seen.add(key)
+
+            if lang.sentiment is not None:
+                scored = [score(raw, lang.sentiment)]
+            elif scoring_batch <= 1:
+                scored = [score(raw)]
+            else:
+                # Only items the lexicon escalates wait for a transformer micro-batch
+                settled = lexicon_sentiment(raw["content"], raw.get("reach", raw.get("likes", 0)))
+                if settled is not None:
+                    scored = [score(raw, settled)]
+                else:
+                    pending.append(raw)
+                    if len(pending) < scoring_batch:
+                        continue
+                    scored, pending = await score_batch(pending), []
+
+            for mention in scored:
+                alerts.publish(mention)
+            batch.extend(scored)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+
+    if pending:
+        scored = await score_batch(pending)
+        for mention in scored:
+            alerts.publish(mention)
+        batch.extend(scored)
+    if batch:
+        yield batch
+
+
+async def collect(
+    source: Source,
+    brand: str,
+    jobs: list[dict] | None = None,
+    errors: list[str] | None = None,
+) -> list[dict]:
+    """Run a source (or some of its jobs) to completion and return all its mentions."""
+    mentions: list[dict] = []
+    async for batch in process(source, brand, jobs=jobs, errors=errors):
+        mentions.extend(batch)
+    return mentions
+
+
+async def stream(
+    sources: list[Source],
+    brand: str,
+    deadline: float | None = CYCLE_DEADLINE_SECONDS,
+    on_done: Callable[[Source, int, str], None] | None = None,
+    batch_size: int = STREAM_BATCH_SIZE,
+    max_batches: int = STREAM_QUEUE_BATCHES,
+) -> AsyncIterator[tuple[Source, list[dict]]]:
+    """
+    Run sources concurrently and yield (source, micro-batch) pairs as
+    mentions are scored. At most `max_batches` batches wait for the
+    consumer; past that the sources block, and with them their fetches,
+    so a slow sink holds the cycle's memory flat instead of piling up
+    mentions. Sources still running at `deadline` seconds are cancelled;
+    what they had scored is still yielded.
+
+    `on_done(source, count, status)` is called after a source's last
+    batch: status is "fresh", "failed" (crashed, or nothing fetched with
+    its circuit open) or "stale" (cut off by the deadline).
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, max_batches))
+    partial: dict[Source, list[dict]] = {s: [] for s in sources}
+    counts: dict[Source, int] = {s: 0 for s in sources}
+
+    async def run(source: Source) -> None:
+        # Unbatched, so everything scored before a cut-off is kept. Closed
+        # explicitly: a deadline can land while this waits on the queue
+        async with aclosing(process(source, brand, batch_size=1)) as batches:
+            async for batch in batches:
+                partial[source].extend(batch)
+                counts[source] += len(batch)
+                if len(partial[source]) >= batch_size:
+                    # Cleared only once queued: a put cancelled by the deadline loses nothing
+                    await queue.put((source, partial[source]))
+                    partial[source] = []
+
+    async def finish(source: Source, status: str) -> None:
+        if partial[source]:
+            await queue.put((source, partial[source]))
+            partial[source] = []
+        await queue.put((source, status))
+
+    async def run_sources() -> None:
+        tasks = {asyncio.create_task(run(s)): s for s in sources}
+        loop = asyncio.get_running_loop()
+        end = loop.time() + deadline if deadline else None
+        pending = set(tasks)
+        try:
+            while pending:
+                timeout = None if end is None else max(0.0, end - loop.time())
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    break  # deadline
+                for task in done:
+                    source = tasks[task]
+                    if task.exception() is not None:
+                        print(f"  ✗ {source.label} failed: {task.exception()}")
+                        await finish(source, "failed")
+                    elif not counts[source] and get_breaker(source.name).state != "closed":
+                        await finish(source, "failed")
+                    else:
+                        await finish(source, "fresh")
+
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            for task in pending:
+                source = tasks[task]
+                metrics.inc("leappulse_cycle_deadline_total", source=source.name)
+                print(f"  ⏱ {source.label} cut off at the {deadline:.0f}s cycle deadline "
+                      f"({counts[source]} mentions kept)")
+                await finish(source, "stale")
+        finally:
+            for task in tasks:
+                task.cancel()
+        await queue.put(_DONE)
+
+    producer = asyncio.create_task(run_sources())
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                break
+            source, batch = item
+            if isinstance(batch, str):
+                if on_done is not None:
+                    on_done(source, counts[source], batch)
+                continue
+            metrics.inc("leappulse_stream_batches_total", source=source.name)
+            yield source, batch
+    finally:
+        # Consumer stopped early (error, or broke out of the loop): stop the sources too
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+
+
+async def collect_all(
+    sources: list[Source],
+    brand: str,
+    deadline: float | None = CYCLE_DEADLINE_SECONDS,
+    on_done: Callable[[Source, list[dict], str], None] | None = None,
+) -> dict[str, list[dict]]:
+    """
+    stream() gathered per source: returns {source label: mentions}.
+    `on_done(source, mentions, status)` gets the source's full list, so
+    callers can publish partial results as each source finishes.
+    """
+    out: dict[str, list[dict]] = {s.label: [] for s in sources}
+
+    def finished(source: Source, count: int, status: str) -> None:
+        if on_done is None:
+            return
+        try:
+            on_done(source, out[source.label], status)
+        except Exception as e:
+            print(f"  ✗ Publishing {source.label} failed: {e}")
+
+    async for source, batch in stream(sources, brand, deadline, finished, batch_size=1, max_batches=256):
+        out[source.label].extend(batch)
+    return out
+
+
+def run_source(name: str, brand: str | None = None) -> list[dict]:
+    """Blocking helper: scrape a single registered source."""
+    from scrapers.registry import get_source
+
+    return asyncio.run(collect(get_source(name), brand or BRAND_NAME))
+
+
+class JobError(RuntimeError):
+    """A queued job's fetch failed, so the job queue should retry it."""
+
+
+def run_job(name: str, job: dict, brand: str | None = None) -> list[dict]:
+    """
+    Blocking helper: run one job of a registered source (used by worker
+    processes). Raises JobError if the fetch failed or the source's breaker
+    is open, rather than returning the empty result.
+    """
+    from scrapers.registry import get_source
+
+    errors: list[str] = []
+    mentions = asyncio.run(collect(get_source(name), brand or BRAND_NAME, [job], errors))
+    if errors:
+        raise JobError("; ".join(errors))
+    return mentions
+
+
+def run_all(
+    brand: str | None = None,
+    on_done: Callable[[Source, list[dict], str], None] | None = None,
+) -> dict[str, list[dict]]:
+    """Blocking helper: scrape every registered source concurrently."""
+    from scrapers.registry import all_sources
+
+    return asyncio.run(collect_all(all_sources(), brand or BRAND_NAME, on_done=on_done))
@@ -0,0 +1,219 @@
+"""
+LeapPulse — Scrape-cycle profiler
+Opt-in (PROFILE_MODE) profile of each scrape cycle, for when a cycle
+suddenly takes twice as long and the stage timers in metrics.py don't say
+which function is to blame:
+
+  sample    a background thread snapshots the stacks of the cycle's
+            thread and every thread it starts (asyncio.to_thread workers)
+            every PROFILE_INTERVAL_MS. Written as collapsed stacks
+            ("frame;frame;frame count"), which flamegraph.pl, speedscope
+            and inferno read directly. Overhead is one stack walk per
+            interval, independent of how much Python runs.
+  cprofile  deterministic cProfile of the cycle's own thread (worker
+            threads are not seen), written as a .prof file for pstats /
+            snakeviz. Exact call counts, much higher overhead.
+
+Files go to PROFILE_DIR, newest PROFILE_KEEP kept. latest.json there
+holds the summary of the newest profile (top functions by self and
+inclusive time), which /api/admin/profile serves from any worker.
+"""
+
+import cProfile
+import glob
+import json
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator
+
+from config import PROFILE_DIR, PROFILE_INTERVAL_MS, PROFILE_KEEP, PROFILE_MODE
+
+_SUMMARY = "latest.json"
+_TOP = 15
+# Leaf frame of a ThreadPoolExecutor worker blocked on its work queue
+_IDLE_WORKER = "_worker (thread.py:"
+
+
+def _label(name: str, filename: str, line: int) -> str:
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def _thread_root(name: str) -> str:
+    """Fold numbered pool workers ("asyncio_3", "ThreadPoolExecutor-0_1") into one root."""
+    return re.sub(r"[-_ ]?\d.*$", "", name) or "thread"
+
+
+class SamplingProfiler:
+    """Samples the starting thread plus threads created while running."""
+
+    def __init__(self, interval: float = PROFILE_INTERVAL_MS / 1000):
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._target = threading.get_ident()
+        self._ignore: set[int] = set()
+
+    def start(self) -> None:
+        self._target = threading.get_ident()
+        # Threads already running (server loop, coordinator, …) aren't this cycle's work
+        self._ignore = {t.ident for t in threading.enumerate() if t.ident != self._target}
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        roots = {self._target: "cycle"}
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == me or ident in self._ignore:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(_label(code.co_name, code.co_filename, code.co_firstlineno))
+                    frame = frame.f_back
+                if stack[0].startswith(_IDLE_WORKER):
+                    continue  # pool thread waiting for work, not doing any
+                if ident not in roots:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                    roots[ident] = _thread_root(names.get(ident, "thread"))
+                stack.append(roots[ident])
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+    def summary(self) -> dict:
+        self_counts: Counter[str] = Counter()
+        inclusive: Counter[str] = Counter()
+        total = sum(self.stacks.values())
+        for stack, n in self.stacks.items():
+            frames = stack.split(";")
+            self_counts[frames[-1]] += n
+            for f in set(frames[1:]):
+                inclusive[f] += n
+
+        def top(counts: Counter) -> list[dict]:
+            return [
+                {"function": f, "samples": n, "percent": round(n / total * 100, 1)}
+                for f, n in counts.most_common(_TOP)
+            ]
+
+        return {"samples": total, "self": top(self_counts), "inclusive": top(inclusive)}
+
+
+def _cprofile_summary(prof: cProfile.Profile) -> dict:
+    stats = pstats.Stats(prof)
+    rows = [
+        (_label(fn, file, line), calls, own, cumulative)
+        for (file, line, fn), (_, calls, own, cumulative, _) in stats.stats.items()
+    ]
+
+    def top(index: int) -> list[dict]:
+        return [
+            {"function": r[0], "calls": r[1], "seconds": round(r[index], 4)}
+            for r in sorted(rows, key=lambda r: r[index], reverse=True)[:_TOP]
+        ]
+
+    return {"calls": stats.total_calls, "self": top(2), "inclusive": top(3)}
+
+
+def _rotate(directory: str, keep: int) -> None:
+    files = sorted(
+        (p for p in glob.glob(os.path.join(directory, "cycle-*")) if not p.endswith(".tmp")),
+        key=os.path.getmtime,
+        reverse=True,
+    )
+    for path in files[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _save(label: str, started: datetime, seconds: float, ext: str, write, summary: dict) -> str:
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path = os.path.join(PROFILE_DIR, f"cycle-{started:%Y%m%d-%H%M%S}-{label}.{ext}")
+    write(path)
+    summary = {
+        "mode": PROFILE_MODE,
+        "label": label,
+        "started": started.isoformat(),
+        "seconds": round(seconds, 3),
+        "file": os.path.basename(path),
+        **summary,
+    }
+    tmp = os.path.join(PROFILE_DIR, _SUMMARY + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(summary, f, indent=2)
+    os.replace(tmp, os.path.join(PROFILE_DIR, _SUMMARY))
+    _rotate(PROFILE_DIR, PROFILE_KEEP)
+    return path
+
+
+@contextmanager
+def cycle(label: str) -> Iterator[None]:
+    """Profile the enclosed scrape cycle when PROFILE_MODE is on; free otherwise."""
+    if PROFILE_MODE not in ("sample", "cprofile"):
+        yield
+        return
+    started = datetime.now()
+    start = time.perf_counter()
+    if PROFILE_MODE == "sample":
+        profiler = SamplingProfiler()
+        profiler.start()
+    else:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        try:
+            if PROFILE_MODE == "sample":
+                profiler.stop()
+
+                def write(path: str) -> None:
+                    with open(path, "w") as f:
+                        f.write(profiler.collapsed())
+
+                path = _save(label, started, seconds, "collapsed", write, profiler.summary())
+            else:
+                profiler.disable()
+                path = _save(label, started, seconds, "prof", profiler.dump_stats, _cprofile_summary(profiler))
+            print(f"  ⏱ Cycle profile ({seconds:.1f}s) written to {path}")
+        except OSError as exc:
+            print(f"  ✗ Could not write cycle profile: {exc}")
+
+
+def latest() -> dict | None:
+    """Summary of the newest profile, or None if none has been written."""
+    try:
+        with open(os.path.join(PROFILE_DIR, _SUMMARY)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def latest_file() -> str | None:
+    """Path of the newest profile file."""
+    summary = latest()
+    if summary is None:
+        return None
+    path = os.path.join(PROFILE_DIR, summary["file"])
+    return path if os.path.exists(path) else None
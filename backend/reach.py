@@ -0,0 +1,319 @@
+"""
+LeapPulse — Reach normalization
+Engagement counts mean different things per platform: YouTube reports
+views, Reddit upvotes, Twitter likes, and LinkedIn / Google News report
+nothing at all. Raw counts can't be compared, so each platform keeps a
+rolling distribution of log(1 + engagement) as a t-digest, and a mention
+is scored by its percentile within its own platform.
+
+The digests are fed once per published cycle (observe_cycle) with
+exponential decay (REACH_HALF_LIFE_HOURS), saved to REACH_STATE_PATH and
+re-read by every process that scores, so percentiles never need a scan
+of stored mentions.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
+import metrics
+from config import REACH_HALF_LIFE_HOURS, REACH_MIN_SAMPLES, REACH_STATE_PATH
+from keys import mention_key
+
+_RELOAD_CHECK_SECONDS = 5.0
+_MAX_SEEN = 50_000
+
+
+def engagement(m: dict) -> int:
+    return max(0, m.get("likes", 0) + m.get("shares", 0) + m.get("comments", 0))
+
+
+class TDigest:
+    """
+    Merging t-digest (Dunning & Ertl): a few hundred centroids summarise
+    any number of points, most precisely in the tails, which is where
+    "viral" lives.
+    """
+
+    def __init__(self, compression: float = 100):
+        self.compression = compression
+        self.means: list[float] = []
+        self.weights: list[float] = []
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._cum: list[float] = []   # weight before each centroid
+        self._buffer: list[tuple[float, float]] = []
+
+    def add(self, x: float, w: float = 1.0) -> None:
+        self._buffer.append((x, w))
+        self.total += w
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+        if len(self._buffer) >= 5 * self.compression:
+            self._compress()
+
+    def _k(self, q: float) -> float:
+        return self.compression / (2 * math.pi) * math.asin(2 * min(max(q, 0.0), 1.0) - 1)
+
+    def _q_limit(self, q: float) -> float:
+        k = self._k(q) + 1
+        if k >= self.compression / 4:
+            return 1.0
+        return (math.sin(k * 2 * math.pi / self.compression) + 1) / 2
+
+    def _compress(self) -> None:
+        if not self._buffer and len(self._cum) == len(self.means):
+            return
+        points = sorted(list(zip(self.means, self.weights)) + self._buffer)
+        self._buffer = []
+        means: list[float] = []
+        weights: list[float] = []
+        if points:
+            total = sum(w for _, w in points)
+            cur_m, cur_w = points[0]
+            so_far = 0.0
+            limit = self._q_limit(0.0)
+            for m, w in points[1:]:
+                if (so_far + cur_w + w) / total <= limit:
+                    cur_m = (cur_m * cur_w + m * w) / (cur_w + w)
+                    cur_w += w
+                else:
+                    means.append(cur_m)
+                    weights.append(cur_w)
+                    so_far += cur_w
+                    limit = self._q_limit(so_far / total)
+                    cur_m, cur_w = m, w
+            means.append(cur_m)
+            weights.append(cur_w)
+        self.means, self.weights = means, weights
+        self._cum = []
+        acc = 0.0
+        for w in weights:
+            self._cum.append(acc)
+            acc += w
+
+    def scale(self, factor: float) -> None:
+        """Multiply every weight by `factor` (decay); shapes are unchanged."""
+        self._compress()
+        self.weights = [w * factor for w in self.weights]
+        self._cum = [c * factor for c in self._cum]
+        self.total *= factor
+
+    def cdf(self, x: float) -> float:
+        """Fraction of the weight at or below x (ties count half)."""
+        self._compress()
+        n = len(self.means)
+        if n == 0 or self.total <= 0:
+            return 0.5
+        if x < self.min:
+            return 0.0
+        if x > self.max:
+            return 1.0
+        lo = bisect_left(self.means, x)
+        hi = bisect_right(self.means, x)
+        if lo < hi:
+            tied = self._cum[hi - 1] + self.weights[hi - 1] - self._cum[lo]
+            return (self._cum[lo] + tied / 2) / self.total
+        if lo == 0:
+            left_x, left_c = self.min, 0.0
+        else:
+            left_x, left_c = self.means[lo - 1], self._cum[lo - 1] + self.weights[lo - 1] / 2
+        if lo == n:
+            right_x, right_c = self.max, self.total
+        else:
+            right_x, right_c = self.means[lo], self._cum[lo] + self.weights[lo] / 2
+        frac = (x - left_x) / (right_x - left_x) if right_x > left_x else 0.5
+        return (left_c + frac * (right_c - left_c)) / self.total
+
+    def quantile(self, q: float) -> float:
+        self._compress()
+        n = len(self.means)
+        if n == 0:
+            return 0.0
+        target = min(max(q, 0.0), 1.0) * self.total
+        centers = [c + w / 2 for c, w in zip(self._cum, self.weights)]
+        i = bisect_left(centers, target)
+        if i == 0:
+            left_x, left_c = self.min, 0.0
+        else:
+            left_x, left_c = self.means[i - 1], centers[i - 1]
+        if i == n:
+            right_x, right_c = self.max, self.total
+        else:
+            right_x, right_c = self.means[i], centers[i]
+        frac = (target - left_c) / (right_c - left_c) if right_c > left_c else 0.5
+        return left_x + frac * (right_x - left_x)
+
+    def to_dict(self) -> dict:
+        self._compress()
+        return {
+            "compression": self.compression,
+            "min": self.min,
+            "max": self.max,
+            "centroids": [[round(m, 6), round(w, 6)] for m, w in zip(self.means, self.weights)],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TDigest":
+        d = cls(data.get("compression", 100))
+        for m, w in data.get("centroids", []):
+            d.means.append(m)
+            d.weights.append(w)
+        d.total = sum(d.weights)
+        d.min, d.max = data.get("min", math.inf), data.get("max", -math.inf)
+        d._compress()
+        return d
+
+
+class ReachModel:
+    """Per-platform engagement digests, shared between processes via a file."""
+
+    def __init__(
+        self,
+        path: str = REACH_STATE_PATH,
+        half_life_hours: float = REACH_HALF_LIFE_HOURS,
+        min_samples: int = REACH_MIN_SAMPLES,
+    ):
+        self.path = path
+        self.half_life = half_life_hours * 3600
+        self.min_samples = min_samples
+        self.digests: dict[str, TDigest] = {}
+        self.updated_at = 0.0
+        self._seen: OrderedDict[str, None] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stamp: tuple | None = None
+        self._checked_at = 0.0
+        self._load()
+
+    # ── Writer side (whoever publishes cycles) ──
+
+    def observe(self, mentions: list[dict]) -> int:
+        """Add mentions not observed before. Returns how many were added."""
+        now = time.time()
+        added = 0
+        with self._lock:
+            if self.updated_at and self.half_life > 0:
+                factor = 0.5 ** ((now - self.updated_at) / self.half_life)
+                for d in self.digests.values():
+                    d.scale(factor)
+            for m in mentions:
+                key = mention_key(m)
+                if key in self._seen:
+                    continue
+                self._seen[key] = None
+                if len(self._seen) > _MAX_SEEN:
+                    self._seen.popitem(last=False)
+                platform = m.get("platform", "unknown")
+                self.digests.setdefault(platform, TDigest()).add(math.log1p(engagement(m)))
+                added += 1
+            self.updated_at = now
+        metrics.inc("leappulse_reach_observed_total", added)
+        return added
+
+    def mark_seen(self, mentions: list[dict]) -> None:
+        """
+        Remember mentions as observed without adding them: what a restarted
+        process loads (snapshot, stored history) is in the saved digests
+        already, and would otherwise be counted again next cycle.
+        """
+        with self._lock:
+            for m in mentions:
+                self._seen[mention_key(m)] = None
+            while len(self._seen) > _MAX_SEEN:
+                self._seen.popitem(last=False)
+
+    def save(self) -> None:
+        with self._lock:
+            payload = {
+                "updated_at": self.updated_at,
+                "platforms": {p: d.to_dict() for p, d in self.digests.items()},
+            }
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(payload, f, separators=(",", ":"))
+        os.replace(tmp, self.path)
+        with self._lock:
+            self._stamp = self._file_stamp()
+
+    # ── Reader side (scoring, aggregates) ──
+
+    def _file_stamp(self) -> tuple | None:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _load(self) -> None:
+        stamp = self._file_stamp()
+        if stamp is None or stamp == self._stamp:
+            return
+        try:
+            with open(self.path) as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.digests = {p: TDigest.from_dict(d) for p, d in payload.get("platforms", {}).items()}
+        self.updated_at = payload.get("updated_at", 0.0)
+        self._stamp = stamp
+
+    def _maybe_reload(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < _RELOAD_CHECK_SECONDS:
+            return
+        self._checked_at = now
+        with self._lock:
+            self._load()
+
+    def percentile(self, platform: str, value: int) -> float | None:
+        """
+        Where `value` sits among the platform's engagement, 0–1. None until
+        the platform has REACH_MIN_SAMPLES observations.
+        """
+        self._maybe_reload()
+        with self._lock:
+            d = self.digests.get(platform)
+            if d is None or d.total < self.min_samples:
+                return None
+            return d.cdf(math.log1p(max(0, value)))
+
+    def status(self) -> dict[str, dict]:
+        self._maybe_reload()
+        with self._lock:
+            return {
+                p: {
+                    "samples": round(d.total, 1),
+                    "p50": round(math.expm1(d.quantile(0.5))),
+                    "p90": round(math.expm1(d.quantile(0.9))),
+                    "p99": round(math.expm1(d.quantile(0.99))),
+                }
+                for p, d in sorted(self.digests.items())
+            }
+
+
+_model: ReachModel | None = None
+_model_lock = threading.Lock()
+
+
+def get_model() -> ReachModel:
+    global _model
+    with _model_lock:
+        if _model is None:
+            _model = ReachModel()
+        return _model
+
+
+def percentile(platform: str, value: int) -> float | None:
+    return get_model().percentile(platform, value)
+
+
+def observe_cycle(mentions: list[dict]) -> None:
+    """Feed one published cycle into the digests and save them."""
+    model = get_model()
+    model.observe(mentions)
+    model.save()
@@ -0,0 +1,295 @@
+"""
+LeapPulse — Mention retention
+Mentions accumulate across cycles instead of being replaced, inside a
+sliding window bounded three ways:
+
+  RETENTION_WINDOW_HOURS  mentions older than this expire
+  RETENTION_MAX_ITEMS     at most this many are kept in memory
+  RETENTION_MAX_BYTES     approximate JSON size of everything kept
+
+Expired and overflowing mentions (oldest first) are appended to gzip
+JSONL segments in RETENTION_DIR, one file per hour of created_at, which
+query_archive() reads back. Counts behind the sentiment distribution,
+platform breakdown, trending topics and dashboard totals are updated on
+every insert and eviction, so aggregates always match the window without
+a rescan.
+"""
+
+import glob
+import gzip
+import json
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
+
+import metrics
+from aggregator import (
+    compute_weekly_trend,
+    dashboard_from_totals,
+    median_engagement,
+    mention_topics,
+    platform_breakdown_from_counts,
+    reach_index,
+    sentiment_distribution_from_counts,
+    sentiment_label,
+    topics_from_counts,
+)
+from config import (
+    RETENTION_ARCHIVE_DAYS,
+    RETENTION_DIR,
+    RETENTION_MAX_BYTES,
+    RETENTION_MAX_ITEMS,
+    RETENTION_WINDOW_HOURS,
+)
+from keys import mention_key
+
+_SEGMENT_PREFIX = "mentions-"
+_SEGMENT_SUFFIX = ".jsonl.gz"
+
+
+def _local_naive(ts: str) -> datetime:
+    dt = datetime.fromisoformat(ts)
+    return dt.astimezone().replace(tzinfo=None) if dt.tzinfo else dt
+
+
+class SegmentArchive:
+    """Hourly gzip JSONL segments; each write appends one gzip member."""
+
+    def __init__(self, directory: str = RETENTION_DIR):
+        self.directory = directory
+
+    def _path(self, hour: datetime) -> str:
+        return os.path.join(self.directory, f"{_SEGMENT_PREFIX}{hour:%Y%m%d%H}{_SEGMENT_SUFFIX}")
+
+    def write(self, mentions: list[dict]) -> None:
+        if not mentions:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        by_hour: dict[datetime, list[dict]] = {}
+        for m in mentions:
+            hour = _local_naive(m["created_at"]).replace(minute=0, second=0, microsecond=0)
+            by_hour.setdefault(hour, []).append(m)
+        for hour, rows in by_hour.items():
+            lines = "".join(json.dumps(m, default=str, separators=(",", ":")) + "\n" for m in rows)
+            with gzip.open(self._path(hour), "at", encoding="utf-8") as f:
+                f.write(lines)
+
+    def segments(self) -> list[tuple[datetime, str]]:
+        """(hour, path) of every segment, newest first."""
+        out = []
+        for path in glob.glob(os.path.join(self.directory, f"{_SEGMENT_PREFIX}*{_SEGMENT_SUFFIX}")):
+            stamp = os.path.basename(path)[len(_SEGMENT_PREFIX):-len(_SEGMENT_SUFFIX)]
+            try:
+                out.append((datetime.strptime(stamp, "%Y%m%d%H"), path))
+            except ValueError:
+                continue
+        return sorted(out, reverse=True)
+
+    def query(
+        self,
+        since: str | None = None,
+        until: str | None = None,
+        platform: str | None = None,
+        priority: str | None = None,
+        limit: int = 500,
+    ) -> list[dict]:
+        """Archived mentions, newest first. Only segments overlapping the range are read."""
+        lo = _local_naive(since) if since else None
+        hi = _local_naive(until) if until else None
+        out: list[dict] = []
+        for hour, path in self.segments():
+            if hi and hour >= hi:
+                continue
+            if lo and hour + timedelta(hours=1) <= lo:
+                break
+            rows = []
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    m = json.loads(line)
+                    ts = _local_naive(m["created_at"])
+                    if (lo and ts < lo) or (hi and ts >= hi):
+                        continue
+                    if platform and m.get("platform") != platform:
+                        continue
+                    if priority and m.get("priority") != priority:
+                        continue
+                    rows.append(m)
+            rows.sort(key=lambda m: m["created_at"], reverse=True)
+            out.extend(rows)
+            if len(out) >= limit:
+                break
+        return out[:limit]
+
+    def prune(self, keep_days: float = RETENTION_ARCHIVE_DAYS) -> int:
+        """Delete segments older than `keep_days`. Returns how many went."""
+        cutoff = datetime.now() - timedelta(days=keep_days)
+        removed = 0
+        for hour, path in self.segments():
+            if hour + timedelta(hours=1) < cutoff:
+                os.remove(path)
+                removed += 1
+        return removed
+
+
+class _Entry:
+    __slots__ = ("mention", "ts", "size", "topics")
+
+    def __init__(self, mention: dict, ts: float, size: int, topics: list[str]):
+        self.mention = mention
+        self.ts = ts
+        self.size = size
+        self.topics = topics
+
+
+class RetentionStore:
+    def __init__(
+        self,
+        window_hours: float = RETENTION_WINDOW_HOURS,
+        max_items: int = RETENTION_MAX_ITEMS,
+        max_bytes: int = RETENTION_MAX_BYTES,
+        archive: SegmentArchive | None = None,
+    ):
+        self.window = window_hours * 3600
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.archive = archive or SegmentArchive()
+        # Arrival order; a mention seen again moves to the end
+        self._items: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._pruned_at = 0.0
+        self.bytes = 0
+        self.sentiment_sum = 0.0
+        self.sentiments: Counter[str] = Counter()
+        self.platforms: Counter[str] = Counter()
+        self.topics: Counter[str] = Counter()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _count(self, e: _Entry, sign: int) -> None:
+        m = e.mention
+        self.bytes += sign * e.size
+        self.sentiment_sum += sign * m["sentiment_score"]
+        for counter, keys in (
+            (self.sentiments, [sentiment_label(m["sentiment_score"])]),
+            (self.platforms, [m.get("platform", "Unknown")]),
+            (self.topics, e.topics),
+        ):
+            for k in keys:
+                counter[k] += sign
+                if counter[k] <= 0:
+                    del counter[k]  # keeps one-off hashtags from piling up
+
+    def add(self, mentions: list[dict], now: float | None = None, archive: bool = True) -> int:
+        """
+        Insert mentions, oldest first, then evict past the window and
+        budgets. A repeat replaces the stored copy (fresh engagement) but
+        keeps its first-seen id, created_at and place in line, so a post
+        scraped every cycle still ages out. Returns how many were evicted.
+        Pass archive=False for mentions already stored elsewhere.
+        """
+        now = now or time.time()
+        with self._lock:
+            for m in mentions:
+                key = mention_key(m)
+                old = self._items.get(key)
+                if old is not None:
+                    self._count(old, -1)
+                    ts = old.ts
+                    for field in ("id", "created_at"):
+                        if field in old.mention:
+                            m[field] = old.mention[field]
+                else:
+                    created = m.get("created_at")
+                    ts = _local_naive(created).timestamp() if created else now
+                e = _Entry(m, ts, len(json.dumps(m, default=str)), mention_topics(m))
+                self._items[key] = e
+                self._count(e, +1)
+            evicted = self._evict(now)
+        if evicted and archive:
+            try:
+                self.archive.write(evicted)
+                if now - self._pruned_at > 3600:
+                    self._pruned_at = now
+                    self.archive.prune()
+            except OSError as exc:
+                print(f"  ✗ Could not archive {len(evicted)} evicted mentions: {exc}")
+        return len(evicted)
+
+    def _evict(self, now: float) -> list[dict]:
+        evicted: list[dict] = []
+        cutoff = now - self.window if self.window > 0 else None
+        while self._items:
+            e = next(iter(self._items.values()))
+            if cutoff is not None and e.ts < cutoff:
+                reason = "window"
+            elif len(self._items) > self.max_items:
+                reason = "items"
+            elif self.bytes > self.max_bytes:
+                reason = "bytes"
+            else:
+                break
+            self._items.popitem(last=False)
+            self._count(e, -1)
+            evicted.append(e.mention)
+            metrics.inc("leappulse_retention_evicted_total", reason=reason)
+        return evicted
+
+    def mentions(self) -> list[dict]:
+        """Retained mentions, newest first."""
+        with self._lock:
+            return [e.mention for e in reversed(self._items.values())]
+
+    def aggregates(self, previous_net_sentiment: int | None = None) -> dict:
+        """Every snapshot aggregate, from the running counts where possible."""
+        with self._lock:
+            chronological = [e.mention for e in self._items.values()]
+            total = len(chronological)
+            return {
+                "sentiment_distribution": sentiment_distribution_from_counts(self.sentiments),
+                "platform_breakdown": platform_breakdown_from_counts(self.platforms),
+                "trending_topics": topics_from_counts(self.topics),
+                "dashboard_metrics": dashboard_from_totals(
+                    total,
+                    self.sentiment_sum,
+                    median_engagement(chronological),
+                    reach_index(chronological),
+                    previous_net_sentiment,
+                ),
+                "weekly_trend": compute_weekly_trend(chronological),
+            }
+
+    def stats(self) -> dict:
+        with self._lock:
+            oldest = next(iter(self._items.values())).ts if self._items else None
+        return {
+            "items": len(self._items),
+            "bytes": self.bytes,
+            "max_items": self.max_items,
+            "max_bytes": self.max_bytes,
+            "window_hours": self.window / 3600,
+            "oldest": datetime.fromtimestamp(oldest).isoformat() if oldest else None,
+            "segments": len(self.archive.segments()),
+        }
+
+
+_store: RetentionStore | None = None
+_store_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    return RETENTION_WINDOW_HOURS > 0
+
+
+def get_store() -> RetentionStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = RetentionStore()
+        return _store
+
+
+def query_archive(**filters) -> list[dict]:
+    return SegmentArchive().query(**filters)
@@ -0,0 +1,138 @@
+"""
+LeapPulse — Adaptive Per-Source Scheduler
+Each source polls on its own interval instead of one global cycle:
+
+  - intervals shrink when a run yields new mentions and grow when it
+    yields nothing, bounded by the source's min / max interval
+  - every interval gets random jitter so sources don't fire in lockstep
+  - a new CRITICAL ALERT puts every source into crisis mode, polling at
+    its minimum interval until the crisis window passes
+"""
+
+import random
+import time
+from collections import OrderedDict
+
+from config import CRISIS_MODE_MINUTES, SCHEDULE_JITTER
+from keys import mention_key
+from scrapers.base import Source
+
+# Multipliers applied to the interval after each run
+_SPEEDUP = 0.75
+_BACKOFF = 1.5
+
+# Keys remembered per source to tell new mentions from repeats
+_SEEN_LIMIT = 5000
+
+
+class SourceSchedule:
+    """Interval state for one source."""
+
+    def __init__(self, source: Source):
+        self.source = source
+        self.min_interval = source.min_interval_minutes * 60
+        self.max_interval = source.max_interval_minutes * 60
+        self.interval = float(source.interval_minutes * 60)
+        self.next_run = 0.0  # run immediately on start
+        self.last_yield = 0
+        # New mentions / any CRITICAL ALERT among them, in the run under way
+        self.run_new = 0
+        self.run_critical = False
+        self._seen: OrderedDict[str, None] = OrderedDict()
+
+    def count_new(self, mentions: list[dict]) -> list[dict]:
+        """Return mentions not seen in earlier runs, remembering them."""
+        new = []
+        for m in mentions:
+            key = mention_key(m)
+            if key in self._seen:
+                self._seen.move_to_end(key)
+                continue
+            self._seen[key] = None
+            new.append(m)
+        while len(self._seen) > _SEEN_LIMIT:
+            self._seen.popitem(last=False)
+        return new
+
+    def adapt(self, new_items: int) -> None:
+        self.last_yield = new_items
+        factor = _SPEEDUP if new_items else _BACKOFF
+        self.interval = max(self.min_interval, min(self.max_interval, self.interval * factor))
+
+
+class AdaptiveScheduler:
+    """Decides which sources are due and when to wake up next."""
+
+    def __init__(self, sources: list[Source]):
+        self.schedules = {s.name: SourceSchedule(s) for s in sources}
+        self.crisis_until = 0.0
+
+    @property
+    def in_crisis(self) -> bool:
+        return time.time() < self.crisis_until
+
+    def due(self) -> list[Source]:
+        now = time.time()
+        return [s.source for s in self.schedules.values() if s.next_run <= now]
+
+    def observe(self, source: Source, mentions: list[dict]) -> list[dict]:
+        """
+        Feed part of a run's mentions (a streamed micro-batch) into the
+        schedule. Returns the ones that are new since earlier runs.
+        """
+        sched = self.schedules[source.name]
+        new = sched.count_new(mentions)
+        sched.run_new += len(new)
+        sched.run_critical = sched.run_critical or any(m["priority"] == "CRITICAL ALERT" for m in new)
+        return new
+
+    def finish(self, source: Source) -> int:
+        """
+        Close the source's run: adapt its interval to what the run's
+        observe() calls found and schedule the next one. Returns the
+        number of new mentions.
+        """
+        sched = self.schedules[source.name]
+        new_items, critical = sched.run_new, sched.run_critical
+        sched.run_new, sched.run_critical = 0, False
+        sched.adapt(new_items)
+
+        if critical:
+            if not self.in_crisis:
+                print(f"  ⚠ CRITICAL ALERT from {source.label} — entering crisis mode")
+                # Pull every other source forward to its crisis cadence
+                now = time.time()
+                for other in self.schedules.values():
+                    other.next_run = min(other.next_run, now + other.min_interval)
+            self.crisis_until = time.time() + CRISIS_MODE_MINUTES * 60
+
+        interval = sched.min_interval if self.in_crisis else sched.interval
+        jitter = random.uniform(-SCHEDULE_JITTER, SCHEDULE_JITTER)
+        sched.next_run = time.time() + interval * (1 + jitter)
+        return new_items
+
+    def record(self, source: Source, mentions: list[dict]) -> list[dict]:
+        """
+        Feed one whole run's mentions back into the schedule.
+        Returns the mentions that are new since earlier runs.
+        """
+        new = self.observe(source, mentions)
+        self.finish(source)
+        return new
+
+    def seconds_until_next(self) -> float:
+        upcoming = min(s.next_run for s in self.schedules.values())
+        return max(0.0, upcoming - time.time())
+
+    def status(self) -> list[dict]:
+        now = time.time()
+        return [
+            {
+                "source": name,
+                "interval_minutes": round(s.interval / 60, 1),
+                "next_run_in_seconds": max(0, int(s.next_run - now)),
+                "last_new_items": s.last_yield,
+                "crisis": self.in_crisis,
+            }
+            for name, s in self.schedules.items()
+        ]
@@ -0,0 +1,54 @@
+"""
+LeapPulse — Source plugin interface
+A Source only knows how to fetch and parse one platform. It yields raw
+items; filtering, dedup, sentiment and priority scoring happen once in
+`pipeline.py` for every source.
+
+Raw item shape (dict):
+  platform, content, likes, shares, comments, author, source_url
+  key    — stable per-platform identifier used for dedup
+  reach  — optional engagement stand-in for priority scoring when the
+           platform exposes no counts (e.g. Google News, LinkedIn)
+"""
+
+from typing import AsyncIterator
+
+from config import SCRAPE_INTERVAL, get_search_queries
+
+_REGISTRY: dict[str, type["Source"]] = {}
+
+
+class Source:
+    """Base class for scraper plugins."""
+
+    name: str = ""                 # registry key, e.g. "reddit"
+    label: str = ""                # human-readable name for logs
+    interval_minutes: int = SCRAPE_INTERVAL      # starting cadence
+    min_interval_minutes: int = SCRAPE_INTERVAL  # adaptive / crisis floor
+    max_interval_minutes: int = SCRAPE_INTERVAL * 4
+    concurrency: int = 1           # jobs of this source fetched in parallel
+    delay: float = 1.0             # politeness pause after each job
+
+    def jobs(self, brand: str) -> list[dict]:
+        """
+        Units of work for one run — by default one per query variant.
+        Must be JSON-serialisable. May block (called off the event loop).
+        """
+        return [{"query": q} for q in get_search_queries(brand)]
+
+    async def fetch(self, brand: str, job: dict) -> AsyncIterator[dict]:
+        """Yield raw items for a single job."""
+        raise NotImplementedError
+        yield  # pragma: no cover — makes this an async generator
+
+
+def register(cls: type[Source]) -> type[Source]:
+    """Class decorator adding a Source to the registry."""
+    if not cls.name:
+        raise ValueError(f"{cls.__name__} must define a name")
+    _REGISTRY[cls.name] = cls
+    return cls
+
+
+def registered() -> dict[str, type[Source]]:
+    return dict(_REGISTRY)
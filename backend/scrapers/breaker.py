@@ -0,0 +1,153 @@
+"""
+LeapPulse — Per-source circuit breakers
+Stops a failing source (blocked Google SERP, every Nitter mirror down, …)
+from costing a full timeout per job on every cycle.
+
+  closed     jobs run; outcomes go into a sliding window. Once the window
+             has BREAKER_MIN_CALLS outcomes and the error rate reaches
+             BREAKER_ERROR_RATE, the breaker opens.
+  open       jobs are skipped without touching the network until the
+             cooldown passes. The cooldown doubles on every re-open, up to
+             BREAKER_MAX_COOLDOWN_SECONDS.
+  half_open  one trial job is let through: success closes the breaker,
+             failure re-opens it.
+"""
+
+import threading
+import time
+from collections import deque
+
+import metrics
+from config import (
+    BREAKER_COOLDOWN_SECONDS,
+    BREAKER_ERROR_RATE,
+    BREAKER_MAX_COOLDOWN_SECONDS,
+    BREAKER_MIN_CALLS,
+    BREAKER_WINDOW,
+)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        window: int = BREAKER_WINDOW,
+        min_calls: int = BREAKER_MIN_CALLS,
+        error_rate: float = BREAKER_ERROR_RATE,
+        cooldown: float = BREAKER_COOLDOWN_SECONDS,
+        max_cooldown: float = BREAKER_MAX_COOLDOWN_SECONDS,
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.threshold = error_rate
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = CLOSED
+        self.cooldown = cooldown
+        self.opened_at: float | None = None
+        self.last_error: str | None = None
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def _transition(self, state: str) -> None:
+        self.state = state
+        metrics.inc("leappulse_breaker_transitions_total", source=self.name, state=state)
+        print(f"  ⚡ {self.name} circuit {state.replace('_', '-')}")
+
+    def allow(self) -> bool:
+        """May a job run now? In half-open, only one trial job at a time."""
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+                self._transition(HALF_OPEN)
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+        metrics.inc("leappulse_breaker_rejected_total", source=self.name)
+        return False
+
+    def record(self, ok: bool, error: str | None = None) -> None:
+        with self._lock:
+            if not ok:
+                self.last_error = error
+            if self.state == HALF_OPEN:
+                self._trial_in_flight = False
+                if ok:
+                    self._outcomes.clear()
+                    self.cooldown = self.base_cooldown
+                    self._transition(CLOSED)
+                else:
+                    self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+                    self._open()
+                return
+            self._outcomes.append(ok)
+            if (
+                self.state == CLOSED
+                and len(self._outcomes) >= self.min_calls
+                and self.error_rate >= self.threshold
+            ):
+                self._open()
+
+    def _open(self) -> None:
+        self.opened_at = time.monotonic()
+        self._transition(OPEN)
+
+    def status(self) -> dict:
+        with self._lock:
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = max(0.0, round(self.cooldown - (time.monotonic() - self.opened_at), 1))
+            return {
+                "state": self.state,
+                "error_rate": round(self.error_rate, 2),
+                "calls": len(self._outcomes),
+                "retry_in_seconds": retry_in,
+                "last_error": self.last_error,
+            }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+
+def snapshot() -> dict[str, dict]:
+    """Status of every breaker created so far in this process."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {b.name: b.status() for b in breakers}
+
+
+_SEVERITY = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+def merge(snapshots: list[dict[str, dict]]) -> dict[str, dict]:
+    """
+    Combine snapshot() from several processes (scrape workers each keep
+    their own breakers): per source, the least healthy breaker wins.
+    """
+    out: dict[str, dict] = {}
+    for snap in snapshots:
+        for name, status in snap.items():
+            current = out.get(name)
+            if current is None or (_SEVERITY.get(status["state"], 0), status["calls"]) > (
+                _SEVERITY.get(current["state"], 0), current["calls"]
+            ):
+                out[name] = status
+    return out
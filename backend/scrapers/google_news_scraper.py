@@ -4,78 +4,70 @@ Scrapes Google News RSS for brand mentions.
 No API key needed — uses the public RSS feed.
 """
 
-import time
-import requests
 from bs4 import BeautifulSoup
-from config import HEADERS, BRAND_NAME, get_search_queries, is_relevant_mention
-from sentiment import analyze_sentiment, compute_priority_contextual
-
-
-def scrape_google_news(brand: str, limit: int = 10) -> list[dict]:
-    """
-    Fetch Google News RSS for a brand query.
-    Uses exact-match queries and filters irrelevant results.
-    """
-    mentions: list[dict] = []
-    rss_url = "https://news.google.com/rss/search"
-    seen_urls: set[str] = set()
-
-    for query in get_search_queries(brand):
-        params = {"q": f'"{query}"', "hl": "en-IN", "gl": "IN", "ceid": "IN:en"}
-
-        try:
-            resp = requests.get(rss_url, headers=HEADERS, params=params, timeout=15)
-            resp.raise_for_status()
-            soup = BeautifulSoup(resp.content, "lxml-xml")
-
-            items = soup.find_all("item")[:limit]
-
-            for item in items:
-                title = item.title.get_text(strip=True) if item.title else ""
-                description = ""
-                if item.description:
-                    desc_soup = BeautifulSoup(item.description.text, "lxml")
-                    description = desc_soup.get_text(strip=True)
-
-                content = f"{title}. {description}".strip()[:500]
-                if len(content) < 20:
-                    continue
-
-                if not is_relevant_mention(content, brand):
-                    continue
-
-                link = item.link.get_text(strip=True) if item.link else ""
-                source = item.source.get_text(strip=True) if item.source else "News"
-
-                if link in seen_urls:
-                    continue
-                seen_urls.add(link)
-
-                sentiment = analyze_sentiment(content)
-                priority = compute_priority_contextual(sentiment, 20, content)
-
-                mentions.append({
-                    "platform": "GoogleNews",
-                    "content": content,
-                    "sentiment_score": sentiment,
-                    "likes": 0,
-                    "shares": 0,
-                    "comments": 0,
-                    "author": source,
-                    "source_url": link,
-                    "priority": priority,
-                })
-
-        except Exception as e:
-            print(f"  ✗ Google News scrape error for '{query}': {e}")
-
-        time.sleep(1)
-
-    return mentions
+import metrics
+from config import BRAND_NAME
+from scrapers import http
+from scrapers.base import Source, register
+
+
+def _parse_rss(content: bytes, limit: int) -> list[dict]:
+    """Parse a Google News RSS feed into raw items."""
+    items: list[dict] = []
+    soup = BeautifulSoup(content, "lxml-xml")
+
+    for item in soup.find_all("item")[:limit]:
+        title = item.title.get_text(strip=True) if item.title else ""
+        description = ""
+        if item.description:
+            desc_soup = BeautifulSoup(item.description.text, "lxml")
+            description = desc_soup.get_text(strip=True)
+
+        content = f"{title}. {description}".strip()[:500]
+        if len(content) < 20:
+            continue
+
+        link = item.link.get_text(strip=True) if item.link else ""
+        source = item.source.get_text(strip=True) if item.source else "News"
+
+        items.append({
+            "platform": "GoogleNews",
+            "key": link,
+            "content": content,
+            "likes": 0,
+            "shares": 0,
+            "comments": 0,
+            "reach": 20,  # no engagement counts — assume modest reach
+            "author": source,
+            "source_url": link,
+        })
+    return items
+
+
+@register
+class GoogleNewsSource(Source):
+    """Google News RSS search with exact-match queries."""
+
+    name = "google_news"
+    label = "Google News"
+    interval_minutes = 60
+    min_interval_minutes = 15
+    max_interval_minutes = 240
+    limit = 10
+
+    async def fetch(self, brand: str, job: dict):
+        params = {"q": f'"{job["query"]}"', "hl": "en-IN", "gl": "IN", "ceid": "IN:en"}
+        resp = await http.aget("https://news.google.com/rss/search", params=params, timeout=15)
+        with metrics.timer("leappulse_parse_seconds", source=self.name):
+            items = _parse_rss(resp.content, self.limit)
+        for item in items:
+            yield item
 
 
 def scrape_news_brand(brand: str | None = None) -> list[dict]:
     """Run Google News scraper for a single brand."""
+    from pipeline import run_source
+
     brand = brand or BRAND_NAME
     print(f"  → Google News: {brand}")
-    return scrape_google_news(brand, limit=10)
+    return run_source("google_news", brand)
@@ -0,0 +1,79 @@
+"""
+LeapPulse — Shared HTTP layer
+Every scraper fetches through here so headers, timeouts and error
+handling live in one place.
+
+`set_url_rewriter` lets the benchmark harness point every request at a
+local fixture server without touching the scrapers. `set_recorder` /
+`set_replayer` capture real responses to an archive and serve them back
+later (see replay.py).
+"""
+
+import asyncio
+import time
+from typing import Callable
+from urllib.parse import urlsplit
+
+import requests
+
+import metrics
+from config import HEADERS
+from scrapers.replay import Recorder, Replayer
+
+_rewrite: Callable[[str], str] | None = None
+_recorder: Recorder | None = None
+_replayer: Replayer | None = None
+
+
+def set_url_rewriter(fn: Callable[[str], str] | None) -> None:
+    """Install (or clear with None) a hook that maps outgoing URLs."""
+    global _rewrite
+    _rewrite = fn
+
+
+def set_recorder(recorder: Recorder | None) -> None:
+    """Append every response fetched from now on to `recorder` (None stops)."""
+    global _recorder
+    _recorder = recorder
+
+
+def set_replayer(replayer: Replayer | None) -> None:
+    """Serve every request from a recorded archive instead of the network (None stops)."""
+    global _replayer
+    _replayer = replayer
+
+
+def politeness_delay(seconds: float) -> float:
+    """A source's pause between jobs, compressed by the replay speed when replaying."""
+    if _replayer is None:
+        return seconds
+    return seconds / _replayer.speed if _replayer.speed > 0 else 0.0
+
+
+def get(url: str, params: dict | None = None, timeout: float = 15) -> requests.Response:
+    """GET a URL with the scraper headers; raises on non-2xx."""
+    host = urlsplit(url).hostname or "unknown"
+    original = url
+    if _rewrite is not None:
+        url = _rewrite(url)
+    start = time.perf_counter()
+    try:
+        if _replayer is not None:
+            resp = _replayer.get(original, params)
+        else:
+            resp = requests.get(url, headers=HEADERS, params=params, timeout=timeout)
+            if _recorder is not None:
+                _recorder.record(original, params, resp, start, time.perf_counter() - start)
+    except Exception:
+        metrics.inc("leappulse_http_responses_total", host=host, status="error")
+        raise
+    finally:
+        metrics.observe("leappulse_fetch_seconds", time.perf_counter() - start, host=host)
+    metrics.inc("leappulse_http_responses_total", host=host, status=str(resp.status_code))
+    resp.raise_for_status()
+    return resp
+
+
+async def aget(url: str, params: dict | None = None, timeout: float = 15) -> requests.Response:
+    """Async wrapper around `get` — runs the blocking call in a worker thread."""
+    return await asyncio.to_thread(get, url, params, timeout)
@@ -0,0 +1,171 @@
+"""
+LeapPulse — Nitter Instance Pool
+Keeps a cached health score for every Nitter mirror so the Twitter
+scraper doesn't have to walk the mirror list serially on every cycle.
+
+Each mirror tracks:
+  - latency EWMA (seconds)
+  - error rate EWMA (0.0 – 1.0)
+  - last success / last failure timestamps
+
+Mirrors are probed concurrently, ranked by latency weighted by error
+rate, and requests fail over to the next-best mirror on error.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import requests
+
+import metrics
+from config import NITTER_HEALTH_TTL
+from scrapers import http
+
+# EWMA smoothing factor — higher reacts faster to the latest sample
+_ALPHA = 0.3
+
+# A mirror is considered unhealthy past either of these
+_MAX_ERROR_RATE = 0.5
+_MAX_CONSECUTIVE_FAILURES = 3
+
+
+@dataclass
+class InstanceHealth:
+    url: str
+    latency_ewma: float | None = None
+    error_rate: float = 0.0
+    consecutive_failures: int = 0
+    last_success: float | None = None
+    last_failure: float | None = None
+
+    @property
+    def healthy(self) -> bool:
+        if self.last_success is None:
+            return False
+        return (
+            self.error_rate < _MAX_ERROR_RATE
+            and self.consecutive_failures < _MAX_CONSECUTIVE_FAILURES
+        )
+
+    @property
+    def score(self) -> float:
+        """Lower is better: latency inflated by the recent error rate."""
+        latency = self.latency_ewma if self.latency_ewma is not None else 5.0
+        return latency * (1 + 4 * self.error_rate)
+
+
+class NitterPool:
+    """Thread-safe pool of Nitter mirrors with cached health scores."""
+
+    def __init__(self, instances: list[str], probe_timeout: float = 5, ttl: int = NITTER_HEALTH_TTL):
+        self._health = {url: InstanceHealth(url) for url in instances}
+        self._probe_timeout = probe_timeout
+        self._ttl = ttl
+        self._last_probe: float | None = None
+        self._lock = threading.Lock()
+
+    # ── Health bookkeeping ──
+
+    def record(self, url: str, ok: bool, latency: float) -> None:
+        """Fold one request outcome into the mirror's health score."""
+        with self._lock:
+            h = self._health.get(url)
+            if h is None:
+                return
+            now = time.time()
+            if ok:
+                h.latency_ewma = (
+                    latency if h.latency_ewma is None
+                    else _ALPHA * latency + (1 - _ALPHA) * h.latency_ewma
+                )
+                h.error_rate = (1 - _ALPHA) * h.error_rate
+                h.consecutive_failures = 0
+                h.last_success = now
+            else:
+                h.error_rate = _ALPHA + (1 - _ALPHA) * h.error_rate
+                h.consecutive_failures += 1
+                h.last_failure = now
+
+    def _probe_one(self, url: str) -> None:
+        start = time.perf_counter()
+        try:
+            http.get(url, timeout=self._probe_timeout)
+            self.record(url, True, time.perf_counter() - start)
+        except Exception:
+            self.record(url, False, time.perf_counter() - start)
+
+    def probe_all(self) -> None:
+        """Probe every mirror concurrently and refresh the cache timestamp."""
+        urls = list(self._health)
+        with ThreadPoolExecutor(max_workers=len(urls) or 1) as pool:
+            list(pool.map(self._probe_one, urls))
+        with self._lock:
+            self._last_probe = time.time()
+
+    def _stale(self) -> bool:
+        return self._last_probe is None or time.time() - self._last_probe > self._ttl
+
+    # ── Selection ──
+
+    def ranked(self) -> list[str]:
+        """
+        Healthy mirrors ordered fastest-first.
+        Re-probes when the cached scores are stale or nothing is healthy.
+        """
+        fresh = not self._stale() and bool(self._healthy_urls())
+        metrics.cache_result("nitter_health", fresh)
+        if not fresh:
+            self.probe_all()
+        return self._healthy_urls()
+
+    def _healthy_urls(self) -> list[str]:
+        with self._lock:
+            healthy = [h for h in self._health.values() if h.healthy]
+        return [h.url for h in sorted(healthy, key=lambda h: h.score)]
+
+    def best(self) -> str | None:
+        ranked = self.ranked()
+        return ranked[0] if ranked else None
+
+    def snapshot(self) -> list[dict]:
+        """Current health table, for diagnostics."""
+        with self._lock:
+            return [
+                {
+                    "url": h.url,
+                    "healthy": h.healthy,
+                    "latency_ewma": round(h.latency_ewma, 3) if h.latency_ewma is not None else None,
+                    "error_rate": round(h.error_rate, 3),
+                    "last_success": h.last_success,
+                }
+                for h in self._health.values()
+            ]
+
+    # ── Requests with failover ──
+
+    def get(self, path: str, params: dict, preferred: str | None = None, timeout: float = 15) -> tuple[str, requests.Response]:
+        """
+        GET `path` from the preferred mirror, failing over to the other
+        healthy mirrors in rank order. Returns (mirror_url, response).
+        Raises the last error if every mirror fails.
+        """
+        order = self.ranked()
+        if preferred in order:
+            order.remove(preferred)
+            order.insert(0, preferred)
+        if not order:
+            raise RuntimeError("No healthy Nitter instance available")
+
+        last_exc: Exception | None = None
+        for url in order:
+            start = time.perf_counter()
+            try:
+                resp = http.get(f"{url}{path}", params=params, timeout=timeout)
+                self.record(url, True, time.perf_counter() - start)
+                return url, resp
+            except Exception as e:
+                self.record(url, False, time.perf_counter() - start)
+                last_exc = e
+        raise last_exc  # type: ignore[misc]
@@ -1,14 +1,34 @@
 """
 LeapPulse — Reddit Scraper
 Uses Reddit's public JSON API (no authentication required).
-Searches subreddits for brand mentions with relevance filtering.
+Searches globally and across subreddits for brand mentions.
+
+With REDDIT_EXPAND_COMMENTS on, each search job also fetches the comment
+threads of relevant or busy posts (a few at a time) and emits every
+comment as its own mention. Comment fetches per cycle are capped by
+REDDIT_COMMENT_BUDGET, one budget shared by all of the cycle's jobs and
+spent busiest thread first. Comments of a post
+that mentions the brand are marked relevant (replies rarely repeat the
+name), and a post found by several jobs is expanded once per cycle.
 """
 
-import time
-import requests
-from bs4 import BeautifulSoup
-from config import HEADERS, BRAND_NAME, get_search_queries, is_relevant_mention
-from sentiment import analyze_sentiment, compute_priority_contextual
+import asyncio
+import threading
+import uuid
+from collections import OrderedDict
+
+import metrics
+from config import (
+    BRAND_NAME,
+    REDDIT_COMMENT_BUDGET,
+    REDDIT_COMMENT_CONCURRENCY,
+    REDDIT_COMMENT_MIN_COMMENTS,
+    REDDIT_EXPAND_COMMENTS,
+    get_search_queries,
+    is_relevant_mention,
+)
+from scrapers import http
+from scrapers.base import Source, register
 
 # Subreddits likely to discuss study-abroad brands
 SUBREDDITS = [
@@ -21,153 +41,294 @@ SUBREDDITS = [
 ]
 
 
-def scrape_reddit(brand: str, limit: int = 10) -> list[dict]:
+def _parse_listing(data: dict) -> list[dict]:
+    """Turn a Reddit search listing into raw items."""
+    items: list[dict] = []
+    for post in data.get("data", {}).get("children", []):
+        d = post.get("data", {})
+
+        title = d.get("title", "")
+        selftext = d.get("selftext", "")
+        content = f"{title}. {selftext}".strip()[:500]
+
+        if not content or len(content) < 20:
+            continue
+
+        items.append({
+            "platform": "Reddit",
+            "key": d.get("id", ""),
+            "content": content,
+            "likes": max(d.get("ups", 0), 0),
+            "shares": 0,
+            "comments": d.get("num_comments", 0),
+            "author": f"u/{d.get('author', 'anonymous')}",
+            "source_url": f"https://reddit.com{d.get('permalink', '')}",
+        })
+    return items
+
+
+# ── Comment threads ──
+
+_MORE_BATCH = 100         # ids per /api/morechildren call (Reddit's cap)
+_MAX_CURSORS = 2000
+_MAX_BUDGETS = 16         # cycles whose shared budget is remembered
+
+
+class _ThreadCursor:
+    """What we already know about one thread, kept across cycles."""
+
+    def __init__(self):
+        self.num_comments = -1
+        self.seen: set[str] = set()
+        self.more: list[str] = []   # "load more" ids not fetched yet
+        self.cycle: str | None = None  # last cycle that expanded the thread
+
+
+_cursors: OrderedDict[str, _ThreadCursor] = OrderedDict()
+_cursors_lock = threading.Lock()
+
+
+def _cursor(post_id: str) -> _ThreadCursor:
+    with _cursors_lock:
+        cursor = _cursors.pop(post_id, None) or _ThreadCursor()
+        _cursors[post_id] = cursor
+        while len(_cursors) > _MAX_CURSORS:
+            _cursors.popitem(last=False)
+        return cursor
+
+
+def _claim(post_id: str, cycle: str | None) -> _ThreadCursor | None:
+    """The post's cursor, or None when another job already expanded it this cycle."""
+    cursor = _cursor(post_id)
+    with _cursors_lock:
+        if cycle is not None and cursor.cycle == cycle:
+            return None
+        cursor.cycle = cycle
+        return cursor
+
+
+class _Budget:
+    def __init__(self, requests: int):
+        self.left = requests
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self._lock:
+            if self.left <= 0:
+                metrics.inc("leappulse_reddit_comment_budget_exhausted_total")
+                return False
+            self.left -= 1
+            return True
+
+
+_budgets: OrderedDict[str, _Budget] = OrderedDict()
+
+
+def _cycle_budget(cycle: str | None, requests: int) -> _Budget:
+    """
+    The budget every job of `cycle` spends from, created by whichever job
+    gets there first. Without a cycle, a budget of the job's own.
     """
-    Scrape Reddit search results for a brand.
-    Uses multiple search query variants and filters irrelevant results.
+    if cycle is None:
+        return _Budget(requests)
+    with _cursors_lock:
+        budget = _budgets.get(cycle)
+        if budget is None:
+            budget = _budgets[cycle] = _Budget(requests)
+            while len(_budgets) > _MAX_BUDGETS:
+                _budgets.popitem(last=False)
+        return budget
+
+
+def _comment_item(d: dict, relevant: bool) -> dict | None:
+    body = (d.get("body") or "").strip()
+    if len(body) < 20 or body in ("[deleted]", "[removed]"):
+        return None
+    item = {
+        "platform": "Reddit",
+        "key": d.get("name") or f"t1_{d.get('id', '')}",
+        "content": body[:500],
+        "likes": max(d.get("ups", 0), 0),
+        "shares": 0,
+        "comments": 0,
+        "author": f"u/{d.get('author', 'anonymous')}",
+        "source_url": f"https://reddit.com{d.get('permalink', '')}",
+    }
+    if relevant:
+        # Skips the pipeline's brand-name check (see pipeline.process)
+        item["relevant"] = True
+    return item
+
+
+def _walk_comments(
+    nodes: list[dict], cursor: _ThreadCursor, relevant: bool = False
+) -> tuple[list[dict], list[str]]:
     """
-    mentions: list[dict] = []
-    search_url = f"https://www.reddit.com/search.json"
-    seen_ids: set[str] = set()
-
-    for query in get_search_queries(brand):
-        params = {
-            "q": query,
-            "sort": "new",
-            "limit": limit,
-            "t": "week",
-        }
-
-        try:
-            resp = requests.get(search_url, headers=HEADERS, params=params, timeout=15)
-            resp.raise_for_status()
-            data = resp.json()
-
-            posts = data.get("data", {}).get("children", [])
-            for post in posts:
-                d = post.get("data", {})
-                post_id = d.get("id", "")
-                if post_id in seen_ids:
-                    continue
-                seen_ids.add(post_id)
-
-                title = d.get("title", "")
-                selftext = d.get("selftext", "")
-                content = f"{title}. {selftext}".strip()[:500]
-
-                if not content or len(content) < 20:
-                    continue
-
-                # Filter out posts that don't actually mention the brand
-                if not is_relevant_mention(content, brand):
-                    continue
-
-                likes = max(d.get("ups", 0), 0)
-                comments = d.get("num_comments", 0)
-                author = f"u/{d.get('author', 'anonymous')}"
-                permalink = f"https://reddit.com{d.get('permalink', '')}"
-
-                sentiment = analyze_sentiment(content)
-                priority = compute_priority_contextual(sentiment, likes, content)
-
-                mentions.append({
-                    "platform": "Reddit",
-                    "content": content,
-                    "sentiment_score": sentiment,
-                    "likes": likes,
-                    "shares": 0,
-                    "comments": comments,
-                    "author": author,
-                    "source_url": permalink,
-                    "priority": priority,
-                })
-
-        except Exception as e:
-            print(f"  ✗ Reddit scrape error for '{query}': {e}")
-
-        time.sleep(1)  # Rate-limit between query variants
-
-    return mentions
-
-
-def scrape_subreddit(subreddit: str, brand: str, limit: int = 5) -> list[dict]:
-    """Scrape a specific subreddit for brand mentions."""
-    mentions: list[dict] = []
-    seen_ids: set[str] = set()
-
-    for query in get_search_queries(brand):
-        url = f"https://www.reddit.com/r/{subreddit}/search.json"
-        params = {
-            "q": query,
-            "restrict_sr": "on",
-            "sort": "new",
-            "limit": limit,
-            "t": "week",
-        }
-
-        try:
-            resp = requests.get(url, headers=HEADERS, params=params, timeout=15)
-            resp.raise_for_status()
-            data = resp.json()
-
-            posts = data.get("data", {}).get("children", [])
-            for post in posts:
-                d = post.get("data", {})
-                post_id = d.get("id", "")
-                if post_id in seen_ids:
-                    continue
-                seen_ids.add(post_id)
-
-                title = d.get("title", "")
-                selftext = d.get("selftext", "")
-                content = f"{title}. {selftext}".strip()[:500]
-
-                if not content or len(content) < 20:
-                    continue
-
-                if not is_relevant_mention(content, brand):
-                    continue
-
-                likes = max(d.get("ups", 0), 0)
-                comments_count = d.get("num_comments", 0)
-                author = f"u/{d.get('author', 'anonymous')}"
-                permalink = f"https://reddit.com{d.get('permalink', '')}"
-
-                sentiment = analyze_sentiment(content)
-                priority = compute_priority_contextual(sentiment, likes, content)
-
-                mentions.append({
-                    "platform": "Reddit",
-                    "content": content,
-                    "sentiment_score": sentiment,
-                    "likes": likes,
-                    "shares": 0,
-                    "comments": comments_count,
-                    "author": author,
-                    "source_url": permalink,
-                    "priority": priority,
-                })
-
-        except Exception as e:
-            print(f"  ✗ Reddit r/{subreddit} error for '{query}': {e}")
-
-        time.sleep(1)
-
-    return mentions
+    Walk a comment tree depth-first with an explicit stack (threads can be
+    hundreds of levels deep). Returns the comments not seen before and the
+    ids behind "load more" stubs that still need fetching.
+    """
+    items: list[dict] = []
+    more: list[str] = []
+    stack = list(reversed(nodes))
+    while stack:
+        node = stack.pop()
+        d = node.get("data", {})
+        if node.get("kind") == "more":
+            # A stub whose comments we already have costs no request
+            more.extend(cid for cid in d.get("children", []) if cid not in cursor.seen)
+            continue
+        if node.get("kind") != "t1":
+            continue
+        replies = d.get("replies")
+        if isinstance(replies, dict):
+            stack.extend(reversed(replies.get("data", {}).get("children", [])))
+        cid = d.get("id", "")
+        if cid in cursor.seen:
+            continue
+        cursor.seen.add(cid)
+        item = _comment_item(d, relevant)
+        if item:
+            items.append(item)
+    return items, more
+
+
+async def expand_thread(
+    post: dict,
+    budget: _Budget,
+    sem: asyncio.Semaphore,
+    relevant: bool = False,
+    cycle: str | None = None,
+) -> list[dict]:
+    """
+    New comment mentions for one post, within the request budget. With
+    `relevant` the comments inherit the post's brand mention; with `cycle`
+    a post already expanded by another job of the same cycle is skipped.
+    """
+    post_id = post["key"]
+    cursor = _claim(post_id, cycle)
+    if cursor is None:
+        metrics.inc("leappulse_reddit_threads_shared_total")
+        return []
+    items: list[dict] = []
+
+    if cursor.num_comments != post["comments"]:
+        if not budget.take():
+            return []
+        async with sem:
+            metrics.inc("leappulse_reddit_comment_requests_total", kind="thread")
+            resp = await http.aget(
+                f"https://www.reddit.com/comments/{post_id}.json",
+                params={"limit": 500, "sort": "new", "raw_json": 1},
+                timeout=15,
+            )
+        listing = resp.json()
+        with metrics.timer("leappulse_parse_seconds", source="reddit_comments"):
+            items, cursor.more = _walk_comments(listing[1]["data"]["children"], cursor, relevant)
+        cursor.num_comments = post["comments"]
+    elif not cursor.more:
+        metrics.inc("leappulse_reddit_threads_unchanged_total")
+        return []
+
+    # Stubs left over when the budget ran out are resumed next cycle
+    while cursor.more and budget.take():
+        batch, cursor.more = cursor.more[:_MORE_BATCH], cursor.more[_MORE_BATCH:]
+        async with sem:
+            metrics.inc("leappulse_reddit_comment_requests_total", kind="more")
+            resp = await http.aget(
+                "https://www.reddit.com/api/morechildren.json",
+                params={
+                    "link_id": f"t3_{post_id}",
+                    "children": ",".join(batch),
+                    "api_type": "json",
+                    "raw_json": 1,
+                },
+                timeout=15,
+            )
+        things = resp.json().get("json", {}).get("data", {}).get("things", [])
+        found, deeper = _walk_comments(things, cursor, relevant)
+        items.extend(found)
+        cursor.more.extend(deeper)
+    return items
+
+
+@register
+class RedditSource(Source):
+    """Reddit global search plus targeted subreddit searches (public JSON API)."""
+
+    name = "reddit"
+    label = "Reddit"
+    interval_minutes = 5
+    min_interval_minutes = 2
+    max_interval_minutes = 30
+    delay = 2.0
+
+    def jobs(self, brand: str) -> list[dict]:
+        queries = get_search_queries(brand)
+        jobs = [{"query": q, "subreddit": None, "limit": 10} for q in queries]
+        for sub in SUBREDDITS:
+            jobs.extend({"query": q, "subreddit": sub, "limit": 5} for q in queries)
+        if REDDIT_EXPAND_COMMENTS:
+            # The budget and cycle travel in the jobs so they also hold in
+            # worker mode; jobs of one cycle share the budget (_cycle_budget)
+            cycle = uuid.uuid4().hex
+            for job in jobs:
+                job["comment_budget"] = REDDIT_COMMENT_BUDGET
+                job["comment_cycle"] = cycle
+        return jobs
+
+    async def fetch(self, brand: str, job: dict):
+        params = {"q": job["query"], "sort": "new", "limit": job["limit"], "t": "week"}
+        if job["subreddit"]:
+            url = f"https://www.reddit.com/r/{job['subreddit']}/search.json"
+            params["restrict_sr"] = "on"
+        else:
+            url = "https://www.reddit.com/search.json"
+
+        resp = await http.aget(url, params=params, timeout=15)
+        with metrics.timer("leappulse_parse_seconds", source=self.name):
+            items = _parse_listing(resp.json())
+        for item in items:
+            yield item
+
+        if job.get("comment_budget"):
+            expanded = await self._expand(brand, items, job["comment_budget"], job.get("comment_cycle"))
+            for comment in expanded:
+                yield comment
+
+    async def _expand(self, brand: str, posts: list[dict], requests: int, cycle: str | None = None) -> list[dict]:
+        relevant = {p["key"] for p in posts if is_relevant_mention(p["content"], brand)}
+        candidates = sorted(
+            (
+                p for p in posts
+                if p["comments"] > 0
+                and (p["comments"] >= REDDIT_COMMENT_MIN_COMMENTS or p["key"] in relevant)
+            ),
+            key=lambda p: p["comments"],
+            reverse=True,
+        )
+        # Each candidate takes its first request, in this order, before any
+        # task awaits: the busiest threads are served first, and their
+        # follow-up "load more" pages only after that
+        budget = _cycle_budget(cycle, requests)
+        sem = asyncio.Semaphore(max(1, REDDIT_COMMENT_CONCURRENCY))
+        results = await asyncio.gather(
+            *(expand_thread(p, budget, sem, p["key"] in relevant, cycle) for p in candidates),
+            return_exceptions=True,
+        )
+        comments: list[dict] = []
+        for post, result in zip(candidates, results):
+            if isinstance(result, BaseException):
+                print(f"  ⚠ Reddit comments for {post['key']}: {result}")
+            else:
+                comments.extend(result)
+        return comments
 
 
 def scrape_reddit_all(brand: str | None = None) -> list[dict]:
     """Run Reddit scraper for the brand across global search + subreddits."""
-    brand = brand or BRAND_NAME
-    all_mentions: list[dict] = []
+    from pipeline import run_source
 
-    print(f"  → Reddit global search: {brand}")
-    all_mentions.extend(scrape_reddit(brand, limit=10))
-    time.sleep(2)
-
-    for sub in SUBREDDITS:
-        print(f"  → Reddit r/{sub}: {brand}")
-        all_mentions.extend(scrape_subreddit(sub, brand, limit=5))
-        time.sleep(2)
-
-    return all_mentions
+    brand = brand or BRAND_NAME
+    print(f"  → Reddit (global + {len(SUBREDDITS)} subreddits): {brand}")
+    return run_source("reddit", brand)
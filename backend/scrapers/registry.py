@@ -0,0 +1,37 @@
+"""
+LeapPulse — Source registry
+Lists the enabled scraper modules and hands out Source instances.
+Adding a platform means writing a Source subclass decorated with
+@register and adding its module here.
+"""
+
+import importlib
+
+from scrapers.base import Source, registered
+
+# Import order is the order sources are reported in
+SOURCE_MODULES = [
+    "scrapers.reddit_scraper",
+    "scrapers.twitter_scraper",
+    "scrapers.linkedin_scraper",
+    "scrapers.google_news_scraper",
+    "scrapers.youtube_scraper",
+]
+
+
+def _load() -> None:
+    for module in SOURCE_MODULES:
+        importlib.import_module(module)
+
+
+def get_source(name: str) -> Source:
+    _load()
+    sources = registered()
+    if name not in sources:
+        raise KeyError(f"Unknown source '{name}' (known: {', '.join(sources)})")
+    return sources[name]()
+
+
+def all_sources() -> list[Source]:
+    _load()
+    return [cls() for cls in registered().values()]
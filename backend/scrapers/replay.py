@@ -0,0 +1,151 @@
+"""
+LeapPulse — HTTP record / replay
+Captures every response the scrapers fetch through scrapers/http.py, and
+serves them back later with no network access.
+
+Archive layout: gzip-compressed JSON lines. The first line is a header
+({"format": "leappulse-http", "version": 1, ...}); each following line is
+one exchange: URL with its query params, status, content type, body
+(base64), how long the upstream took and when it was asked, relative to
+the start of the recording.
+
+Replay serves exchanges for the same URL + params in recorded order
+(wrapping round once exhausted, so a load test can ask for more than was
+recorded) and sleeps the recorded latency divided by `speed`; speed=0
+answers immediately. A URL never recorded falls back to the same path and
+query on another host, since mirrors (Nitter instances) rotate between
+runs. A request with no recording at all raises requests.ConnectionError,
+like an unreachable host.
+"""
+
+import base64
+import gzip
+import json
+import threading
+import time
+from datetime import datetime
+from http import HTTPStatus
+from urllib.parse import urlencode, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+FORMAT = "leappulse-http"
+VERSION = 1
+
+
+def _key(url: str, params: dict | None) -> str:
+    if not params:
+        return url
+    return f"{url}?{urlencode(sorted((str(k), str(v)) for k, v in params.items()))}"
+
+
+def _hostless(key: str) -> str:
+    parts = urlsplit(key)
+    return f"{parts.path}?{parts.query}"
+
+
+class Recorder:
+    """Appends exchanges to a gzip JSONL archive. Use as a context manager."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._write({"format": FORMAT, "version": VERSION, "recorded_at": datetime.now().isoformat()})
+
+    def _write(self, row: dict) -> None:
+        self._file.write(json.dumps(row, separators=(",", ":")) + "\n")
+
+    def record(self, url: str, params: dict | None, resp: requests.Response, started: float, elapsed: float) -> None:
+        row = {
+            "key": _key(url, params),
+            "status": resp.status_code,
+            "content_type": resp.headers.get("Content-Type", ""),
+            "body": base64.b64encode(resp.content).decode("ascii"),
+            "elapsed": round(elapsed, 4),
+            "offset": round(started - self._start, 4),
+        }
+        with self._lock:
+            self._write(row)
+            self.count += 1
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self) -> "Recorder":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class Replayer:
+    def __init__(self, path: str, speed: float = 1.0):
+        self.path = path
+        self.speed = speed
+        self.served = 0
+        self.misses = 0
+        self._exchanges: dict[str, list[dict]] = {}
+        self._cursor: dict[str, int] = {}
+        self._lock = threading.Lock()
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("format") != FORMAT or header.get("version") != VERSION:
+                raise ValueError(f"{path} is not a {FORMAT} v{VERSION} archive")
+            self.recorded_at = header.get("recorded_at")
+            for line in f:
+                row = json.loads(line)
+                self._exchanges.setdefault(row["key"], []).append(row)
+        self._by_path: dict[str, str] = {}
+        for key in self._exchanges:
+            self._by_path.setdefault(_hostless(key), key)
+
+    def __len__(self) -> int:
+        return sum(len(rows) for rows in self._exchanges.values())
+
+    def get(self, url: str, params: dict | None = None) -> requests.Response:
+        key = _key(url, params)
+        if key not in self._exchanges:
+            key = self._by_path.get(_hostless(key), key)
+        with self._lock:
+            rows = self._exchanges.get(key)
+            if not rows:
+                self.misses += 1
+                row = None
+            else:
+                i = self._cursor.get(key, 0)
+                self._cursor[key] = i + 1
+                row = rows[i % len(rows)]
+                self.served += 1
+        if row is None:
+            raise requests.ConnectionError(f"No recording for {key}")
+        if self.speed > 0:
+            time.sleep(row["elapsed"] / self.speed)
+
+        resp = requests.Response()
+        resp.status_code = row["status"]
+        try:
+            resp.reason = HTTPStatus(row["status"]).phrase
+        except ValueError:
+            resp.reason = ""
+        resp._content = base64.b64decode(row["body"])
+        resp.headers = CaseInsensitiveDict({"Content-Type": row["content_type"]})
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp.url = key
+        return resp
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "recorded_at": self.recorded_at,
+            "exchanges": len(self),
+            "urls": len(self._exchanges),
+            "served": self.served,
+            "misses": self.misses,
+            "speed": self.speed,
+        }
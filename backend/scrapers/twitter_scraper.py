@@ -7,11 +7,12 @@ NOTE: Nitter instances change frequently. Update NITTER_INSTANCES
       with currently-working mirrors.
 """
 
-import time
-import requests
+import asyncio
 from bs4 import BeautifulSoup
-from config import HEADERS, BRAND_NAME, get_search_queries, is_relevant_mention
-from sentiment import analyze_sentiment, compute_priority_contextual
+import metrics
+from config import BRAND_NAME, get_search_queries
+from scrapers.base import Source, register
+from scrapers.nitter_pool import NitterPool
 
 # Public Nitter instances — update if any go down
 NITTER_INSTANCES = [
@@ -20,103 +21,101 @@ NITTER_INSTANCES = [
     "https://nitter.woodland.cafe",
 ]
 
+# Shared across cycles so health scores survive between scrapes
+_pool = NitterPool(NITTER_INSTANCES)
+
+
+def get_pool() -> NitterPool:
+    return _pool
 
-def _get_working_instance() -> str | None:
-    """Find a responsive Nitter instance."""
-    for instance in NITTER_INSTANCES:
-        try:
-            r = requests.get(instance, timeout=5, headers=HEADERS)
-            if r.status_code == 200:
-                return instance
-        except Exception:
-            continue
-    return None
 
+def _parse_timeline(html: str, instance: str, limit: int) -> list[dict]:
+    """Parse a Nitter search page into raw items."""
+    items: list[dict] = []
+    soup = BeautifulSoup(html, "lxml")
 
-def scrape_twitter(brand: str, limit: int = 10) -> list[dict]:
+    tweets = soup.select(".timeline-item")[:limit]
+
+    for tweet in tweets:
+        # Extract content
+        content_el = tweet.select_one(".tweet-content")
+        if not content_el:
+            continue
+        content = content_el.get_text(strip=True)[:500]
+        if len(content) < 15:
+            continue
+
+        # Extract author
+        author_el = tweet.select_one(".username")
+        author = author_el.get_text(strip=True) if author_el else "unknown"
+
+        # Extract engagement stats
+        stat_els = tweet.select(".tweet-stat .tweet-stat-count")
+        likes = 0
+        shares = 0
+        comments = 0
+        if len(stat_els) >= 1:
+            comments = _parse_count(stat_els[0].get_text(strip=True))
+        if len(stat_els) >= 2:
+            shares = _parse_count(stat_els[1].get_text(strip=True))
+        if len(stat_els) >= 3:
+            likes = _parse_count(stat_els[2].get_text(strip=True))
+
+        # Extract link
+        link_el = tweet.select_one(".tweet-link")
+        source_url = ""
+        if link_el and link_el.get("href"):
+            source_url = f"https://twitter.com{link_el['href'].replace(instance, '')}"
+
+        items.append({
+            "platform": "Twitter",
+            "key": source_url,
+            "content": content,
+            "likes": likes,
+            "shares": shares,
+            "comments": comments,
+            "author": author,
+            "source_url": source_url,
+        })
+
+    return items
+
+
+@register
+class TwitterSource(Source):
     """
-    Scrape Twitter/X mentions via Nitter search.
-    Uses multiple query variants and filters irrelevant results.
+    Nitter search. Query variants are spread round-robin over the
+    healthiest mirrors and run in parallel, one job per mirror at a time;
+    the pool fails over to another mirror if the preferred one dies.
     """
-    mentions: list[dict] = []
-    instance = _get_working_instance()
-
-    if not instance:
-        print("  ✗ No working Nitter instance found — skipping Twitter")
-        return mentions
-
-    seen_urls: set[str] = set()
-
-    for query in get_search_queries(brand):
-        search_url = f"{instance}/search"
-        params = {"f": "tweets", "q": query}
-
-        try:
-            resp = requests.get(search_url, headers=HEADERS, params=params, timeout=15)
-            resp.raise_for_status()
-            soup = BeautifulSoup(resp.text, "lxml")
-
-            tweets = soup.select(".timeline-item")[:limit]
-
-            for tweet in tweets:
-                # Extract content
-                content_el = tweet.select_one(".tweet-content")
-                if not content_el:
-                    continue
-                content = content_el.get_text(strip=True)[:500]
-                if len(content) < 15:
-                    continue
-
-                if not is_relevant_mention(content, brand):
-                    continue
-
-                # Extract author
-                author_el = tweet.select_one(".username")
-                author = author_el.get_text(strip=True) if author_el else "unknown"
-
-                # Extract engagement stats
-                stat_els = tweet.select(".tweet-stat .tweet-stat-count")
-                likes = 0
-                shares = 0
-                comments = 0
-                if len(stat_els) >= 1:
-                    comments = _parse_count(stat_els[0].get_text(strip=True))
-                if len(stat_els) >= 2:
-                    shares = _parse_count(stat_els[1].get_text(strip=True))
-                if len(stat_els) >= 3:
-                    likes = _parse_count(stat_els[2].get_text(strip=True))
-
-                # Extract link
-                link_el = tweet.select_one(".tweet-link")
-                source_url = ""
-                if link_el and link_el.get("href"):
-                    source_url = f"https://twitter.com{link_el['href'].replace(instance, '')}"
-
-                if source_url in seen_urls:
-                    continue
-                seen_urls.add(source_url)
-
-                sentiment = analyze_sentiment(content)
-                priority = compute_priority_contextual(sentiment, likes, content)
-
-                mentions.append({
-                    "platform": "Twitter",
-                    "content": content,
-                    "sentiment_score": sentiment,
-                    "likes": likes,
-                    "shares": shares,
-                    "comments": comments,
-                    "author": author,
-                    "source_url": source_url,
-                    "priority": priority,
-                })
-
-        except Exception as e:
-            print(f"  ✗ Twitter scrape error for '{query}': {e}")
-
-        time.sleep(1)
-
-    return mentions
+
+    name = "twitter"
+    label = "Twitter"
+    interval_minutes = 5
+    min_interval_minutes = 2
+    max_interval_minutes = 30
+    limit = 10
+
+    def jobs(self, brand: str) -> list[dict]:
+        instances = _pool.ranked()
+        if not instances:
+            print("  ✗ No working Nitter instance found — skipping Twitter")
+            return []
+        self.concurrency = len(instances)
+        return [
+            {"query": q, "instance": instances[i % len(instances)]}
+            for i, q in enumerate(get_search_queries(brand))
+        ]
+
+    async def fetch(self, brand: str, job: dict):
+        params = {"f": "tweets", "q": job["query"]}
+        used, resp = await asyncio.to_thread(
+            _pool.get, "/search", params, job["instance"], 15
+        )
+        with metrics.timer("leappulse_parse_seconds", source=self.name):
+            items = _parse_timeline(resp.text, used, self.limit)
+        for item in items:
+            yield item
 
 
 def _parse_count(text: str) -> int:
@@ -136,7 +135,9 @@ def _parse_count(text: str) -> int:
 
 def scrape_twitter_brand(brand: str | None = None) -> list[dict]:
     """Run Twitter scraper for a single brand."""
+    from pipeline import run_source
+
     brand = brand or BRAND_NAME
     print(f"  → Twitter/Nitter: {brand}")
-    return scrape_twitter(brand, limit=10)
+    return run_source("twitter", brand)
 
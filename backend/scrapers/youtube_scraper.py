@@ -4,110 +4,98 @@ Scrapes YouTube search results for brand mention videos.
 Uses YouTube's public search page (no API key required).
 """
 
-import time
 import re
 import json
-import requests
-from bs4 import BeautifulSoup
-from config import HEADERS, BRAND_NAME, get_search_queries, is_relevant_mention
-from sentiment import analyze_sentiment, compute_priority_contextual
+import metrics
+from config import BRAND_NAME, is_relevant_mention
+from language import normalize_brand
+from scrapers import http
+from scrapers.base import Source, register
 
 
-def scrape_youtube(brand: str, limit: int = 8) -> list[dict]:
+def _parse_results(html: str, limit: int, brand: str | None = None) -> list[dict]:
     """
-    Scrape YouTube search for videos mentioning the brand.
-    Uses search query variants and filters irrelevant results.
+    Extract video raw items from the ytInitialData blob in a results page.
+    With `brand`, videos that don't mention it are skipped before `limit`
+    is counted, so off-topic results don't crowd out relevant ones.
     """
-    mentions: list[dict] = []
-    seen_ids: set[str] = set()
-
-    for query in get_search_queries(brand):
-        url = f"https://www.youtube.com/results"
-        params = {"search_query": f"{query} review experience", "sp": "CAI%253D"}
+    # YouTube embeds JSON data in the HTML
+    match = re.search(r"var ytInitialData = ({.*?});", html)
+    if not match:
+        raise ValueError("Could not find initial data")
+
+    data = json.loads(match.group(1))
+
+    # Navigate JSON to find video renderers
+    contents = (
+        data.get("contents", {})
+        .get("twoColumnSearchResultsRenderer", {})
+        .get("primaryContents", {})
+        .get("sectionListRenderer", {})
+        .get("contents", [])
+    )
+
+    items: list[dict] = []
+    for section in contents:
+        for item in section.get("itemSectionRenderer", {}).get("contents", []):
+            renderer = item.get("videoRenderer")
+            if not renderer:
+                continue
+            if len(items) >= limit:
+                return items
 
-        try:
-            resp = requests.get(url, headers=HEADERS, params=params, timeout=15)
-            resp.raise_for_status()
+            title = ""
+            title_runs = renderer.get("title", {}).get("runs", [])
+            if title_runs:
+                title = title_runs[0].get("text", "")
 
-            # YouTube embeds JSON data in the HTML
-            match = re.search(r"var ytInitialData = ({.*?});", resp.text)
-            if not match:
-                print(f"  ✗ YouTube: Could not find initial data for '{query}'")
+            content = title[:500]
+            if len(content) < 10:
+                continue
+            if brand and not is_relevant_mention(normalize_brand(content, brand), brand):
                 continue
 
-            data = json.loads(match.group(1))
-
-            # Navigate JSON to find video renderers
-            contents = (
-                data.get("contents", {})
-                .get("twoColumnSearchResultsRenderer", {})
-                .get("primaryContents", {})
-                .get("sectionListRenderer", {})
-                .get("contents", [])
+            video_id = renderer.get("videoId", "")
+            channel = (
+                renderer.get("ownerText", {})
+                .get("runs", [{}])[0]
+                .get("text", "YouTuber")
             )
 
-            videos_found = 0
-            for section in contents:
-                items = (
-                    section.get("itemSectionRenderer", {}).get("contents", [])
-                )
-                for item in items:
-                    renderer = item.get("videoRenderer")
-                    if not renderer:
-                        continue
-                    if videos_found >= limit:
-                        break
-
-                    title = ""
-                    title_runs = renderer.get("title", {}).get("runs", [])
-                    if title_runs:
-                        title = title_runs[0].get("text", "")
-
-                    video_id = renderer.get("videoId", "")
-                    if video_id in seen_ids:
-                        continue
-
-                    channel = (
-                        renderer.get("ownerText", {})
-                        .get("runs", [{}])[0]
-                        .get("text", "YouTuber")
-                    )
-
-                    # View count
-                    view_text = renderer.get("viewCountText", {}).get("simpleText", "0 views")
-                    likes = _parse_views(view_text)
-
-                    content = title[:500]
-                    if len(content) < 10:
-                        continue
-
-                    if not is_relevant_mention(content, brand):
-                        continue
-
-                    seen_ids.add(video_id)
-
-                    sentiment = analyze_sentiment(content)
-                    priority = compute_priority_contextual(sentiment, likes, content)
-
-                    mentions.append({
-                        "platform": "YouTube",
-                        "content": content,
-                        "sentiment_score": sentiment,
-                        "likes": likes,
-                        "shares": 0,
-                        "comments": 0,
-                        "author": channel,
-                        "source_url": f"https://youtube.com/watch?v={video_id}",
-                        "priority": priority,
-                    })
-                    videos_found += 1
-
-        except Exception as e:
-            print(f"  ✗ YouTube scrape error for '{query}': {e}")
-
-        time.sleep(1)
-
-    return mentions
+            # View count
+            view_text = renderer.get("viewCountText", {}).get("simpleText", "0 views")
+
+            items.append({
+                "platform": "YouTube",
+                "key": video_id,
+                "content": content,
+                "likes": _parse_views(view_text),
+                "shares": 0,
+                "comments": 0,
+                "author": channel,
+                "source_url": f"https://youtube.com/watch?v={video_id}",
+            })
+    return items
+
+
+@register
+class YouTubeSource(Source):
+    """YouTube public search page, newest uploads first."""
+
+    name = "youtube"
+    label = "YouTube"
+    interval_minutes = 30
+    min_interval_minutes = 10
+    max_interval_minutes = 120
+    limit = 8
+
+    async def fetch(self, brand: str, job: dict):
+        params = {"search_query": f"{job['query']} review experience", "sp": "CAI%253D"}
+        resp = await http.aget("https://www.youtube.com/results", params=params, timeout=15)
+        with metrics.timer("leappulse_parse_seconds", source=self.name):
+            items = _parse_results(resp.text, self.limit, brand)
+        for item in items:
+            yield item
 
 
 def _parse_views(text: str) -> int:
@@ -127,6 +115,8 @@ def _parse_views(text: str) -> int:
 
 def scrape_youtube_brand(brand: str | None = None) -> list[dict]:
     """Run YouTube scraper for a single brand."""
+    from pipeline import run_source
+
     brand = brand or BRAND_NAME
     print(f"  → YouTube: {brand}")
-    return scrape_youtube(brand, limit=8)
+    return run_source("youtube", brand)
@@ -0,0 +1,173 @@
+"""
+LeapPulse — Full-text search
+SQLite FTS5 inverted index over every published mention, updated
+incrementally as cycles are published.
+
+Query syntax (implicit AND between parts):
+  visa delay            both words, any order
+  "visa delay"          exact phrase
+  counsel*              prefix match
+Results are ranked by BM25 with a boost for engagement, and can be
+filtered by platform and priority.
+"""
+
+import hashlib
+import json
+import math
+import re
+import sqlite3
+import threading
+import time
+
+from config import SEARCH_DB_PATH
+
+# How much log(1 + engagement) counts against BM25 (whose scores are
+# negative; more negative = better match)
+ENGAGEMENT_WEIGHT = 0.15
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_docs (
+  rowid        INTEGER PRIMARY KEY,
+  doc_key      TEXT NOT NULL UNIQUE,
+  platform     TEXT NOT NULL,
+  priority     TEXT NOT NULL,
+  boost        REAL NOT NULL DEFAULT 0,
+  scraped_at   TEXT,
+  payload      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_search_platform ON search_docs (platform);
+CREATE INDEX IF NOT EXISTS idx_search_priority ON search_docs (priority);
+CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(
+  content, author,
+  tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+_TOKEN_RE = re.compile(r'"([^"]+)"|(\S+)')
+
+
+def to_fts_query(q: str) -> str:
+    """
+    Translate user input into a safe FTS5 expression: quoted phrases stay
+    phrases, bare words are quoted (so operators / punctuation can't break
+    the parser), a trailing * keeps prefix matching.
+    """
+    parts = []
+    for phrase, word in _TOKEN_RE.findall(q):
+        text = (phrase or word).replace('"', "")
+        prefix = bool(word) and text.endswith("*")
+        text = text.rstrip("*").strip()
+        if not text:
+            continue
+        parts.append(f'"{text}"' + ("*" if prefix else ""))
+    return " ".join(parts)
+
+
+def _doc_key(m: dict) -> str:
+    """Stable identity across cycles — the same post re-scraped is one doc."""
+    if m.get("source_url"):
+        return f"{m.get('platform')}|{m['source_url']}"
+    return hashlib.sha1(f"{m.get('platform')}|{m.get('content', '')}".encode()).hexdigest()
+
+
+class SearchIndex:
+    def __init__(self, path: str = SEARCH_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def add(self, mentions: list[dict]) -> int:
+        """Index mentions not already present. Returns how many were added."""
+        added = 0
+        conn = self._conn()
+        with self._write_lock, conn:
+            for m in mentions:
+                engagement = m.get("likes", 0) + m.get("shares", 0) + m.get("comments", 0)
+                cur = conn.execute(
+                    "INSERT OR IGNORE INTO search_docs "
+                    "(doc_key, platform, priority, boost, scraped_at, payload) VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        _doc_key(m),
+                        m.get("platform", "Unknown"),
+                        m.get("priority", "NEUTRAL"),
+                        ENGAGEMENT_WEIGHT * math.log1p(max(0, engagement)),
+                        m.get("scraped_at") or m.get("created_at"),
+                        json.dumps(m, default=str),
+                    ),
+                )
+                if cur.rowcount != 1:
+                    continue
+                conn.execute(
+                    "INSERT INTO search_fts (rowid, content, author) VALUES (?, ?, ?)",
+                    (cur.lastrowid, m.get("content", ""), m.get("author", "")),
+                )
+                added += 1
+        return added
+
+    def search(
+        self,
+        q: str,
+        platform: str | None = None,
+        priority: str | None = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> dict:
+        fts_query = to_fts_query(q)
+        if not fts_query:
+            return {"query": q, "results": [], "took_ms": 0.0}
+
+        clauses, args = ["search_fts MATCH ?"], [fts_query]
+        if platform:
+            clauses.append("d.platform = ?")
+            args.append(platform)
+        if priority:
+            clauses.append("d.priority = ?")
+            args.append(priority)
+
+        start = time.perf_counter()
+        rows = self._conn().execute(
+            f"""SELECT d.payload,
+                       bm25(search_fts) - d.boost AS score,
+                       snippet(search_fts, 0, '<mark>', '</mark>', '…', 16) AS snippet
+                FROM search_fts
+                JOIN search_docs d ON d.rowid = search_fts.rowid
+                WHERE {' AND '.join(clauses)}
+                ORDER BY score
+                LIMIT ? OFFSET ?""",
+            [*args, limit, offset],
+        ).fetchall()
+        took = (time.perf_counter() - start) * 1000
+
+        results = []
+        for r in rows:
+            doc = json.loads(r["payload"])
+            doc["score"] = round(-r["score"], 4)
+            doc["snippet"] = r["snippet"]
+            results.append(doc)
+        return {"query": q, "results": results, "took_ms": round(took, 2)}
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM search_docs").fetchone()[0]
+
+
+_index: SearchIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> SearchIndex:
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SearchIndex()
+    return _index
@@ -2,10 +2,26 @@
 LeapPulse — Sentiment Analysis & Priority Classification
 Uses TextBlob for quick polarity scoring.
 Falls back to keyword heuristics when TextBlob returns neutral.
+With SENTIMENT_BACKEND=onnx a transformer model scores instead, and
+TextBlob stays as the fallback if it can't load or errors.
+In front of either, a compiled keyword lexicon settles clear-cut items
+and escalates only ambiguous or high-reach ones (the cascade).
 Priority is determined by sentiment + engagement + contextual signals.
 """
 
-from textblob import TextBlob
+import re
+import threading
+
+import metrics
+from config import (
+    CASCADE_ESCALATE_CRISIS,
+    CASCADE_ESCALATE_REACH,
+    CASCADE_MIN_MARGIN,
+    REACH_VIRAL_PERCENTILE,
+    SENTIMENT_BACKEND,
+    SENTIMENT_CASCADE,
+    SENTIMENT_MAX_BATCH,
+)
 
 # Weighted keywords for domain-specific sentiment
 _NEGATIVE_KEYWORDS = [
@@ -19,6 +35,15 @@ _POSITIVE_KEYWORDS = [
     "fantastic", "great", "perfect", "wonderful",
 ]
 
+# Words the full scorer reads as strongly positive (TextBlob polarity >= 0.5,
+# or superlatives outside the keyword list): enough on their own to reach
+# MARKETING GOLD, so the cascade never settles an item carrying one
+_STRONG_POSITIVE_CUES = [
+    "amazing", "excellent", "best", "love", "outstanding", "incredible",
+    "great", "perfect", "wonderful", "superb", "brilliant", "awesome",
+    "exceptional", "flawless",
+]
+
 # Keywords that signal marketing opportunities (testimonials, success stories)
 _GOLD_KEYWORDS = [
     "acceptance letter", "got admitted", "got accepted", "offered admission",
@@ -33,22 +58,50 @@ _CRISIS_KEYWORDS = [
     "scam", "fraud", "lawsuit", "police", "legal action", "consumer court",
     "viral", "trending", "boycott", "expose", "warning", "do not use",
     "stolen", "data breach", "leaked",
+    # Hindi "fraud" / "swindle", both scripts (language.py scores the rest)
+    "dhokha", "dhoka", "thagi", "धोखा", "ठगी",
+]
+
+
+# Negation and sarcasm cues that make raw keyword counts untrustworthy
+_HEDGE_CUES = [
+    "not ", "never", "n't", "no ", "nahi", "nhi", "oh great", "yeah sure",
+    "just perfect", "totally", "so fun", "wow", "thanks for", "really appreciate",
 ]
 
 
+def _compile(keywords: list[str]) -> re.Pattern:
+    # Longest first, so a multi-word keyword wins over any shorter overlap
+    return re.compile("|".join(re.escape(kw) for kw in sorted(keywords, key=len, reverse=True)))
+
+
+_NEGATIVE_RE = _compile(_NEGATIVE_KEYWORDS)
+_POSITIVE_RE = _compile(_POSITIVE_KEYWORDS)
+_CRISIS_RE = _compile(_CRISIS_KEYWORDS)
+_GOLD_RE = _compile(_GOLD_KEYWORDS)
+_STRONG_POSITIVE_RE = _compile(_STRONG_POSITIVE_CUES)
+_HEDGE_RE = _compile(_HEDGE_CUES)
+
+
+def keyword_hits(lower: str) -> tuple[int, int]:
+    """Distinct (positive, negative) keywords present in lowercased text."""
+    return len(set(_POSITIVE_RE.findall(lower))), len(set(_NEGATIVE_RE.findall(lower)))
+
+
 def _keyword_boost(text: str) -> float:
     """Return a small sentiment nudge based on domain keywords."""
-    lower = text.lower()
-    neg = sum(1 for kw in _NEGATIVE_KEYWORDS if kw in lower)
-    pos = sum(1 for kw in _POSITIVE_KEYWORDS if kw in lower)
+    pos, neg = keyword_hits(text.lower())
     return (pos - neg) * 0.15
 
 
-def analyze_sentiment(text: str) -> float:
+def textblob_sentiment(text: str) -> float:
     """
     Returns a sentiment score in the range [-1.0, 1.0].
     Combines TextBlob polarity with domain keyword boosting.
     """
+    # Deferred: textblob + NLTK add ~150 ms to every process start
+    from textblob import TextBlob
+
     blob = TextBlob(text)
     base = blob.sentiment.polarity  # -1.0 to 1.0
     boost = _keyword_boost(text)
@@ -56,6 +109,123 @@ def analyze_sentiment(text: str) -> float:
     return round(score, 3)
 
 
+# ── Cascade: lexicon first tier ──
+
+# Lexicon-settled scores stay inside the band compute_priority_contextual
+# leaves NEUTRAL (|score| < 0.2), yet past the sentiment distribution's
+# ±0.15 so they still count as positive / negative. So the lexicon only
+# settles what the full scorer would also leave NEUTRAL: any negative
+# keyword (a complaint can be HIGH PRIORITY) and any strong positive word
+# (MARKETING GOLD) is escalated. What is left is mild praise.
+_SETTLED_BASE = 0.16
+_SETTLED_CAP = 0.19
+
+
+def settled_score(margin: int) -> float:
+    """Score for a keyword margin, capped below every priority threshold."""
+    score = min(_SETTLED_CAP, _SETTLED_BASE + 0.01 * (abs(margin) - 1))
+    return round(score if margin > 0 else -score, 3)
+
+
+def lexicon_sentiment(text: str, reach: int = 0) -> float | None:
+    """
+    Settle a clear-cut item from keyword hits alone. Returns a score, or
+    None when the item is ambiguous or risky enough to need the full scorer.
+    """
+    lower = text.lower()
+    if not SENTIMENT_CASCADE:
+        reason = "disabled"
+    elif reach >= CASCADE_ESCALATE_REACH:
+        reason = "reach"
+    elif CASCADE_ESCALATE_CRISIS and _CRISIS_RE.search(lower):
+        reason = "crisis"
+    else:
+        pos, neg = keyword_hits(lower)
+        margin = pos - neg
+        if not pos and not neg:
+            reason = "no_signal"
+        elif neg:
+            reason = "negative"
+        elif margin < CASCADE_MIN_MARGIN:
+            reason = "mixed"
+        elif _HEDGE_RE.search(lower):
+            reason = "hedged"
+        elif margin > CASCADE_MIN_MARGIN or _GOLD_RE.search(lower) or _STRONG_POSITIVE_RE.search(lower):
+            reason = "strong"
+        else:
+            metrics.inc("leappulse_sentiment_route_total", route="lexicon", reason="settled")
+            return settled_score(margin)
+    metrics.inc("leappulse_sentiment_route_total", route="escalated", reason=reason)
+    return None
+
+
+def escalation_fraction() -> float | None:
+    """Share of items the cascade has sent to the full scorer so far."""
+    escalated = metrics.counter("leappulse_sentiment_route_total", route="escalated")
+    total = escalated + metrics.counter("leappulse_sentiment_route_total", route="lexicon")
+    return round(escalated / total, 3) if total else None
+
+
+# ── Scorer selection ──
+
+_scorer = None
+_scorer_loaded = False
+_scorer_lock = threading.Lock()
+
+
+def _transformer():
+    """The ONNX batching scorer, loaded once; None when disabled or unavailable."""
+    global _scorer, _scorer_loaded
+    if SENTIMENT_BACKEND != "onnx":
+        return None
+    with _scorer_lock:
+        if not _scorer_loaded:
+            from sentiment_onnx import load_scorer
+
+            _scorer = load_scorer()
+            _scorer_loaded = True
+    return _scorer
+
+
+def warm_up() -> None:
+    """Load TextBlob (and the transformer, if enabled) ahead of the first scrape."""
+    textblob_sentiment("LeapScholar warm-up")
+    _transformer()
+
+
+def sentiment_batch_size() -> int:
+    """How many items callers should group per `analyze_sentiment_batch` call."""
+    return SENTIMENT_MAX_BATCH if _transformer() is not None else 1
+
+
+def analyze_sentiment(text: str) -> float:
+    """Sentiment in [-1.0, 1.0] from the configured backend."""
+    scorer = _transformer()
+    if scorer is not None:
+        try:
+            return scorer.submit(text).result()
+        except Exception:
+            pass
+    return textblob_sentiment(text)
+
+
+def cascade_sentiment(text: str, reach: int = 0) -> float:
+    """Lexicon tier first, full scorer only if it escalates."""
+    settled = lexicon_sentiment(text, reach)
+    return settled if settled is not None else analyze_sentiment(text)
+
+
+def analyze_sentiment_batch(texts: list[str]) -> list[float]:
+    """Score many texts at once — batched through the transformer when enabled."""
+    scorer = _transformer()
+    if scorer is not None:
+        try:
+            return scorer.score_many(texts)
+        except Exception as exc:
+            print(f"  ⚠ ONNX sentiment failed ({exc}) — falling back to TextBlob")
+    return [textblob_sentiment(t) for t in texts]
+
+
 def compute_priority(sentiment: float, likes: int) -> str:
     """
     Context-aware priority classification:
@@ -70,19 +240,24 @@ def compute_priority(sentiment: float, likes: int) -> str:
     return "NEUTRAL"  # Placeholder — real logic below
 
 
-def compute_priority_contextual(sentiment: float, likes: int, content: str) -> str:
+def compute_priority_contextual(
+    sentiment: float, likes: int, content: str, reach_pct: float | None = None
+) -> str:
     """
     Full contextual priority classification using sentiment + engagement + keywords.
+    `reach_pct` is the mention's engagement percentile within its platform
+    (see reach.py); without one, raw likes decide what counts as viral.
     """
     lower = content.lower()
+    viral = reach_pct >= REACH_VIRAL_PERCENTILE if reach_pct is not None else likes > 50
 
-    has_crisis = any(kw in lower for kw in _CRISIS_KEYWORDS)
-    has_gold = any(kw in lower for kw in _GOLD_KEYWORDS)
+    has_crisis = _CRISIS_RE.search(lower) is not None
+    has_gold = _GOLD_RE.search(lower) is not None
 
     # CRITICAL: crisis keywords + negative, or very negative + viral
     if has_crisis and sentiment < -0.2:
         return "CRITICAL ALERT"
-    if sentiment < -0.5 and likes > 50:
+    if sentiment < -0.5 and viral:
         return "CRITICAL ALERT"
 
     # MARKETING GOLD: gold keywords + positive, or very positive
@@ -0,0 +1,175 @@
+"""
+LeapPulse — Transformer sentiment (optional)
+Runs a small ONNX sequence-classification model (e.g. a quantized
+multilingual Twitter RoBERTa) on CPU for `SENTIMENT_BACKEND=onnx`.
+
+Needs `onnxruntime` and `tokenizers`, plus a model directory holding
+  model.onnx        exported classifier (int8-quantized recommended)
+  tokenizer.json    Hugging Face fast-tokenizer file
+  config.json       for id2label / pad_token_id
+
+Throughput comes from:
+  - dynamic batching: concurrent callers are merged into one forward
+    pass of up to `max_batch` items, waiting at most `max_wait_ms`
+  - length buckets: items are grouped by token length and padded only to
+    their bucket (16 / 32 / 64 / 128), not to the longest item overall
+  - a bounded request queue, so producers block instead of piling up
+"""
+
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+from config import (
+    SENTIMENT_MAX_BATCH,
+    SENTIMENT_MAX_WAIT_MS,
+    SENTIMENT_MODEL_DIR,
+    SENTIMENT_QUEUE_SIZE,
+    SENTIMENT_THREADS,
+)
+
+LENGTH_BUCKETS = (16, 32, 64, 128)
+
+
+def _label_values(config: dict, n_labels: int) -> list[float]:
+    """Map each output class onto -1 / 0 / +1 from its label name."""
+    id2label = {int(k): v.lower() for k, v in config.get("id2label", {}).items()}
+    values = []
+    for i in range(n_labels):
+        label = id2label.get(i, "")
+        if "neg" in label:
+            values.append(-1.0)
+        elif "pos" in label:
+            values.append(1.0)
+        elif "neu" in label:
+            values.append(0.0)
+        elif n_labels == 3:
+            values.append((-1.0, 0.0, 1.0)[i])
+        else:
+            values.append(-1.0 if i == 0 else 1.0)
+    return values
+
+
+class OnnxSentimentModel:
+    """A loaded model + tokenizer. `predict` scores a list of texts in [-1, 1]."""
+
+    def __init__(self, model_dir: str = SENTIMENT_MODEL_DIR, threads: int = SENTIMENT_THREADS):
+        import numpy as np
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        root = Path(model_dir)
+        self._np = np
+        opts = ort.SessionOptions()
+        opts.intra_op_num_threads = threads
+        opts.inter_op_num_threads = 1
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            str(root / "model.onnx"), sess_options=opts, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+        config_path = root / "config.json"
+        config = json.loads(config_path.read_text()) if config_path.exists() else {}
+        self.tokenizer = Tokenizer.from_file(str(root / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=LENGTH_BUCKETS[-1])
+        self.tokenizer.no_padding()
+        self.pad_id = config.get("pad_token_id", 0) or 0
+
+        n_labels = self.session.get_outputs()[0].shape[-1]
+        if not isinstance(n_labels, int):
+            n_labels = len(config.get("id2label", {})) or 3
+        self.label_values = np.array(_label_values(config, n_labels), dtype=np.float32)
+
+    def predict(self, texts: list[str], max_batch: int = SENTIMENT_MAX_BATCH) -> list[float]:
+        np = self._np
+        encodings = self.tokenizer.encode_batch(texts)
+        scores = [0.0] * len(texts)
+
+        # Group by padded length so short tweets aren't padded to 128
+        buckets: dict[int, list[int]] = {}
+        for i, enc in enumerate(encodings):
+            size = next(b for b in LENGTH_BUCKETS if len(enc.ids) <= b)
+            buckets.setdefault(size, []).append(i)
+
+        for size, indices in buckets.items():
+            for start in range(0, len(indices), max_batch):
+                chunk = indices[start:start + max_batch]
+                ids = np.full((len(chunk), size), self.pad_id, dtype=np.int64)
+                mask = np.zeros((len(chunk), size), dtype=np.int64)
+                for row, i in enumerate(chunk):
+                    n = len(encodings[i].ids)
+                    ids[row, :n] = encodings[i].ids
+                    mask[row, :n] = 1
+                feed = {"input_ids": ids, "attention_mask": mask}
+                if "token_type_ids" in self.input_names:
+                    feed["token_type_ids"] = np.zeros_like(ids)
+                logits = self.session.run(None, feed)[0]
+                exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+                probs = exp / exp.sum(axis=1, keepdims=True)
+                for row, value in zip(chunk, probs @ self.label_values):
+                    scores[row] = round(float(value), 3)
+        return scores
+
+
+class BatchingScorer:
+    """
+    Merges concurrent `submit` calls into batched `model.predict` calls on
+    one worker thread. `submit` blocks while the request queue is full.
+    """
+
+    def __init__(
+        self,
+        model: OnnxSentimentModel,
+        max_batch: int = SENTIMENT_MAX_BATCH,
+        max_wait_ms: float = SENTIMENT_MAX_WAIT_MS,
+        queue_size: int = SENTIMENT_QUEUE_SIZE,
+    ):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._worker = threading.Thread(target=self._loop, name="sentiment-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, text: str) -> Future:
+        fut: Future = Future()
+        self._queue.put((text, fut))
+        return fut
+
+    def score_many(self, texts: list[str]) -> list[float]:
+        futures = [self.submit(t) for t in texts]
+        return [f.result() for f in futures]
+
+    def _loop(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                scores = self.model.predict([text for text, _ in batch], self.max_batch)
+            except Exception as exc:
+                for _, fut in batch:
+                    fut.set_exception(exc)
+                continue
+            for (_, fut), value in zip(batch, scores):
+                fut.set_result(value)
+
+
+def load_scorer() -> BatchingScorer | None:
+    """Build the batching scorer, or None (with a warning) if it can't load."""
+    try:
+        return BatchingScorer(OnnxSentimentModel())
+    except ImportError as exc:
+        print(f"  ⚠ ONNX sentiment unavailable ({exc.name} not installed) — using TextBlob")
+    except Exception as exc:
+        print(f"  ⚠ Could not load ONNX sentiment model from {SENTIMENT_MODEL_DIR}: {exc} — using TextBlob")
+    return None
@@ -7,21 +7,52 @@ Usage:
   uvicorn server:app --reload --port 8000
 """
 
+import startup  # first, so its clock covers every import below
+
+import asyncio
+import hmac
+import json
 import logging
 import os
 import time
 import threading
 from contextlib import asynccontextmanager
 from datetime import datetime
-from fastapi import FastAPI
+from typing import Literal
+from fastapi import FastAPI, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
-
-from config import BRAND_NAME
-from scrapers.reddit_scraper import scrape_reddit_all
-from scrapers.twitter_scraper import scrape_twitter_brand
-from scrapers.linkedin_scraper import scrape_linkedin_brand
-from scrapers.google_news_scraper import scrape_news_brand
-from scrapers.youtube_scraper import scrape_youtube_brand
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
+
+import alerts
+import metrics
+import profiling
+import reach
+import retention
+import sentiment
+import trends
+from config import ADMIN_TOKEN, BRAND_NAME, SCRAPE_MODE, STARTUP_BUDGET_MS, STORAGE_BACKEND
+from db import (
+    upsert_mentions,
+    upsert_platform_breakdown,
+    upsert_sentiment_distribution,
+    upsert_trending_topics,
+    upsert_dashboard_metrics,
+    upsert_weekly_trend,
+)
+from scrapers.breaker import merge as merge_breakers, snapshot as breaker_status
+from search import get_index
+from snapshot import (
+    SNAPSHOT_KEYS,
+    LeaderLock,
+    SnapshotStore,
+    build_snapshot,
+    mark_source,
+    restore_freshness,
+)
+from keys import mention_key
+from history import previous_week_net_sentiment, sentiment_series, volume_series, week_over_week
+from storage import get_storage
+from pipeline import run_all
 from aggregator import (
     compute_sentiment_distribution,
     compute_platform_breakdown,
@@ -30,6 +61,8 @@ from aggregator import (
     compute_weekly_trend,
 )
 
+startup.mark("imports")
+
 # ── Logging ──
 logging.basicConfig(
     level=logging.INFO,
@@ -46,6 +79,7 @@ _cache: dict = {
     "trending_topics": [],
     "dashboard_metrics": {},
     "weekly_trend": [],
+    "source_freshness": {},
     "last_scraped": None,
     "is_scraping": False,
     "brand": BRAND_NAME,
@@ -55,6 +89,43 @@ _lock = threading.Lock()
 # Cache TTL: 10 minutes (configurable via env)
 CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL", "600"))
 
+# Stored mentions loaded into the cache on startup (sqlite backend)
+HISTORY_WARM_LIMIT = int(os.getenv("HISTORY_WARM_LIMIT", "500"))
+
+# ── Multi-worker coordination ──
+# One process (the leader) scrapes and publishes a snapshot file; every
+# worker serves whatever snapshot was published last. With
+# SCRAPE_MODE=workers no API process scrapes: worker.py publishes instead.
+_CAN_LEAD = SCRAPE_MODE != "workers"
+_leader = LeaderLock()
+_snapshots = SnapshotStore()
+LEADER_POLL_SECONDS = float(os.getenv("LEADER_POLL_SECONDS", "5"))
+
+def _apply_snapshot(payload: dict) -> None:
+    with _lock:
+        for k in SNAPSHOT_KEYS:
+            _cache[k] = payload[k]
+        _cache["last_scraped"] = (
+            datetime.fromisoformat(payload["last_scraped"]) if payload["last_scraped"] else None
+        )
+
+
+def _publish_snapshot() -> None:
+    with _lock:
+        payload = {k: _cache[k] for k in SNAPSHOT_KEYS}
+        payload["last_scraped"] = _cache["last_scraped"].isoformat() if _cache["last_scraped"] else None
+    try:
+        _snapshots.publish(payload)
+    except OSError as exc:
+        log.warning("Could not publish snapshot: %s", exc)
+
+
+def _sync_snapshot() -> None:
+    """Followers: pick up the leader's latest snapshot if it changed."""
+    payload = _snapshots.load_if_changed()
+    if payload is not None:
+        _apply_snapshot(payload)
+
 
 def _needs_refresh() -> bool:
     if _cache["last_scraped"] is None:
@@ -64,69 +135,131 @@ def _needs_refresh() -> bool:
 
 
 def _run_scrape():
-    """Execute scrapers and update the cache."""
+    """
+    Execute scrapers and update the cache. Each source is published as
+    soon as it finishes, so a slow or stuck source doesn't hold back the
+    others; CYCLE_DEADLINE_SECONDS cuts off the stragglers.
+    """
     with _lock:
         if _cache["is_scraping"]:
             return
         _cache["is_scraping"] = True
 
+    all_mentions: list[dict] = []
+    snap: dict | None = None
+
+    def publish_source(source, mentions: list[dict], status: str) -> None:
+        nonlocal snap
+        mark_source(source.name, source.label, status, len(mentions))
+        log.info("  %-12s %d mentions (%s)", source.label, len(mentions), status)
+        all_mentions.extend(mentions)
+        try:
+            reach.observe_cycle(mentions)
+        except Exception as exc:
+            log.warning("Could not update reach digests: %s", exc)
+        # Aggregates over everything published so far; assigns IDs and created_at
+        with metrics.timer("leappulse_partial_publish_seconds"):
+            snap = build_snapshot(mentions, source=source.name)
+            _apply_snapshot(snap)
+            _publish_snapshot()
+
     try:
         brand = BRAND_NAME
-        all_mentions: list[dict] = []
-
         log.info("Scraping '%s' across all platforms…", brand)
+        with profiling.cycle("server"):
+            run_all(brand, on_done=publish_source)
+        log.info("Scrape complete — %d mentions.", len(all_mentions))
+
+        try:
+            with metrics.timer("leappulse_search_index_seconds"):
+                added = get_index().add(all_mentions)
+            log.info("  Search index: +%d mentions", added)
+        except Exception as exc:
+            log.warning("Could not update search index: %s", exc)
+
+        if STORAGE_BACKEND == "sqlite" and snap is not None:
+            _persist(snap, all_mentions)
+        for series, s in sorted(metrics.summary().items()):
+            log.debug("  %-60s n=%-5d total=%.3fs", series, s["count"], s["sum"])
 
-        for label, scraper in [
-            ("Reddit", lambda: scrape_reddit_all(brand)),
-            ("Twitter", lambda: scrape_twitter_brand(brand)),
-            ("LinkedIn", lambda: scrape_linkedin_brand(brand)),
-            ("Google News", lambda: scrape_news_brand(brand)),
-            ("YouTube", lambda: scrape_youtube_brand(brand)),
-        ]:
-            try:
-                results = scraper()
-                all_mentions.extend(results)
-                log.info("  %-12s %d mentions", label, len(results))
-            except Exception as e:
-                log.warning("  %-12s FAILED: %s", label, e)
-
-        log.info("  Total: %d mentions", len(all_mentions))
-
-        # Compute aggregates
-        sentiment_dist = compute_sentiment_distribution(all_mentions)
-        platform_brkdn = compute_platform_breakdown(all_mentions)
-        topics = extract_trending_topics(all_mentions)
-        metrics = compute_dashboard_metrics(all_mentions)
-        weekly = compute_weekly_trend(all_mentions)
-
-        # Assign unique IDs and inject created_at
-        ts = int(time.time())
-        for i, m in enumerate(all_mentions):
-            m["id"] = f"live-{i}-{ts}"
-            m["created_at"] = datetime.now().isoformat()
+    except Exception as exc:
+        # Sources published before the failure stay published
+        log.exception("Unexpected error during scrape: %s", exc)
 
+    finally:
         with _lock:
-            _cache["mentions"] = all_mentions
-            _cache["sentiment_distribution"] = sentiment_dist
-            _cache["platform_breakdown"] = platform_brkdn
-            _cache["trending_topics"] = topics
-            _cache["dashboard_metrics"] = metrics
-            _cache["weekly_trend"] = weekly
-            _cache["last_scraped"] = datetime.now()
+            _cache["is_scraping"] = False
 
-        log.info("Scrape complete — cache refreshed.")
 
+def _persist(snap: dict, new_mentions: list[dict]) -> None:
+    """Write a published cycle to the local store so history survives restarts."""
+    try:
+        upsert_mentions(new_mentions)
+        upsert_sentiment_distribution(snap["sentiment_distribution"])
+        upsert_platform_breakdown(snap["platform_breakdown"])
+        upsert_trending_topics(snap["trending_topics"])
+        upsert_dashboard_metrics(snap["dashboard_metrics"])
+        upsert_weekly_trend(snap["weekly_trend"])
     except Exception as exc:
-        log.exception("Unexpected error during scrape: %s", exc)
+        log.warning("Could not persist cycle to %s: %s", STORAGE_BACKEND, exc)
 
-    finally:
+
+def _load_history() -> None:
+    """Warm the cache from the local store on startup."""
+    try:
+        mentions = get_storage().recent_mentions(limit=HISTORY_WARM_LIMIT)
+    except Exception as exc:
+        log.warning("Could not load history: %s", exc)
+        return
+    if not mentions:
+        return
+    # Newest first: keep each post's latest row, in case the store predates
+    # the mention_key constraint or holds rows from another writer
+    seen: set[str] = set()
+    unique: list[dict] = []
+    for m in mentions:
+        key = mention_key(m)
+        if key not in seen:
+            seen.add(key)
+            unique.append(m)
+    mentions = unique
+
+    newest = datetime.fromisoformat(mentions[0]["scraped_at"]).astimezone().replace(tzinfo=None)
+    trends.get_detector().observe(mentions[::-1])
+    reach.get_model().mark_seen(mentions)
+    if retention.enabled():
+        # Already stored, so nothing that falls out of the window is archived
+        store = retention.get_store()
+        store.add(mentions[::-1], archive=False)
         with _lock:
-            _cache["is_scraping"] = False
+            _cache["mentions"] = store.mentions()
+            _cache.update(store.aggregates(previous_week_net_sentiment()))
+            _cache["trending_topics"] = trends.get_detector().top() or _cache["trending_topics"]
+            _cache["last_scraped"] = newest
+        _publish_snapshot()
+        log.info("Loaded %d stored mentions into the retention window", len(store))
+        return
+    with _lock:
+        _cache["mentions"] = mentions
+        _cache["sentiment_distribution"] = compute_sentiment_distribution(mentions)
+        _cache["platform_breakdown"] = compute_platform_breakdown(mentions)
+        _cache["trending_topics"] = trends.get_detector().top() or extract_trending_topics(mentions)
+        _cache["dashboard_metrics"] = compute_dashboard_metrics(mentions, previous_week_net_sentiment())
+        _cache["weekly_trend"] = compute_weekly_trend(mentions)
+        _cache["last_scraped"] = newest
+    _publish_snapshot()
+    log.info("Loaded %d stored mentions (newest %s)", len(mentions), newest.isoformat())
 
 
 def _ensure_data():
-    """Trigger a background scrape if cache is stale."""
-    if _needs_refresh() and not _cache["is_scraping"]:
+    """Trigger a background scrape if cache is stale (followers just re-sync)."""
+    if not _leader.held:
+        _sync_snapshot()
+        metrics.cache_result("api_snapshot", not _needs_refresh())
+        return
+    stale = _needs_refresh()
+    metrics.cache_result("api_snapshot", not stale)
+    if stale and not _cache["is_scraping"]:
         t = threading.Thread(target=_run_scrape, daemon=True)
         t.start()
         # Wait up to 90s for first scrape to complete
@@ -136,12 +269,133 @@ def _ensure_data():
 
 # ── App lifecycle ──
 
+_warm = {"scrapers": False, "sentiment": False}
+_serving = False
+
+
+def _warm_up() -> None:
+    """
+    Load scrapers and the sentiment backend, then run the initial scrape if
+    it's stale — all off the startup path, so the API serves immediately.
+    """
+    from scrapers.registry import all_sources
+
+    try:
+        with startup.phase("warm_scrapers"):
+            all_sources()
+        _warm["scrapers"] = True
+        with startup.phase("warm_sentiment"):
+            sentiment.warm_up()
+        _warm["sentiment"] = True
+        log.info("Warm-up done: %s", startup.report()["phases_ms"])
+    except Exception as exc:
+        log.warning("Warm-up failed: %s", exc)
+    if _needs_refresh():
+        _run_scrape()
+
+
+def _become_leader() -> None:
+    log.info("Scrape leader: pid %d", os.getpid())
+    if _cache["last_scraped"] is None:
+        # Start from the last published snapshot rather than an empty cache
+        with startup.phase("load_snapshot"):
+            _sync_snapshot()
+        if _cache["last_scraped"] is not None:
+            log.info("Loaded snapshot: %d mentions from %s",
+                     len(_cache["mentions"]), _cache["last_scraped"].isoformat())
+            restore_freshness(_cache["source_freshness"])
+            reach.get_model().mark_seen(_cache["mentions"])
+            if retention.enabled() and not len(retention.get_store()):
+                retention.get_store().add(_cache["mentions"][::-1], archive=False)
+            trends.get_detector().observe(_cache["mentions"][::-1])
+    if STORAGE_BACKEND == "sqlite" and _cache["last_scraped"] is None:
+        with startup.phase("load_history"):
+            _load_history()
+    threading.Thread(target=_warm_up, name="warm-up", daemon=True).start()
+
+
+# ── Scrape worker relay (SCRAPE_MODE=workers) ──
+# Alerts, breakers and metrics live in the worker processes; they come
+# through the job queue file (see worker.py)
+ALERT_RELAY_SECONDS = 1.0
+_job_queue = None
+
+
+def _queue():
+    global _job_queue
+    if _job_queue is None:
+        from jobqueue import JobQueue
+
+        _job_queue = JobQueue()
+    return _job_queue
+
+
+def _relay_alerts() -> None:
+    """Replay alerts the worker dispatcher published into this process's bus."""
+    bus = alerts.get_bus()
+    last = 0
+    while True:
+        try:
+            for last, alert in _queue().alerts_since(last):
+                bus.relay(alert)
+        except Exception as exc:
+            log.warning("Alert relay error: %s", exc)
+        time.sleep(ALERT_RELAY_SECONDS)
+
+
+def _worker_reports() -> list[dict]:
+    if _CAN_LEAD:
+        return []
+    try:
+        return _queue().processes()
+    except Exception as exc:
+        log.warning("Could not read worker reports: %s", exc)
+        return []
+
+
+def _coordinate() -> None:
+    """
+    Runs in every worker. Followers keep syncing the snapshot and take over
+    if the leader dies; the leader scrapes when stale or when a follower
+    asked for a refresh.
+    """
+    while True:
+        time.sleep(LEADER_POLL_SECONDS)
+        try:
+            if not _leader.held:
+                if _CAN_LEAD and _leader.try_acquire():
+                    _become_leader()
+                else:
+                    _sync_snapshot()
+            elif not _cache["is_scraping"] and (_snapshots.take_refresh_request() or _needs_refresh()):
+                _run_scrape()
+        except Exception as exc:
+            log.warning("Coordinator error: %s", exc)
+
+
 @asynccontextmanager
 async def lifespan(application: FastAPI):
-    """Kick off initial scrape on startup."""
+    """Elect a scrape leader; the leader loads history and warms up in the background."""
+    global _serving
     log.info("LeapPulse API starting for brand: %s", BRAND_NAME)
-    threading.Thread(target=_run_scrape, daemon=True).start()
+    alerts.get_bus().start()
+    if profiling.PROFILE_MODE != "off" and not ADMIN_TOKEN:
+        log.warning("PROFILE_MODE=%s but ADMIN_TOKEN is unset: /api/admin/profile refuses every request",
+                    profiling.PROFILE_MODE)
+    if _CAN_LEAD and _leader.try_acquire():
+        _become_leader()
+    else:
+        log.info("Follower: pid %d, serving the leader's snapshot", os.getpid())
+        _sync_snapshot()
+    threading.Thread(target=_coordinate, name="coordinator", daemon=True).start()
+    if not _CAN_LEAD:
+        threading.Thread(target=_relay_alerts, name="alert-relay", daemon=True).start()
+    _serving = True
+    started_ms = startup.mark("serving")
+    if started_ms > STARTUP_BUDGET_MS:
+        log.warning("Startup took %.0f ms (budget %.0f ms)", started_ms, STARTUP_BUDGET_MS)
     yield
+    _leader.release()
     log.info("LeapPulse API shutting down.")
 
 
@@ -164,12 +418,52 @@ app.add_middleware(
 
 @app.get("/api/health")
 def health():
+    reports = _worker_reports()
+    if reports:
+        breakers = merge_breakers([r["breakers"] for r in reports])
+    else:
+        breakers = breaker_status()
     return {
         "status": "ok",
         "brand": BRAND_NAME,
         "last_scraped": _cache["last_scraped"].isoformat() if _cache["last_scraped"] else None,
         "mention_count": len(_cache["mentions"]),
+        "scrape_mode": SCRAPE_MODE,
+        "role": "leader" if _leader.held else "follower",
+        "pid": os.getpid(),
+        "is_scraping": _cache["is_scraping"],
+        "warm": dict(_warm),
+        "breakers": breakers,
+        "sources": _cache["source_freshness"],
+        "workers": [
+            {"name": r["name"], "role": r["role"], "updated_at": datetime.fromtimestamp(r["updated_at"]).isoformat()}
+            for r in reports
+        ],
+    }
+
+
+@app.get("/api/ready")
+def ready():
+    """
+    Readiness: 200 once the app is serving (the leader's warm-up and first
+    scrape are scheduled in the background), 503 before. A fresh install
+    has no data until that scrape lands; /api/health reports the scrape
+    state.
+    """
+    body = {
+        "ready": _serving,
+        "has_data": _cache["last_scraped"] is not None,
+        "warm": dict(_warm),
+        "startup": startup.report(),
     }
+    return JSONResponse(body, status_code=200 if _serving else 503)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Per-stage timings and counters in Prometheus text format (summed over scrape workers)."""
+    merged = [r["metrics"] for r in _worker_reports()]
+    return PlainTextResponse(metrics.render(merged), media_type="text/plain; version=0.0.4")
 
 
 @app.get("/api/mentions")
@@ -208,6 +502,149 @@ def get_trend():
     return _cache["weekly_trend"]
 
 
+@app.get("/api/alerts")
+def get_alerts(limit: int = 50):
+    """Most recent priority alerts, newest first."""
+    return list(reversed(alerts.get_bus().recent))[:limit]
+
+
+@app.get("/api/alerts/stream")
+async def stream_alerts(request: Request):
+    """
+    Server-sent events: one `alert` event per CRITICAL ALERT / MARKETING
+    GOLD mention as soon as the pipeline scores it.
+    """
+    bus = alerts.get_bus()
+    q = bus.subscribe()
+
+    async def events():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    alert = await asyncio.wait_for(q.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: alert\ndata: {json.dumps(alert, default=str)}\n\n"
+        finally:
+            bus.unsubscribe(q)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.get("/api/history/mentions")
+def get_history_mentions(
+    since: str | None = None,
+    until: str | None = None,
+    platform: str | None = None,
+    priority: str | None = None,
+    limit: int = 500,
+):
+    """Stored mentions, newest first. `since` / `until` are ISO-8601 timestamps."""
+    return get_storage().recent_mentions(
+        since=since, until=until, platform=platform, priority=priority, limit=min(limit, 5000)
+    )
+
+
+@app.get("/api/archive/mentions")
+def get_archived_mentions(
+    since: str | None = None,
+    until: str | None = None,
+    platform: str | None = None,
+    priority: str | None = None,
+    limit: int = 500,
+):
+    """Mentions evicted from the retention window, newest first."""
+    return retention.query_archive(
+        since=since, until=until, platform=platform, priority=priority, limit=min(limit, 5000)
+    )
+
+
+@app.get("/api/retention")
+def get_retention():
+    """Size of this process's retention window (only the scraping process fills it)."""
+    return {"enabled": retention.enabled(), **retention.get_store().stats()}
+
+
+@app.get("/api/history/sentiment")
+def get_history_sentiment(
+    since: str | None = None,
+    until: str | None = None,
+    granularity: Literal["hour", "day"] = "day",
+    platform: str | None = None,
+    priority: str | None = None,
+):
+    """Sentiment per hour/day over an arbitrary range (default: last 7 days), from rollups."""
+    return sentiment_series(since, until, granularity, platform, priority)
+
+
+@app.get("/api/history/volume")
+def get_history_volume(
+    since: str | None = None,
+    until: str | None = None,
+    granularity: Literal["hour", "day"] = "day",
+    platform: str | None = None,
+):
+    """Mention volume per hour/day, split by platform and priority, from rollups."""
+    return volume_series(since, until, granularity, platform)
+
+
+@app.get("/api/history/week-over-week")
+def get_week_over_week(platform: str | None = None):
+    """Last 7 days vs the 7 before: mentions, net sentiment and engagement deltas."""
+    return week_over_week(platform)
+
+
+@app.get("/api/search")
+def search_mentions(
+    q: str,
+    platform: str | None = None,
+    priority: str | None = None,
+    limit: int = 50,
+    offset: int = 0,
+):
+    """
+    Full-text search over every indexed mention. Supports "exact phrases"
+    and prefix* terms; ranked by BM25 plus engagement.
+    """
+    return get_index().search(q, platform=platform, priority=priority, limit=min(limit, 500), offset=offset)
+
+
+@app.get("/api/reach")
+def get_reach():
+    """Per-platform engagement percentiles behind priority and the reach index."""
+    return {"platforms": reach.get_model().status()}
+
+
+@app.get("/api/trends")
+def get_trends():
+    """Burst-detection candidates behind trending_topics, heaviest first."""
+    return trends.get_detector().status()
+
+
+@app.get("/api/admin/profile")
+def get_profile(raw: bool = False, x_admin_token: str | None = Header(None)):
+    """
+    Newest scrape-cycle profile (PROFILE_MODE): the top-functions summary,
+    or with raw=true the file itself (collapsed stacks for flamegraph.pl /
+    speedscope, or a cProfile .prof). Not found unless profiling is on;
+    refused outright until ADMIN_TOKEN is set (CORS is open to any origin),
+    then needs it as the X-Admin-Token header.
+    """
+    if profiling.PROFILE_MODE == "off":
+        return JSONResponse({"error": "not found"}, status_code=404)
+    if not ADMIN_TOKEN:
+        return JSONResponse({"error": "forbidden: set ADMIN_TOKEN to enable"}, status_code=403)
+    if not hmac.compare_digest(x_admin_token or "", ADMIN_TOKEN):
+        return JSONResponse({"error": "unauthorized"}, status_code=401)
+    if raw:
+        path = profiling.latest_file()
+        if path is None:
+            return JSONResponse({"error": "no profile yet"}, status_code=404)
+        return FileResponse(path, filename=os.path.basename(path))
+    return {"mode": profiling.PROFILE_MODE, "latest": profiling.latest()}
+
+
 @app.get("/api/all")
 def get_all():
     """Single endpoint returning the full dashboard payload."""
@@ -219,6 +656,7 @@ def get_all():
         "trending_topics": _cache["trending_topics"],
         "dashboard_metrics": _cache["dashboard_metrics"],
         "weekly_trend": _cache["weekly_trend"],
+        "source_freshness": _cache["source_freshness"],
         "last_scraped": _cache["last_scraped"].isoformat() if _cache["last_scraped"] else None,
         "brand": BRAND_NAME,
     }
@@ -226,7 +664,10 @@ def get_all():
 
 @app.post("/api/refresh")
 def refresh_data():
-    """Force a fresh scrape."""
+    """Force a fresh scrape (followers hand the request to the leader)."""
+    if not _leader.held:
+        _snapshots.request_refresh()
+        return {"status": "requested", "mention_count": len(_cache["mentions"])}
     _run_scrape()
     return {"status": "refreshed", "mention_count": len(_cache["mentions"])}
 
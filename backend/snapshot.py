@@ -0,0 +1,329 @@
+"""
+LeapPulse — Shared snapshot + scrape leader
+Lets several API worker processes (uvicorn --workers N) share one scrape:
+
+  - LeaderLock: an exclusive flock on LEADER_LOCK_PATH. Exactly one process
+    holds it and scrapes; the OS drops it if that process dies, so another
+    worker takes over.
+  - SnapshotStore: the leader publishes each cycle's dashboard payload to
+    SNAPSHOT_PATH (write to a temp file, then atomic rename). Every worker
+    re-reads it only when the file changes, so all serve the same data.
+    A restarted leader starts from it too, instead of an empty cache.
+
+Snapshot file layout: a fixed header (magic, SNAPSHOT_SCHEMA_VERSION,
+codec, body length) and the body, msgpack-encoded when msgpack is
+installed and compact JSON otherwise. Readers memory-map the file and
+decode straight from the mapping, so every process shares the same page
+cache pages. A file with the wrong magic, schema version or an unknown
+codec is ignored, which makes the caller fall back to a fresh scrape.
+
+build_snapshot() turns one cycle's mentions into that payload; the API
+server and the scrape workers (worker.py) both publish through it, and
+main.py builds it batch by batch through SnapshotStream. With
+retention on (see retention.py) the payload covers every mention still in
+the window, not just the latest cycle. The server publishes once per
+finished source rather than once per cycle; mark_source() records each
+source's freshness, which travels in the payload.
+"""
+
+import itertools
+import json
+import mmap
+import os
+import struct
+import threading
+from datetime import datetime
+
+import retention
+import trends
+from aggregator import (
+    compute_sentiment_distribution,
+    compute_platform_breakdown,
+    extract_trending_topics,
+    compute_dashboard_metrics,
+    compute_weekly_trend,
+)
+import metrics
+from config import LEADER_LOCK_PATH, SNAPSHOT_PATH
+from history import previous_week_net_sentiment
+
+SNAPSHOT_KEYS = (
+    "mentions", "sentiment_distribution", "platform_breakdown",
+    "trending_topics", "dashboard_metrics", "weekly_trend", "source_freshness",
+)
+
+# Bump when the payload shape changes; older files are then ignored
+SNAPSHOT_SCHEMA_VERSION = 3
+
+_MAGIC = b"LPSNAP"
+_HEADER = struct.Struct("<6sHcQ")  # magic, schema version, codec, body length
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, every process acts alone
+    fcntl = None
+
+try:
+    import msgpack
+except ImportError:  # optional: compact JSON is the fallback codec
+    msgpack = None
+
+
+def encode_snapshot(payload: dict) -> bytes:
+    if msgpack is not None:
+        codec, body = b"m", msgpack.packb(payload, use_bin_type=True, default=str)
+    else:
+        codec, body = b"j", json.dumps(payload, default=str, separators=(",", ":")).encode()
+    return _HEADER.pack(_MAGIC, SNAPSHOT_SCHEMA_VERSION, codec, len(body)) + body
+
+
+def decode_snapshot(buf) -> dict | None:
+    """Payload from an encoded snapshot (bytes or mmap), or None if unusable."""
+    if len(buf) < _HEADER.size:
+        return None
+    magic, version, codec, length = _HEADER.unpack_from(buf, 0)
+    if magic != _MAGIC or version != SNAPSHOT_SCHEMA_VERSION:
+        return None
+    if _HEADER.size + length > len(buf):
+        return None  # truncated
+    body = memoryview(buf)[_HEADER.size:_HEADER.size + length]
+    try:
+        if codec == b"m" and msgpack is not None:
+            payload = msgpack.unpackb(body, raw=False)
+        elif codec == b"j":
+            payload = json.loads(body.tobytes())
+        else:
+            return None
+    except ValueError:
+        return None
+    finally:
+        body.release()
+    if not isinstance(payload, dict) or any(k not in payload for k in SNAPSHOT_KEYS):
+        return None
+    return payload
+
+
+# ── Per-source freshness ──
+
+_freshness: dict[str, dict] = {}
+_freshness_lock = threading.Lock()
+
+
+def mark_source(name: str, label: str, status: str, count: int = 0) -> None:
+    """
+    Record how a source's latest run went: "fresh", "failed" or "stale"
+    (missed the cycle deadline). `updated_at` only moves on fresh runs.
+    """
+    now = datetime.now().isoformat()
+    with _freshness_lock:
+        prev = _freshness.get(name, {})
+        _freshness[name] = {
+            "label": label,
+            "status": status,
+            "mentions": count,
+            "updated_at": now if status == "fresh" else prev.get("updated_at"),
+            "checked_at": now,
+        }
+
+
+def source_freshness() -> dict[str, dict]:
+    with _freshness_lock:
+        return {name: dict(f) for name, f in _freshness.items()}
+
+
+def restore_freshness(freshness: dict[str, dict]) -> None:
+    """Seed from a loaded snapshot, so a restart keeps the last known times."""
+    with _freshness_lock:
+        for name, f in (freshness or {}).items():
+            _freshness.setdefault(name, dict(f))
+
+
+# Mentions per source for partial publishes when retention is off
+_latest: dict[str, list[dict]] = {}
+_ids = itertools.count()
+
+
+def _ingest(mentions: list[dict], now: datetime) -> None:
+    """Give mentions ids and created_at, and feed the trend detector and retention window."""
+    ts = int(now.timestamp())
+    for m in mentions:
+        m["id"] = f"live-{next(_ids)}-{ts}"
+        m["created_at"] = now.isoformat()
+    trends.get_detector().observe(mentions)
+    if retention.enabled():
+        retention.get_store().add(mentions)
+
+
+def _payload(window: list[dict], now: datetime) -> dict:
+    """Aggregates over the retention window, or over `window` with retention off."""
+    if retention.enabled():
+        store = retention.get_store()
+        payload = {"mentions": store.mentions()}
+        payload.update(store.aggregates(previous_week_net_sentiment()))
+    else:
+        payload = {
+            "mentions": window,
+            "sentiment_distribution": compute_sentiment_distribution(window),
+            "platform_breakdown": compute_platform_breakdown(window),
+            "trending_topics": extract_trending_topics(window),
+            "dashboard_metrics": compute_dashboard_metrics(window, previous_week_net_sentiment()),
+            "weekly_trend": compute_weekly_trend(window),
+        }
+    # Burst-ranked topics once the detector has enough to go on; the
+    # plain counts above stand in until then
+    topics = trends.get_detector().top()
+    if topics:
+        payload["trending_topics"] = topics
+    payload["source_freshness"] = source_freshness()
+    payload["last_scraped"] = now.isoformat()
+    return payload
+
+
+def build_snapshot(mentions: list[dict], source: str | None = None) -> dict:
+    """
+    Aggregates plus the mentions (given ids and created_at) for one cycle,
+    or for the whole retention window when retention is on. Pass `source`
+    when `mentions` are one source's share of a cycle still in progress.
+    """
+    now = datetime.now()
+    _ingest(mentions, now)
+    window = mentions
+    if not retention.enabled():
+        if source is None:
+            _latest.clear()
+        else:
+            # Replace only this source's slice of the dashboard
+            _latest[source] = mentions
+            window = [m for ms in _latest.values() for m in ms]
+    return _payload(window, now)
+
+
+class SnapshotStream:
+    """
+    build_snapshot() for a cycle that arrives in micro-batches: add() each
+    batch as it is scored, payload() once the cycle is over. With retention
+    on only the bounded window is kept; with it off the cycle's mentions
+    are, since they are the payload. Pass `sources` (names) when the cycle
+    runs only some sources: with retention off, the others keep their
+    slices from earlier runs, as with build_snapshot(source=...).
+    """
+
+    def __init__(self, sources: list[str] | None = None):
+        self.count = 0
+        self._sources = sources
+        self._window: dict[str, list[dict]] = {}
+
+    def add(self, mentions: list[dict], source: str = "") -> None:
+        _ingest(mentions, datetime.now())
+        if not retention.enabled():
+            self._window.setdefault(source, []).extend(mentions)
+        self.count += len(mentions)
+
+    def payload(self) -> dict:
+        if self._sources is None:
+            _latest.clear()
+            window = [m for ms in self._window.values() for m in ms]
+        else:
+            for name in self._sources:
+                _latest[name] = self._window.get(name, [])
+            window = [m for ms in _latest.values() for m in ms]
+        return _payload(window, datetime.now())
+
+
+class LeaderLock:
+    def __init__(self, path: str = LEADER_LOCK_PATH):
+        self.path = path
+        self._fd: int | None = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        """Take the lock without blocking. True if this process is (now) leader."""
+        if self._fd is not None:
+            return True
+        if fcntl is None:
+            self._fd = -1
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        if self._fd >= 0:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+        self._fd = None
+
+
+class SnapshotStore:
+    def __init__(self, path: str = SNAPSHOT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stamp: tuple | None = None
+
+    def _file_stamp(self) -> tuple | None:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def publish(self, payload: dict) -> None:
+        """Atomically replace the snapshot file."""
+        with metrics.timer("leappulse_snapshot_seconds", op="write"):
+            data = encode_snapshot(payload)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self.path)
+        with self._lock:
+            self._stamp = self._file_stamp()
+
+    def load_if_changed(self) -> dict | None:
+        """
+        The snapshot if the file changed since the last call, else None
+        (also None for a file from another schema version).
+        """
+        stamp = self._file_stamp()
+        with self._lock:
+            if stamp is None or stamp == self._stamp:
+                return None
+            try:
+                with metrics.timer("leappulse_snapshot_seconds", op="read"), open(self.path, "rb") as f:
+                    st = os.fstat(f.fileno())
+                    if st.st_size == 0:
+                        return None
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        payload = decode_snapshot(mm)
+            except (OSError, ValueError):
+                return None  # mid-replace on an odd filesystem; next call retries
+            # Stamp of the file actually read, in case it was replaced meanwhile
+            self._stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+            if payload is None:
+                metrics.inc("leappulse_snapshot_rejected_total")
+                print(f"  ⚠ Ignoring {self.path}: not a schema v{SNAPSHOT_SCHEMA_VERSION} snapshot")
+        return payload
+
+    # ── Refresh requests (follower → leader) ──
+
+    def request_refresh(self) -> None:
+        with open(f"{self.path}.refresh", "w"):
+            pass
+
+    def take_refresh_request(self) -> bool:
+        try:
+            os.remove(f"{self.path}.refresh")
+            return True
+        except FileNotFoundError:
+            return False
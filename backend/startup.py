@@ -0,0 +1,102 @@
+"""
+LeapPulse — Startup timing
+Records how long the API takes to import and start, and checks the import
+cost of server.py against STARTUP_BUDGET_MS so regressions are visible.
+
+Usage (from backend/):
+  python -m startup                     # import-time report for server.py
+  python -m startup --module main --top 25
+Exits non-zero when the import exceeds the budget, so CI can track it.
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+STARTED = time.perf_counter()
+
+from config import STARTUP_BUDGET_MS  # noqa: E402 — after STARTED on purpose
+
+_phases: dict[str, float] = {}
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)")
+
+
+def mark(name: str) -> float:
+    """Record milliseconds since this module was first imported."""
+    _phases[name] = round((time.perf_counter() - STARTED) * 1000, 1)
+    return _phases[name]
+
+
+@contextmanager
+def phase(name: str):
+    """Record how long a block takes, in milliseconds."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phases[name] = round((time.perf_counter() - start) * 1000, 1)
+
+
+def report() -> dict:
+    return {"phases_ms": dict(_phases), "budget_ms": STARTUP_BUDGET_MS}
+
+
+def import_report(module: str = "server", top: int = 15) -> dict:
+    """
+    Import `module` in a fresh interpreter with -X importtime and return its
+    total cost plus the most expensive direct imports.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=Path(__file__).parent,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    total_us = 0
+    children: list[tuple[int, str]] = []
+    for line in proc.stderr.splitlines():
+        m = _IMPORTTIME_RE.match(line)
+        if not m:
+            continue
+        cumulative, indent, name = int(m.group(2)), len(m.group(3)), m.group(4)
+        if name == module and indent == 1:
+            total_us = cumulative
+        elif indent == 3:  # imported directly by `module`
+            children.append((cumulative, name))
+
+    children.sort(reverse=True)
+    return {
+        "module": module,
+        "total_ms": round(total_us / 1000, 1),
+        "budget_ms": STARTUP_BUDGET_MS,
+        "top": [{"module": name, "ms": round(us / 1000, 1)} for us, name in children[:top]],
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="LeapPulse import-time report")
+    parser.add_argument("--module", default="server")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS)
+    args = parser.parse_args(argv)
+
+    r = import_report(args.module, args.top)
+    print(f"\nimport {r['module']}: {r['total_ms']:.1f} ms (budget {args.budget_ms:.0f} ms)\n")
+    for item in r["top"]:
+        print(f"  {item['module']:<40} {item['ms']:>8.1f} ms")
+    if r["total_ms"] > args.budget_ms:
+        print(f"\n✗ Over budget by {r['total_ms'] - args.budget_ms:.1f} ms")
+        return 1
+    print("\n✓ Within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,395 @@
+"""
+LeapPulse — Storage backends
+One interface over the dashboard tables, two implementations:
+
+  supabase — remote Postgres via supabase-py (default, feeds Realtime)
+  sqlite   — embedded local file in WAL mode; millisecond writes,
+             history queries and fully offline single-node operation
+
+Select with STORAGE_BACKEND=supabase|sqlite.
+
+Both backends maintain hourly and daily rollups of social_mentions
+(count, sentiment sum, engagement sum per platform × priority) as rows
+arrive, so history queries never scan raw mentions.
+
+social_mentions is unique on mention_key (platform + source URL, or the
+content when there's no URL; see keys.mention_key). A post scraped
+again on a later cycle is ignored rather than stored, and counted, twice.
+"""
+
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timezone
+
+from config import STORAGE_BACKEND, SQLITE_PATH
+from keys import mention_key
+
+# Columns per table (id and timestamps are filled in by the backend)
+TABLES: dict[str, list[str]] = {
+    "social_mentions": [
+        "platform", "content", "sentiment_score", "likes", "shares",
+        "comments", "author", "source_url", "priority",
+    ],
+    "sentiment_distribution": ["label", "value", "count"],
+    "platform_breakdown": ["platform", "mention_count", "percentage"],
+    "trending_topics": ["tag", "mentions", "trend"],
+    "dashboard_metrics": [
+        "net_sentiment", "sentiment_change", "total_mentions", "avg_engagement", "reach_index",
+    ],
+    "weekly_trend": ["day_label", "score"],
+}
+
+# Timestamp column per table, mirroring supabase_schema.sql
+TIME_COLUMN = {table: "recorded_at" for table in TABLES}
+TIME_COLUMN["social_mentions"] = "scraped_at"
+# Derived on insert rather than passed in (see keys.mention_key)
+KEY_COLUMN = {"social_mentions": "mention_key"}
+
+ROLLUP_TABLES = {"hour": "mention_rollup_hourly", "day": "mention_rollup_daily"}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def utc_iso(ts: str) -> str:
+    """Normalise an ISO timestamp to UTC (naive input is taken as UTC)."""
+    dt = datetime.fromisoformat(ts)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).isoformat()
+
+
+def rollup_bucket(ts: str, granularity: str) -> str:
+    """Bucket key for an ISO timestamp: hour → '…THH:00:00+00:00', day → 'YYYY-MM-DD'."""
+    dt = datetime.fromisoformat(utc_iso(ts))
+    if granularity == "day":
+        return dt.date().isoformat()
+    return dt.replace(minute=0, second=0, microsecond=0).isoformat()
+
+
+class Storage:
+    """Interface every backend implements."""
+
+    def insert(self, table: str, rows: list[dict]) -> None:
+        raise NotImplementedError
+
+    def recent_mentions(
+        self,
+        since: str | None = None,
+        until: str | None = None,
+        platform: str | None = None,
+        priority: str | None = None,
+        limit: int = 500,
+    ) -> list[dict]:
+        """Mentions newest-first, optionally filtered by time range / platform / priority."""
+        raise NotImplementedError
+
+    def latest(self, table: str) -> list[dict]:
+        """Rows from the most recent snapshot written to an aggregate table."""
+        raise NotImplementedError
+
+    def rollups(
+        self,
+        granularity: str,
+        since: str,
+        until: str,
+        platform: str | None = None,
+        priority: str | None = None,
+    ) -> list[dict]:
+        """
+        Rollup rows (bucket, platform, priority, mentions, sentiment_sum,
+        engagement_sum) for every bucket overlapping [since, until).
+        Bounds are ISO timestamps.
+        """
+        raise NotImplementedError
+
+
+def _with_keys(rows: list[dict]) -> list[dict]:
+    return [{**r, "mention_key": mention_key(r)} for r in rows]
+
+
+class SupabaseStorage(Storage):
+    def _client(self):
+        from db import get_client
+
+        return get_client()
+
+    def insert(self, table: str, rows: list[dict]) -> None:
+        if table != "social_mentions":
+            self._client().table(table).insert(rows).execute()
+            return
+        # ON CONFLICT DO NOTHING: re-scraped posts never reach the rollup trigger
+        self._client().table(table).upsert(
+            _with_keys(rows), on_conflict="mention_key", ignore_duplicates=True
+        ).execute()
+
+    def recent_mentions(self, since=None, until=None, platform=None, priority=None, limit=500) -> list[dict]:
+        q = self._client().table("social_mentions").select("*")
+        if since:
+            q = q.gte("scraped_at", since)
+        if until:
+            q = q.lt("scraped_at", until)
+        if platform:
+            q = q.eq("platform", platform)
+        if priority:
+            q = q.eq("priority", priority)
+        return q.order("scraped_at", desc=True).limit(limit).execute().data
+
+    def latest(self, table: str) -> list[dict]:
+        col = TIME_COLUMN[table]
+        top = self._client().table(table).select(col).order(col, desc=True).limit(1).execute().data
+        if not top:
+            return []
+        return self._client().table(table).select("*").eq(col, top[0][col]).execute().data
+
+    def rollups(self, granularity, since, until, platform=None, priority=None) -> list[dict]:
+        # Maintained by the rollup_mention() trigger in supabase_schema.sql
+        q = (
+            self._client().table(ROLLUP_TABLES[granularity]).select("*")
+            .gte("bucket", rollup_bucket(since, granularity))
+            .lt("bucket", utc_iso(until))
+        )
+        if platform:
+            q = q.eq("platform", platform)
+        if priority:
+            q = q.eq("priority", priority)
+        return q.order("bucket").execute().data
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS social_mentions (
+  id              TEXT PRIMARY KEY,
+  platform        TEXT NOT NULL,
+  content         TEXT NOT NULL,
+  sentiment_score REAL NOT NULL DEFAULT 0,
+  likes           INTEGER NOT NULL DEFAULT 0,
+  shares          INTEGER NOT NULL DEFAULT 0,
+  comments        INTEGER NOT NULL DEFAULT 0,
+  author          TEXT NOT NULL DEFAULT 'unknown',
+  source_url      TEXT,
+  priority        TEXT NOT NULL DEFAULT 'NEUTRAL',
+  scraped_at      TEXT NOT NULL,
+  created_at      TEXT NOT NULL,
+  mention_key     TEXT
+);
+CREATE TABLE IF NOT EXISTS sentiment_distribution (
+  id TEXT PRIMARY KEY, label TEXT NOT NULL, value REAL NOT NULL DEFAULT 0,
+  count INTEGER NOT NULL DEFAULT 0, recorded_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS platform_breakdown (
+  id TEXT PRIMARY KEY, platform TEXT NOT NULL, mention_count INTEGER NOT NULL DEFAULT 0,
+  percentage REAL NOT NULL DEFAULT 0, recorded_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS trending_topics (
+  id TEXT PRIMARY KEY, tag TEXT NOT NULL, mentions INTEGER NOT NULL DEFAULT 0,
+  trend TEXT NOT NULL DEFAULT 'stable', recorded_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dashboard_metrics (
+  id TEXT PRIMARY KEY, net_sentiment INTEGER NOT NULL DEFAULT 0,
+  sentiment_change REAL NOT NULL DEFAULT 0, total_mentions INTEGER NOT NULL DEFAULT 0,
+  avg_engagement REAL NOT NULL DEFAULT 0, reach_index INTEGER NOT NULL DEFAULT 50,
+  recorded_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS weekly_trend (
+  id TEXT PRIMARY KEY, day_label TEXT NOT NULL, score INTEGER NOT NULL DEFAULT 0,
+  recorded_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS mention_rollup_hourly (
+  bucket TEXT NOT NULL, platform TEXT NOT NULL, priority TEXT NOT NULL,
+  mentions INTEGER NOT NULL DEFAULT 0, sentiment_sum REAL NOT NULL DEFAULT 0,
+  engagement_sum INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (bucket, platform, priority)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS mention_rollup_daily (
+  bucket TEXT NOT NULL, platform TEXT NOT NULL, priority TEXT NOT NULL,
+  mentions INTEGER NOT NULL DEFAULT 0, sentiment_sum REAL NOT NULL DEFAULT 0,
+  engagement_sum INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (bucket, platform, priority)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_mentions_scraped  ON social_mentions (scraped_at DESC);
+CREATE INDEX IF NOT EXISTS idx_mentions_platform ON social_mentions (platform, scraped_at DESC);
+CREATE INDEX IF NOT EXISTS idx_mentions_priority ON social_mentions (priority, scraped_at DESC);
+CREATE INDEX IF NOT EXISTS idx_sentiment_dist_recorded ON sentiment_distribution (recorded_at DESC);
+CREATE INDEX IF NOT EXISTS idx_platform_break_recorded ON platform_breakdown (recorded_at DESC);
+CREATE INDEX IF NOT EXISTS idx_topics_recorded   ON trending_topics (recorded_at DESC);
+CREATE INDEX IF NOT EXISTS idx_metrics_recorded  ON dashboard_metrics (recorded_at DESC);
+CREATE INDEX IF NOT EXISTS idx_weekly_recorded   ON weekly_trend (recorded_at DESC);
+"""
+
+
+class SQLiteStorage(Storage):
+    """Embedded SQLite store — one connection per thread, WAL journaling."""
+
+    def __init__(self, path: str = SQLITE_PATH):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.executescript(_SQLITE_SCHEMA)
+        # Databases created before reach_index existed
+        cols = {r["name"] for r in conn.execute("PRAGMA table_info(dashboard_metrics)")}
+        if "reach_index" not in cols:
+            conn.execute("ALTER TABLE dashboard_metrics ADD COLUMN reach_index INTEGER NOT NULL DEFAULT 50")
+        # Databases created before mentions were unique per mention_key
+        cols = {r["name"] for r in conn.execute("PRAGMA table_info(social_mentions)")}
+        if "mention_key" not in cols:
+            conn.execute("ALTER TABLE social_mentions ADD COLUMN mention_key TEXT")
+        if conn.execute("SELECT 1 FROM social_mentions WHERE mention_key IS NULL LIMIT 1").fetchone():
+            self._dedupe_mentions(conn)
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_mentions_key ON social_mentions (mention_key)")
+
+    def _dedupe_mentions(self, conn: sqlite3.Connection) -> None:
+        """Key the existing rows, keep the first of each key, and rebuild the rollups."""
+        rows = [dict(r) for r in conn.execute("SELECT rowid, * FROM social_mentions ORDER BY scraped_at, rowid")]
+        keep: dict[str, dict] = {}
+        drop: list[int] = []
+        for r in rows:
+            key = mention_key(r)
+            if key in keep:
+                drop.append(r["rowid"])
+            else:
+                keep[key] = r
+        with conn:
+            conn.executemany("DELETE FROM social_mentions WHERE rowid = ?", [(i,) for i in drop])
+            conn.executemany(
+                "UPDATE social_mentions SET mention_key = ? WHERE rowid = ?",
+                [(key, r["rowid"]) for key, r in keep.items()],
+            )
+            if drop:
+                for rollup_table in ROLLUP_TABLES.values():
+                    conn.execute(f"DELETE FROM {rollup_table}")
+                self._update_rollups(conn, list(keep.values()), _now())
+        if drop:
+            print(f"  ✓ Removed {len(drop)} duplicate stored mentions; rollups rebuilt")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def insert(self, table: str, rows: list[dict]) -> None:
+        if not rows:
+            return
+        if table == "social_mentions":
+            rows = _with_keys(rows)
+        cols = TABLES[table] + ([KEY_COLUMN[table]] if table in KEY_COLUMN else [])
+        time_col = TIME_COLUMN[table]
+        extra = [time_col] + (["created_at"] if table == "social_mentions" else [])
+        all_cols = ["id"] + cols + extra
+        sql = (
+            f"INSERT OR IGNORE INTO {table} ({', '.join(all_cols)}) "
+            f"VALUES ({', '.join('?' * len(all_cols))})"
+        )
+        now = _now()
+        values = [
+            [r.get("id") or uuid.uuid4().hex]
+            + [r.get(c) for c in cols]
+            + [r.get(time_col) or now]
+            + ([r.get("created_at") or now] if table == "social_mentions" else [])
+            for r in rows
+        ]
+        conn = self._conn()
+        with conn:
+            if table != "social_mentions":
+                conn.executemany(sql, values)
+                return
+            # Only rows actually inserted (not ignored re-scrapes) count toward rollups
+            inserted = [
+                r for r, v in zip(rows, values)
+                if conn.execute(sql, v).rowcount == 1
+            ]
+            self._update_rollups(conn, inserted, now)
+
+    def _update_rollups(self, conn: sqlite3.Connection, rows: list[dict], now: str) -> None:
+        for granularity, rollup_table in ROLLUP_TABLES.items():
+            acc: dict[tuple, list] = {}
+            for r in rows:
+                key = (
+                    rollup_bucket(r.get("scraped_at") or now, granularity),
+                    r.get("platform"),
+                    r.get("priority") or "NEUTRAL",
+                )
+                a = acc.setdefault(key, [0, 0.0, 0])
+                a[0] += 1
+                a[1] += r.get("sentiment_score") or 0.0
+                a[2] += (r.get("likes") or 0) + (r.get("shares") or 0) + (r.get("comments") or 0)
+            conn.executemany(
+                f"""INSERT INTO {rollup_table}
+                      (bucket, platform, priority, mentions, sentiment_sum, engagement_sum)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (bucket, platform, priority) DO UPDATE SET
+                      mentions       = mentions + excluded.mentions,
+                      sentiment_sum  = sentiment_sum + excluded.sentiment_sum,
+                      engagement_sum = engagement_sum + excluded.engagement_sum""",
+                [(*k, *v) for k, v in acc.items()],
+            )
+
+    def recent_mentions(self, since=None, until=None, platform=None, priority=None, limit=500) -> list[dict]:
+        clauses, args = [], []
+        if since:
+            clauses.append("scraped_at >= ?")
+            args.append(since)
+        if until:
+            clauses.append("scraped_at < ?")
+            args.append(until)
+        if platform:
+            clauses.append("platform = ?")
+            args.append(platform)
+        if priority:
+            clauses.append("priority = ?")
+            args.append(priority)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._conn().execute(
+            f"SELECT * FROM social_mentions {where} ORDER BY scraped_at DESC LIMIT ?",
+            [*args, limit],
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def latest(self, table: str) -> list[dict]:
+        col = TIME_COLUMN[table]
+        rows = self._conn().execute(
+            f"SELECT * FROM {table} WHERE {col} = (SELECT MAX({col}) FROM {table})"
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def rollups(self, granularity, since, until, platform=None, priority=None) -> list[dict]:
+        clauses = ["bucket >= ?", "bucket < ?"]
+        args: list = [rollup_bucket(since, granularity), utc_iso(until)]
+        if platform:
+            clauses.append("platform = ?")
+            args.append(platform)
+        if priority:
+            clauses.append("priority = ?")
+            args.append(priority)
+        rows = self._conn().execute(
+            f"SELECT * FROM {ROLLUP_TABLES[granularity]} WHERE {' AND '.join(clauses)} ORDER BY bucket",
+            args,
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+
+_storage: Storage | None = None
+_storage_lock = threading.Lock()
+
+
+def get_storage() -> Storage:
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            if STORAGE_BACKEND == "sqlite":
+                _storage = SQLiteStorage()
+            elif STORAGE_BACKEND == "supabase":
+                _storage = SupabaseStorage()
+            else:
+                raise RuntimeError(
+                    f"Unknown STORAGE_BACKEND '{STORAGE_BACKEND}' (expected supabase or sqlite)"
+                )
+    return _storage
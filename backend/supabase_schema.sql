@@ -17,8 +17,11 @@ CREATE TABLE IF NOT EXISTS social_mentions (
   priority      TEXT NOT NULL DEFAULT 'NEUTRAL'
                   CHECK (priority IN ('CRITICAL ALERT','HIGH PRIORITY','MARKETING GOLD','NEUTRAL')),
   scraped_at    TIMESTAMPTZ NOT NULL DEFAULT now(),
-  created_at    TIMESTAMPTZ NOT NULL DEFAULT now()
+  created_at    TIMESTAMPTZ NOT NULL DEFAULT now(),
+  mention_key   TEXT                               -- platform|source_url, set by the backend
 );
+-- Existing installs: add the key; re-scraped posts are then ignored on insert
+ALTER TABLE social_mentions ADD COLUMN IF NOT EXISTS mention_key TEXT;
 
 -- 2. Sentiment distribution snapshots (positive / negative / neutral %)
 CREATE TABLE IF NOT EXISTS sentiment_distribution (
@@ -54,8 +57,11 @@ CREATE TABLE IF NOT EXISTS dashboard_metrics (
   sentiment_change  FLOAT NOT NULL DEFAULT 0,
   total_mentions    INT NOT NULL DEFAULT 0,
   avg_engagement    FLOAT NOT NULL DEFAULT 0,
+  reach_index       INT NOT NULL DEFAULT 50,              -- mean per-platform engagement percentile, 0-100
   recorded_at       TIMESTAMPTZ NOT NULL DEFAULT now()
 );
+-- Projects created before reach_index existed
+ALTER TABLE dashboard_metrics ADD COLUMN IF NOT EXISTS reach_index INT NOT NULL DEFAULT 50;
 
 -- 5. Weekly trend data points
 CREATE TABLE IF NOT EXISTS weekly_trend (
@@ -65,9 +71,64 @@ CREATE TABLE IF NOT EXISTS weekly_trend (
   recorded_at   TIMESTAMPTZ NOT NULL DEFAULT now()
 );
 
+-- 6. Rollups — maintained by the rollup_mention() trigger below so
+--    history queries never scan raw mentions
+CREATE TABLE IF NOT EXISTS mention_rollup_hourly (
+  bucket          TIMESTAMPTZ NOT NULL,
+  platform        TEXT NOT NULL,
+  priority        TEXT NOT NULL,
+  mentions        INT NOT NULL DEFAULT 0,
+  sentiment_sum   FLOAT NOT NULL DEFAULT 0,
+  engagement_sum  BIGINT NOT NULL DEFAULT 0,
+  PRIMARY KEY (bucket, platform, priority)
+);
+
+CREATE TABLE IF NOT EXISTS mention_rollup_daily (
+  bucket          TIMESTAMPTZ NOT NULL,  -- midnight UTC
+  platform        TEXT NOT NULL,
+  priority        TEXT NOT NULL,
+  mentions        INT NOT NULL DEFAULT 0,
+  sentiment_sum   FLOAT NOT NULL DEFAULT 0,
+  engagement_sum  BIGINT NOT NULL DEFAULT 0,
+  PRIMARY KEY (bucket, platform, priority)
+);
+
+CREATE OR REPLACE FUNCTION rollup_mention() RETURNS trigger AS $$
+DECLARE
+  engagement BIGINT := NEW.likes + NEW.shares + NEW.comments;
+BEGIN
+  INSERT INTO mention_rollup_hourly AS r
+    (bucket, platform, priority, mentions, sentiment_sum, engagement_sum)
+  VALUES (date_trunc('hour', NEW.scraped_at), NEW.platform, NEW.priority, 1, NEW.sentiment_score, engagement)
+  ON CONFLICT (bucket, platform, priority) DO UPDATE SET
+    mentions       = r.mentions + 1,
+    sentiment_sum  = r.sentiment_sum + EXCLUDED.sentiment_sum,
+    engagement_sum = r.engagement_sum + EXCLUDED.engagement_sum;
+
+  INSERT INTO mention_rollup_daily AS r
+    (bucket, platform, priority, mentions, sentiment_sum, engagement_sum)
+  VALUES (date_trunc('day', NEW.scraped_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+          NEW.platform, NEW.priority, 1, NEW.sentiment_score, engagement)
+  ON CONFLICT (bucket, platform, priority) DO UPDATE SET
+    mentions       = r.mentions + 1,
+    sentiment_sum  = r.sentiment_sum + EXCLUDED.sentiment_sum,
+    engagement_sum = r.engagement_sum + EXCLUDED.engagement_sum;
+
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_rollup_mention ON social_mentions;
+CREATE TRIGGER trg_rollup_mention
+  AFTER INSERT ON social_mentions
+  FOR EACH ROW EXECUTE FUNCTION rollup_mention();
+
 -- ── Indexes ──
 CREATE INDEX IF NOT EXISTS idx_mentions_scraped ON social_mentions (scraped_at DESC);
 CREATE INDEX IF NOT EXISTS idx_mentions_priority ON social_mentions (priority);
+-- Inserts use ON CONFLICT (mention_key) DO NOTHING, so the rollup trigger
+-- only ever sees a mention once
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mentions_key ON social_mentions (mention_key);
 CREATE INDEX IF NOT EXISTS idx_sentiment_dist_recorded ON sentiment_distribution (recorded_at DESC);
 CREATE INDEX IF NOT EXISTS idx_platform_break_recorded ON platform_breakdown (recorded_at DESC);
 CREATE INDEX IF NOT EXISTS idx_topics_recorded ON trending_topics (recorded_at DESC);
@@ -86,6 +147,8 @@ ALTER TABLE platform_breakdown     ENABLE ROW LEVEL SECURITY;
 ALTER TABLE trending_topics        ENABLE ROW LEVEL SECURITY;
 ALTER TABLE dashboard_metrics      ENABLE ROW LEVEL SECURITY;
 ALTER TABLE weekly_trend           ENABLE ROW LEVEL SECURITY;
+ALTER TABLE mention_rollup_hourly  ENABLE ROW LEVEL SECURITY;
+ALTER TABLE mention_rollup_daily   ENABLE ROW LEVEL SECURITY;
 
 -- Allow anon reads
 CREATE POLICY "anon_read_mentions"   ON social_mentions        FOR SELECT TO anon USING (true);
@@ -94,6 +157,8 @@ CREATE POLICY "anon_read_platforms"  ON platform_breakdown     FOR SELECT TO ano
 CREATE POLICY "anon_read_topics"     ON trending_topics        FOR SELECT TO anon USING (true);
 CREATE POLICY "anon_read_metrics"    ON dashboard_metrics      FOR SELECT TO anon USING (true);
 CREATE POLICY "anon_read_weekly"     ON weekly_trend           FOR SELECT TO anon USING (true);
+CREATE POLICY "anon_read_rollup_h"   ON mention_rollup_hourly  FOR SELECT TO anon USING (true);
+CREATE POLICY "anon_read_rollup_d"   ON mention_rollup_daily   FOR SELECT TO anon USING (true);
 
 -- Allow service_role full access (scrapers use service key)
 CREATE POLICY "service_all_mentions"   ON social_mentions        FOR ALL TO service_role USING (true);
@@ -102,3 +167,5 @@ CREATE POLICY "service_all_platforms"  ON platform_breakdown     FOR ALL TO serv
 CREATE POLICY "service_all_topics"     ON trending_topics        FOR ALL TO service_role USING (true);
 CREATE POLICY "service_all_metrics"    ON dashboard_metrics      FOR ALL TO service_role USING (true);
 CREATE POLICY "service_all_weekly"     ON weekly_trend           FOR ALL TO service_role USING (true);
+CREATE POLICY "service_all_rollup_h"   ON mention_rollup_hourly  FOR ALL TO service_role USING (true);
+CREATE POLICY "service_all_rollup_d"   ON mention_rollup_daily   FOR ALL TO service_role USING (true);
@@ -0,0 +1,27 @@
+"""
+Shared test setup: make backend/ importable and keep every file the
+modules default to (databases, reach state, archives, queues) out of
+the tree.
+"""
+
+import os
+import sys
+import tempfile
+
+_BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _BACKEND)
+
+# Read by config at import time, so set before any backend module loads
+_SCRATCH = tempfile.mkdtemp(prefix="leappulse-tests-")
+for name, filename in (
+    ("REACH_STATE_PATH", "reach.json"),
+    ("RETENTION_DIR", "archive"),
+    ("JOBQUEUE_PATH", "jobs.db"),
+    ("SNAPSHOT_PATH", "snapshot.bin"),
+    ("LEADER_LOCK_PATH", "leader.lock"),
+    ("SQLITE_PATH", "leappulse.db"),
+    ("SEARCH_DB_PATH", "search.db"),
+    ("PROFILE_DIR", "profiles"),
+):
+    os.environ.setdefault(name, os.path.join(_SCRATCH, filename))
+os.environ.setdefault("STORAGE_BACKEND", "sqlite")
@@ -0,0 +1,8 @@
+import pytest
+
+from bench import alert_check
+
+
+@pytest.mark.parametrize("name", list(alert_check.CHECKS))
+def test_alert_check(name):
+    assert alert_check.CHECKS[name]()
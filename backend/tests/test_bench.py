@@ -0,0 +1,25 @@
+from bench import corpus
+from bench.run import _NOISE_FLOOR_SECONDS, bench_sources, compare
+
+
+def test_corpus_is_deterministic():
+    assert corpus.generate(200, seed=5) == corpus.generate(200, seed=5)
+    assert corpus.generate(200, seed=5) != corpus.generate(200, seed=6)
+    assert len(corpus.generate(1000)) == 1000
+
+
+def test_every_source_scrapes_the_fixtures_offline():
+    results = bench_sources(latency_ms=0)
+    assert {"source.reddit", "source.twitter", "source.youtube", "source.google_news", "source.linkedin"} <= set(results)
+    assert all(r["items"] > 0 for r in results.values())
+
+
+def test_compare_flags_only_real_regressions():
+    slow = max(_NOISE_FLOOR_SECONDS * 10, 1.0)
+    baseline = {
+        "parse": {"seconds": slow, "items_per_sec": 1000.0},
+        "tiny": {"seconds": _NOISE_FLOOR_SECONDS / 10, "items_per_sec": 1000.0},
+    }
+    assert compare({"parse": {"items_per_sec": 850.0}, "tiny": {"items_per_sec": 10.0}}, baseline, 0.2) == []
+    flagged = compare({"parse": {"items_per_sec": 700.0}}, baseline, 0.2)
+    assert len(flagged) == 1 and flagged[0].startswith("parse:")
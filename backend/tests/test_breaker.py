@@ -0,0 +1,79 @@
+import pytest
+
+from scrapers import breaker as breaker_mod
+from scrapers.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, merge
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(breaker_mod.time, "monotonic", clock)
+    return clock
+
+
+def _breaker() -> CircuitBreaker:
+    return CircuitBreaker("test", window=10, min_calls=4, error_rate=0.5, cooldown=30, max_cooldown=100)
+
+
+def test_opens_at_error_rate_after_min_calls(clock):
+    b = _breaker()
+    for ok in (False, False, False):
+        b.record(ok)
+    assert b.state == CLOSED   # below min_calls
+    b.record(True)
+    assert b.state == OPEN     # 3 of 4 failed
+    assert not b.allow()
+
+
+def test_half_open_lets_one_trial_through(clock):
+    b = _breaker()
+    for _ in range(4):
+        b.record(False)
+    clock.now += 30
+    assert b.allow() and b.state == HALF_OPEN
+    assert not b.allow()       # trial already in flight
+    b.record(True)
+    assert b.state == CLOSED and b.status()["calls"] == 0
+    assert b.allow()
+
+
+def test_failed_trial_reopens_with_doubled_cooldown(clock):
+    b = _breaker()
+    for _ in range(4):
+        b.record(False, "timeout")
+    for expected in (60, 100, 100):
+        clock.now += b.cooldown
+        assert b.allow()
+        b.record(False, "timeout")
+        assert b.state == OPEN and b.cooldown == expected
+    assert b.status()["last_error"] == "timeout"
+    assert b.status()["retry_in_seconds"] == 100
+
+
+def test_success_resets_cooldown(clock):
+    b = _breaker()
+    for _ in range(4):
+        b.record(False)
+    clock.now += 30
+    b.allow()
+    b.record(False)
+    clock.now += 60
+    b.allow()
+    b.record(True)
+    assert b.cooldown == 30
+
+
+def test_merge_keeps_least_healthy():
+    closed = {"state": CLOSED, "calls": 9}
+    half = {"state": HALF_OPEN, "calls": 0}
+    opened = {"state": OPEN, "calls": 4}
+    merged = merge([{"reddit": closed, "youtube": half}, {"reddit": opened}, {"youtube": closed}])
+    assert merged == {"reddit": opened, "youtube": half}
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import history
+import storage
+from storage import SQLiteStorage, rollup_bucket
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+def _mention(i: int, at: datetime, platform: str = "Reddit", score: float = 0.5, priority: str = "NEUTRAL") -> dict:
+    return {
+        "platform": platform,
+        "content": f"LeapScholar post {i}",
+        "sentiment_score": score,
+        "likes": 10,
+        "shares": 0,
+        "comments": 0,
+        "author": "u/someone",
+        "source_url": f"https://example.com/{i}",
+        "priority": priority,
+        "scraped_at": at.isoformat(),
+    }
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    s = SQLiteStorage(str(tmp_path / "history.db"))
+    monkeypatch.setattr(storage, "_storage", s)
+    return s
+
+
+def test_buckets_are_utc():
+    assert rollup_bucket("2026-10-19T05:30:00+05:30", "hour") == "2026-10-19T00:00:00+00:00"
+    assert rollup_bucket("2026-10-18T23:59:00-01:00", "day") == "2026-10-19"
+
+
+def test_rollups_count_each_post_once(store):
+    at = NOW - timedelta(hours=3)
+    store.insert("social_mentions", [_mention(1, at), _mention(2, at, "YouTube", -0.5, "HIGH PRIORITY")])
+    store.insert("social_mentions", [_mention(1, at)])  # re-scraped
+    rows = store.rollups("hour", (NOW - timedelta(days=1)).isoformat(), NOW.isoformat())
+    assert sum(r["mentions"] for r in rows) == 2
+    assert sum(r["engagement_sum"] for r in rows) == 20
+    assert {(r["platform"], r["priority"]) for r in rows} == {("Reddit", "NEUTRAL"), ("YouTube", "HIGH PRIORITY")}
+
+
+def test_sentiment_and_volume_series(store):
+    store.insert("social_mentions", [
+        _mention(1, NOW - timedelta(days=2), score=1.0),
+        _mention(2, NOW - timedelta(days=2), "YouTube", score=0.0),
+        _mention(3, NOW - timedelta(days=1), score=-1.0),
+    ])
+    since, until = (NOW - timedelta(days=3)).isoformat(), NOW.isoformat()
+    series = history.sentiment_series(since, until, "day")
+    assert [(b["mentions"], b["avg_sentiment"], b["net_sentiment"]) for b in series] == [(2, 0.5, 75), (1, -1.0, 0)]
+    assert [b["mentions"] for b in history.sentiment_series(since, until, "day", platform="YouTube")] == [1]
+    volume = history.volume_series(since, until, "day")
+    assert volume[0]["by_platform"] == {"Reddit": 1, "YouTube": 1}
+
+
+def test_week_over_week(store):
+    store.insert("social_mentions", [
+        _mention(1, NOW - timedelta(days=9), score=-0.5),
+        _mention(2, NOW - timedelta(days=2), score=0.5),
+        _mention(3, NOW - timedelta(days=1), score=0.5),
+    ])
+    wow = history.week_over_week(now=NOW)
+    assert wow["current"]["mentions"] == 2 and wow["previous"]["mentions"] == 1
+    assert wow["mentions_change_pct"] == 100.0
+    assert (wow["current"]["net_sentiment"], wow["previous"]["net_sentiment"]) == (75, 25)
+    assert wow["sentiment_change_pct"] == 200.0
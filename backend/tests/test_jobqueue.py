@@ -0,0 +1,128 @@
+import pytest
+
+import pipeline
+from jobqueue import JobQueue
+from scrapers import base
+from scrapers.breaker import get_breaker
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "jobs.db"))
+
+
+@pytest.fixture
+def flaky_source():
+    """A registered source whose fetch fails for jobs marked {"fail": True}."""
+
+    @base.register
+    class FlakySource(base.Source):
+        name = "test_flaky"
+        label = "Flaky"
+        delay = 0
+
+        async def fetch(self, brand, job):
+            if job.get("fail"):
+                raise RuntimeError("upstream 503")
+            yield {
+                "platform": "Reddit",
+                "key": job["query"],
+                "content": f"{brand} counselling was great, very helpful team",
+                "source_url": f"https://example.com/{job['query']}",
+            }
+
+    yield FlakySource
+    base._REGISTRY.pop("test_flaky", None)
+    get_breaker("test_flaky")._outcomes.clear()
+
+
+def test_claim_takes_oldest_job_once(queue):
+    cycle = queue.enqueue_cycle([("reddit", {"query": "a"}), ("reddit", {"query": "b"})])
+    first = queue.claim("w1")
+    second = queue.claim("w2")
+    assert [first["job"], second["job"]] == [{"query": "a"}, {"query": "b"}]
+    assert first["cycle_id"] == cycle and first["attempts"] == 1
+    assert queue.claim("w3") is None
+
+
+def test_expired_lease_is_reclaimed(queue):
+    queue.enqueue_cycle([("reddit", {"query": "a"})])
+    job = queue.claim("dead-worker", lease_seconds=-1)
+    again = queue.claim("w2")
+    assert again["id"] == job["id"]
+    assert again["attempts"] == 2
+
+
+def test_expired_lease_respects_max_attempts(queue):
+    cycle = queue.enqueue_cycle([("reddit", {"query": "poison"}), ("reddit", {"query": "ok"})])
+    for _ in range(2):
+        job = queue.claim("crashing-worker", lease_seconds=-1, max_attempts=2)
+        assert job["job"] == {"query": "poison"}
+    # Its worker died on every attempt: failed, and the next job is handed out
+    job = queue.claim("w2", max_attempts=2)
+    assert job["job"] == {"query": "ok"}
+    queue.complete(job, [])
+    assert queue.source_status(cycle) == {"reddit": {"done": 1, "failed": 1}}
+    assert queue.cycle_finished(cycle)
+
+
+def test_failed_write_rolls_back(queue):
+    queue.enqueue_cycle([("reddit", {"query": "a"})])
+    job = queue.claim("w1")
+    with pytest.raises(TypeError):
+        queue.complete(job, [object()])
+    # The connection isn't left inside the aborted transaction
+    queue.complete(job, [])
+    assert queue.stats() == {"done": 1}
+
+
+def test_fail_requeues_until_max_attempts(queue):
+    cycle = queue.enqueue_cycle([("reddit", {"query": "a"})])
+    for attempt in range(1, 4):
+        job = queue.claim("w1")
+        assert job["attempts"] == attempt
+        queue.fail(job, "boom", max_attempts=3)
+    assert queue.claim("w1") is None
+    assert queue.cycle_status(cycle) == {"failed": 1}
+    assert queue.cycle_finished(cycle)
+
+
+def test_complete_stores_results(queue):
+    cycle = queue.enqueue_cycle([("reddit", {"query": "a"}), ("youtube", {"query": "b"})])
+    queue.complete(queue.claim("w1"), [{"content": "x"}])
+    queue.fail(queue.claim("w1"), "boom", max_attempts=1)
+    assert queue.cycle_results(cycle) == {"reddit": [{"content": "x"}]}
+    assert queue.source_status(cycle) == {"reddit": {"done": 1}, "youtube": {"failed": 1}}
+    queue.mark_published(cycle)
+    assert queue.cycle_results(cycle) == {}
+    assert queue.open_cycle() is None
+
+
+def test_run_job_raises_so_failed_fetches_retry(queue, flaky_source):
+    cycle = queue.enqueue_cycle([("test_flaky", {"query": "ok"}), ("test_flaky", {"query": "bad", "fail": True})])
+    for _ in range(4):
+        job = queue.claim("w1")
+        if job is None:
+            break
+        try:
+            mentions = pipeline.run_job(job["source"], job["job"], "LeapScholar")
+        except pipeline.JobError as e:
+            assert "upstream 503" in str(e)
+            queue.fail(job, str(e), max_attempts=2)
+        else:
+            queue.complete(job, mentions)
+    assert queue.cycle_status(cycle) == {"done": 1, "failed": 1}
+    assert len(queue.cycle_results(cycle)["test_flaky"]) == 1
+
+
+def test_alert_relay_round_trip(queue):
+    queue.offer_alert({"priority": "CRITICAL ALERT", "content": "a"})
+    queue.offer_alert({"priority": "MARKETING GOLD", "content": "b"})
+    assert [m["content"] for m in queue.take_alert_offers()] == ["a", "b"]
+    assert queue.take_alert_offers() == []
+
+    queue.add_alert({"n": 1})
+    queue.add_alert({"n": 2})
+    rows = queue.alerts_since(0)
+    assert [a for _, a in rows] == [{"n": 1}, {"n": 2}]
+    assert queue.alerts_since(rows[-1][0]) == []
@@ -0,0 +1,61 @@
+import pytest
+
+import language
+from sentiment import compute_priority_contextual
+
+
+@pytest.mark.parametrize("text, lang", [
+    ("LeapScholar counselling was helpful and the visa came through on time", "en"),
+    ("bhai unka counselling bahut accha hai sab kuch aasaan tha", "hi-Latn"),
+    ("लीपस्कॉलर की सेवा बहुत अच्छी है", "hi"),
+    ("லீப்ஸ்காலர் சேவை நன்றாக இருந்தது", "ta"),
+    ("ok", "en"),
+])
+def test_detect(text, lang):
+    assert language.detect(text) == lang
+
+
+def test_normalize_brand_in_both_spellings():
+    assert language.normalize_brand("लीप स्कॉलर ने मदद की", "LeapScholar") == "Leap Scholar ने मदद की"
+    assert language.normalize_brand("लीपस्कॉलर अच्छा है", "LeapScholar").startswith("Leap Scholar ")
+    assert language.normalize_brand("Plain English text", "LeapScholar") == "Plain English text"
+
+
+@pytest.mark.parametrize("text, priority", [
+    ("लीपस्कॉलर ने धोखा दिया, यह ठगी है", "CRITICAL ALERT"),
+    ("LeapScholar ne dhokha diya, poora paisa thagi kar liya bhai", "CRITICAL ALERT"),
+    ("yaar inka counsellor bilkul bakwas hai, ghatiya service", "HIGH PRIORITY"),
+    ("लीपस्कॉलर की सेवा अच्छा नहीं है", "HIGH PRIORITY"),
+    ("लीपस्कॉलर की सेवा बहुत अच्छा है", "NEUTRAL"),
+    ("bhai inka course zabardast hai, shandaar mentors", "MARKETING GOLD"),
+])
+def test_hindi_priority_matches_english_scale(text, priority):
+    lang = language.detect(text)
+    score = language.hindi_sentiment(text, lang)
+    assert compute_priority_contextual(score, 0, text) == priority
+
+
+def test_negation_flips_and_softens():
+    plain = language.hindi_sentiment("सेवा अच्छा है", "hi")
+    negated = language.hindi_sentiment("सेवा अच्छा नहीं है", "hi")
+    assert plain > 0 > negated > -plain
+
+
+def test_no_signal_routing():
+    assert language.hindi_sentiment("मैंने कल आवेदन किया", "hi") == 0.0
+    assert language.hindi_sentiment("kal maine form bhara tha", "hi-Latn") is None
+    assert language.hindi_sentiment("லீப்ஸ்காலர் சேவை நன்றாக இருந்தது", "ta") is None
+
+
+def test_analyze_batch_caches_by_content(monkeypatch):
+    monkeypatch.setattr(language, "LANGUAGE_DETECTION", True)
+    calls = []
+    real = language._analyze
+    monkeypatch.setattr(language, "_analyze", lambda t, b: calls.append(t) or real(t, b))
+    texts = ["लीपस्कॉलर ने धोखा दिया", "LeapScholar visa update", "लीपस्कॉलर ने धोखा दिया"]
+    first = language.analyze_batch(texts, "LeapScholar-test-cache")
+    second = language.analyze_batch(texts, "LeapScholar-test-cache")
+    assert first == second
+    assert first[0].lang == "hi" and first[0].sentiment < -0.5
+    assert first[1] == language.Analysis("en", "LeapScholar visa update", None)
+    assert len(calls) == 2
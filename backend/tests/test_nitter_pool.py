@@ -0,0 +1,69 @@
+import pytest
+
+from bench.fixture_server import FixtureServer
+from scrapers import http
+from scrapers.nitter_pool import NitterPool
+
+# Any nitter.* host is served from the fixtures; others answer 404
+GOOD, ALSO_GOOD, DEAD = "https://nitter.one", "https://nitter.two", "https://gone.example"
+
+
+@pytest.fixture
+def server():
+    with FixtureServer() as fx:
+        http.set_url_rewriter(fx.rewrite)
+        try:
+            yield fx
+        finally:
+            http.set_url_rewriter(None)
+
+
+def test_probe_keeps_only_answering_mirrors(server):
+    pool = NitterPool([GOOD, DEAD, ALSO_GOOD], ttl=300)
+    assert set(pool.ranked()) == {GOOD, ALSO_GOOD}
+    assert {h["url"]: h["healthy"] for h in pool.snapshot()} == {GOOD: True, DEAD: False, ALSO_GOOD: True}
+
+
+def test_health_is_cached_until_the_ttl(server):
+    pool = NitterPool([GOOD, ALSO_GOOD], ttl=300)
+    pool.ranked()
+    probes = server.hits
+    for _ in range(5):
+        pool.best()
+    assert server.hits == probes
+
+
+def test_ranking_weighs_latency_by_error_rate():
+    pool = NitterPool(["a", "b", "c"], ttl=300)
+    pool._last_probe = float("inf")  # never stale: rank the recorded outcomes only
+    pool.record("a", True, 0.2)
+    pool.record("b", True, 0.5)
+    pool.record("c", True, 0.3)
+    assert pool.ranked() == ["a", "c", "b"]
+    # A failure slows its score by the error rate
+    pool.record("a", False, 0.0)
+    assert pool.ranked() == ["c", "a", "b"]
+    # Past half the recent requests failing, it's out until it recovers
+    pool.record("a", False, 0.0)
+    assert pool.ranked() == ["c", "b"]
+    pool.record("a", True, 0.2)
+    assert pool.ranked() == ["c", "a", "b"]
+
+
+def test_get_fails_over_from_a_dead_preferred_mirror(server):
+    pool = NitterPool([GOOD, DEAD], ttl=300)
+    pool.ranked()
+    # DEAD looked healthy once; now it fails and the request moves on
+    pool.record(DEAD, True, 0.01)
+    pool.record(DEAD, True, 0.01)
+    pool.record(DEAD, True, 0.01)
+    mirror, resp = pool.get("/search", {"q": "LeapScholar"}, preferred=DEAD)
+    assert mirror == GOOD and resp.status_code == 200
+    failed = next(h for h in pool.snapshot() if h["url"] == DEAD)
+    assert failed["error_rate"] > 0
+
+
+def test_get_raises_when_nothing_is_healthy(server):
+    pool = NitterPool([DEAD], ttl=300)
+    with pytest.raises(RuntimeError):
+        pool.get("/search", {"q": "x"})
@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+import main
+import pipeline
+from scheduler import AdaptiveScheduler
+from scrapers.base import Source
+
+
+class _Fixed(Source):
+    """Yields `n` brand mentions per job, `pause` seconds apart."""
+
+    delay = 0
+
+    def __init__(self, name: str, n: int, pause: float = 0.0, jobs_fail: bool = False):
+        self.name = self.label = name
+        self.n, self.pause, self.jobs_fail = n, pause, jobs_fail
+
+    def jobs(self, brand):
+        if self.jobs_fail:
+            raise RuntimeError("query builder broke")
+        return [{"query": "q"}]
+
+    async def fetch(self, brand, job):
+        for i in range(self.n):
+            if self.pause:
+                await asyncio.sleep(self.pause)
+            yield {
+                "platform": "Reddit",
+                "key": f"{self.name}-{i}",
+                "content": f"{brand} counsellor #{i} was helpful with my visa",
+                "source_url": f"https://example.com/{self.name}/{i}",
+            }
+
+
+def _run(sources, **kwargs) -> tuple[dict[str, list[int]], dict[str, tuple[int, str]]]:
+    sizes: dict[str, list[int]] = {s.name: [] for s in sources}
+    done: dict[str, tuple[int, str]] = {}
+
+    async def consume():
+        on_done = lambda s, count, status: done.__setitem__(s.name, (count, status))
+        async for source, batch in pipeline.stream(sources, "LeapScholar", on_done=on_done, **kwargs):
+            sizes[source.name].append(len(batch))
+
+    asyncio.run(consume())
+    return sizes, done
+
+
+def test_stream_batches_and_reports_each_source():
+    sizes, done = _run([_Fixed("a", 7), _Fixed("b", 3)], deadline=None, batch_size=3)
+    assert sizes == {"a": [3, 3, 1], "b": [3]}
+    assert done == {"a": (7, "fresh"), "b": (3, "fresh")}
+
+
+def test_crashed_source_is_failed_and_others_finish():
+    sizes, done = _run([_Fixed("ok", 2), _Fixed("broken", 2, jobs_fail=True)], deadline=None)
+    assert sum(sizes["ok"]) == 2 and sizes["broken"] == []
+    assert done == {"ok": (2, "fresh"), "broken": (0, "failed")}
+
+
+def test_deadline_cuts_off_slow_source_but_keeps_its_mentions():
+    sizes, done = _run([_Fixed("fast", 3), _Fixed("slow", 50, pause=0.05)], deadline=0.3, batch_size=100)
+    assert done["fast"] == (3, "fresh")
+    count, status = done["slow"]
+    assert status == "stale" and 0 < count < 50
+    assert sum(sizes["slow"]) == count
+
+
+@pytest.fixture
+def written(monkeypatch):
+    rows: list[dict] = []
+    monkeypatch.setattr(main, "upsert_mentions", rows.extend)
+    return rows
+
+
+def test_scheduled_run_streams_only_new_mentions(written):
+    source = _Fixed("sched", 4)
+    scheduler = AdaptiveScheduler([source])
+    sink = main.CycleSink(scheduler, [source])
+    asyncio.run(main._stream_cycle([source], sink))
+    assert sink.count == len(written) == 4
+    first_interval = scheduler.schedules["sched"].interval
+
+    again = main.CycleSink(scheduler, [source])
+    asyncio.run(main._stream_cycle([source], again))
+    assert again.count == 0 and len(written) == 4
+    # Nothing new: the source backs off
+    assert scheduler.schedules["sched"].interval > first_interval
+    assert scheduler.schedules["sched"].last_yield == 0
+
+
+def test_sink_reports_the_status_it_received(capsys):
+    sink = main.CycleSink()
+    sink.source_done(_Fixed("late", 0), 5, "stale")
+    sink.source_done(_Fixed("down", 0), 0, "failed")
+    out = capsys.readouterr().out
+    assert "⏱ late: 5 mentions (stale)" in out
+    assert "✗ down: 0 mentions (failed)" in out
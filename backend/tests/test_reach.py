@@ -0,0 +1,91 @@
+import math
+import random
+
+import pytest
+
+from aggregator import compute_dashboard_metrics
+from reach import ReachModel, TDigest
+
+
+@pytest.fixture
+def samples():
+    rng = random.Random(3)
+    # Heavy-tailed like real engagement counts
+    return [math.log1p(rng.paretovariate(1.2) * 10) for _ in range(20_000)]
+
+
+def test_quantiles_close_to_exact(samples):
+    d = TDigest()
+    for x in samples:
+        d.add(x)
+    exact = sorted(samples)
+    for q in (0.01, 0.1, 0.5, 0.9, 0.99, 0.999):
+        # Compare in rank space: the digest is most precise in the tails
+        rank = sum(x <= d.quantile(q) for x in exact) / len(exact)
+        assert rank == pytest.approx(q, abs=0.01 if q in (0.1, 0.5, 0.9) else 0.005)
+    assert len(d.means) < 500
+
+
+def test_cdf_matches_ranks(samples):
+    d = TDigest()
+    for x in samples:
+        d.add(x)
+    exact = sorted(samples)
+    for x in (exact[200], exact[10_000], exact[19_800]):
+        assert d.cdf(x) == pytest.approx(sum(v <= x for v in exact) / len(exact), abs=0.01)
+    assert d.cdf(exact[0] - 1) == 0.0
+    assert d.cdf(exact[-1] + 1) == 1.0
+
+
+def test_scale_keeps_shape(samples):
+    d = TDigest()
+    for x in samples:
+        d.add(x)
+    before = d.quantile(0.9)
+    d.scale(0.25)
+    assert d.total == pytest.approx(len(samples) * 0.25)
+    assert d.quantile(0.9) == pytest.approx(before)
+
+
+def test_round_trip(samples):
+    d = TDigest()
+    for x in samples[:2000]:
+        d.add(x)
+    copy = TDigest.from_dict(d.to_dict())
+    assert copy.total == pytest.approx(d.total, rel=1e-6)
+    assert copy.quantile(0.5) == pytest.approx(d.quantile(0.5), rel=1e-4)
+
+
+def test_model_observes_each_mention_once(tmp_path):
+    path = str(tmp_path / "reach.json")
+    model = ReachModel(path, half_life_hours=0, min_samples=3)
+    mentions = [
+        {"platform": "Reddit", "source_url": f"https://reddit.com/{i}", "likes": i, "content": "x"}
+        for i in range(10)
+    ]
+    assert model.observe(mentions) == 10
+    assert model.observe(mentions) == 0
+    assert model.percentile("YouTube", 5) is None
+    model.save()
+
+    reader = ReachModel(path, half_life_hours=0, min_samples=3)
+    assert reader.percentile("Reddit", 0) < 0.2 < 0.8 < reader.percentile("Reddit", 9)
+
+
+def test_mark_seen_skips_mentions_a_restart_reloads(tmp_path):
+    path = str(tmp_path / "reach.json")
+    mentions = [{"platform": "Reddit", "source_url": f"https://reddit.com/{i}", "likes": i} for i in range(10)]
+    before = ReachModel(path, half_life_hours=0)
+    before.observe(mentions)
+    before.save()
+
+    restarted = ReachModel(path, half_life_hours=0)
+    restarted.mark_seen(mentions)
+    assert restarted.observe(mentions + [{"platform": "Reddit", "source_url": "https://reddit.com/new"}]) == 1
+    assert restarted.digests["Reddit"].total == pytest.approx(11)
+
+
+def test_avg_engagement_is_the_median_not_the_viral_outlier():
+    mentions = [{"platform": "YouTube", "sentiment_score": 0.0, "likes": 40} for _ in range(9)]
+    mentions.append({"platform": "YouTube", "sentiment_score": 0.0, "likes": 2_000_000})
+    assert compute_dashboard_metrics(mentions)["avg_engagement"] == 0.04
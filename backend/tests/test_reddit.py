@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+import pipeline
+from bench.fixture_server import FixtureServer
+from scrapers import http, reddit_scraper
+from scrapers.breaker import get_breaker
+from scrapers.reddit_scraper import RedditSource
+
+
+@pytest.fixture
+def requests_made(monkeypatch):
+    """Expand comments against the fixtures, logging each comment request's URL."""
+    monkeypatch.setattr(reddit_scraper, "REDDIT_EXPAND_COMMENTS", True)
+    monkeypatch.setattr(reddit_scraper, "REDDIT_COMMENT_BUDGET", 3)
+    reddit_scraper._cursors.clear()
+    reddit_scraper._budgets.clear()
+    made: list[str] = []
+    real = http.aget
+
+    async def aget(url, params=None, timeout=15):
+        if "/comments/" in url or "morechildren" in url:
+            made.append(url)
+        return await real(url, params=params, timeout=timeout)
+
+    monkeypatch.setattr(http, "aget", aget)
+    with FixtureServer() as server:
+        http.set_url_rewriter(server.rewrite)
+        try:
+            yield made
+        finally:
+            http.set_url_rewriter(None)
+            get_breaker("reddit")._outcomes.clear()
+
+
+def _cycle() -> list[dict]:
+    source = RedditSource()
+    source.delay = 0.0
+    return asyncio.run(pipeline.collect(source, "LeapScholar"))
+
+
+def test_jobs_share_one_budget_per_cycle(requests_made):
+    jobs = RedditSource().jobs("LeapScholar")
+    assert len(jobs) > 10
+    assert {j["comment_budget"] for j in jobs} == {3}
+    assert len({j["comment_cycle"] for j in jobs}) == 1
+
+
+def test_budget_spent_on_busiest_threads_across_jobs(requests_made):
+    mentions = _cycle()
+    # The whole budget goes out, busiest thread first, however many jobs there are
+    assert [u.rsplit("/", 1)[-1] for u in requests_made] == ["abc106.json", "abc102.json", "abc101.json"]
+    assert any(m["content"].startswith("LeapScholar counsellor stopped replying") for m in mentions)
+
+
+def test_next_cycle_resumes_where_the_budget_ran_out(requests_made):
+    _cycle()
+    first = len(requests_made)
+    _cycle()
+    second = requests_made[first:]
+    # Stubs of the threads already read go first, then threads not read yet
+    assert len(second) == 3
+    assert sum("morechildren" in u for u in second) == 3 - sum("/comments/" in u for u in second)
+    assert not any(u.endswith(("abc106.json", "abc102.json", "abc101.json")) for u in second)
+
+
+def test_comment_tree_walk_skips_seen_and_deleted():
+    cursor = reddit_scraper._ThreadCursor()
+    tree = [
+        {"kind": "t1", "data": {"id": "a", "name": "t1_a", "body": "LeapScholar replied within a day, great", "replies": {
+            "data": {"children": [
+                {"kind": "t1", "data": {"id": "b", "name": "t1_b", "body": "[deleted]"}},
+                {"kind": "more", "data": {"children": ["c", "d"]}},
+            ]},
+        }}},
+    ]
+    items, more = reddit_scraper._walk_comments(tree, cursor, relevant=True)
+    assert [i["key"] for i in items] == ["t1_a"] and items[0]["relevant"]
+    assert more == ["c", "d"]
+    assert reddit_scraper._walk_comments(tree, cursor) == ([], ["c", "d"])
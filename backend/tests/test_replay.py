@@ -0,0 +1,61 @@
+import gzip
+import json
+
+import pytest
+import requests
+
+from scrapers.replay import Recorder, Replayer
+
+
+def _response(body: bytes, status: int = 200, content_type: str = "application/json") -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = status
+    resp._content = body
+    resp.headers["Content-Type"] = content_type
+    return resp
+
+
+@pytest.fixture
+def archive(tmp_path):
+    path = str(tmp_path / "cycle.jsonl.gz")
+    with Recorder(path) as rec:
+        rec.record("https://www.reddit.com/search.json", {"q": "a", "limit": 5}, _response(b'{"n": 1}'), 0.0, 0.2)
+        rec.record("https://www.reddit.com/search.json", {"limit": 5, "q": "a"}, _response(b'{"n": 2}'), 0.1, 0.2)
+        rec.record("https://nitter.one/search", {"q": "a"}, _response(b"<html>", 429, "text/html"), 0.2, 0.1)
+    return path
+
+
+def test_round_trip_in_recorded_order(archive):
+    rp = Replayer(archive, speed=0)
+    assert len(rp) == 3
+    # Param order doesn't matter; exchanges for one URL come back in order, then wrap
+    bodies = [rp.get("https://www.reddit.com/search.json", {"q": "a", "limit": 5}).json()["n"] for _ in range(3)]
+    assert bodies == [1, 2, 1]
+
+
+def test_status_and_content_type_survive(archive):
+    resp = Replayer(archive, speed=0).get("https://nitter.one/search", {"q": "a"})
+    assert resp.status_code == 429 and resp.reason == "Too Many Requests"
+    assert resp.headers["Content-Type"] == "text/html"
+    assert resp.content == b"<html>"
+
+
+def test_falls_back_to_another_mirror(archive):
+    rp = Replayer(archive, speed=0)
+    assert rp.get("https://nitter.two/search", {"q": "a"}).content == b"<html>"
+    assert rp.stats()["misses"] == 0
+
+
+def test_unrecorded_url_raises_connection_error(archive):
+    rp = Replayer(archive, speed=0)
+    with pytest.raises(requests.ConnectionError):
+        rp.get("https://www.youtube.com/results", {"search_query": "x"})
+    assert rp.stats()["misses"] == 1
+
+
+def test_rejects_other_formats(tmp_path):
+    path = str(tmp_path / "other.jsonl.gz")
+    with gzip.open(path, "wt") as f:
+        f.write(json.dumps({"format": "leappulse-http", "version": 99}) + "\n")
+    with pytest.raises(ValueError):
+        Replayer(path)
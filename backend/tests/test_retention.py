@@ -0,0 +1,112 @@
+import json
+import time
+from collections import Counter
+from datetime import datetime
+
+import pytest
+
+from aggregator import (
+    compute_dashboard_metrics,
+    compute_platform_breakdown,
+    compute_sentiment_distribution,
+    mention_topics,
+    sentiment_label,
+)
+from bench.corpus import generate
+from retention import RetentionStore, SegmentArchive
+
+
+def _mentions(n: int, start: float) -> list[dict]:
+    out = []
+    for i, raw in enumerate(generate(n, seed=7)):
+        out.append({
+            **raw,
+            "sentiment_score": round(((i * 37) % 200 - 100) / 100, 2),
+            "created_at": datetime.fromtimestamp(start + i * 60).isoformat(),
+        })
+    return out
+
+
+def _assert_consistent(store: RetentionStore) -> None:
+    """Running counts equal a rescan of what the store still holds."""
+    kept = store.mentions()
+    assert store.sentiments == Counter(sentiment_label(m["sentiment_score"]) for m in kept)
+    assert store.platforms == Counter(m["platform"] for m in kept)
+    assert store.topics == Counter(t for m in kept for t in mention_topics(m))
+    assert store.sentiment_sum == pytest.approx(sum(m["sentiment_score"] for m in kept))
+    assert store.bytes == sum(len(json.dumps(m, default=str)) for m in kept)
+
+    agg = store.aggregates()
+    assert agg["dashboard_metrics"] == compute_dashboard_metrics(kept)
+    assert sorted(agg["sentiment_distribution"], key=lambda d: d["label"]) == sorted(
+        compute_sentiment_distribution(kept), key=lambda d: d["label"]
+    )
+    assert sorted(agg["platform_breakdown"], key=lambda d: d["platform"]) == sorted(
+        compute_platform_breakdown(kept), key=lambda d: d["platform"]
+    )
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return SegmentArchive(str(tmp_path / "archive"))
+
+
+def test_item_budget_evicts_oldest_and_archives(archive):
+    store = RetentionStore(window_hours=0, max_items=50, max_bytes=10**9, archive=archive)
+    mentions = _mentions(120, time.time() - 3600)
+    evicted = store.add(mentions)
+    assert evicted == 70 and len(store) == 50
+    assert store.mentions()[-1] is mentions[70]
+    _assert_consistent(store)
+    assert len(archive.query()) == 70
+
+
+def test_window_eviction(archive):
+    now = time.time()
+    store = RetentionStore(window_hours=1, max_items=10**6, max_bytes=10**9, archive=archive)
+    store.add(_mentions(100, now - 100 * 60), now=now)
+    # Created one minute apart, ending now: only the last hour stays
+    assert 59 <= len(store) <= 61
+    _assert_consistent(store)
+
+
+def test_byte_budget(archive):
+    mentions = _mentions(40, time.time() - 3600)
+    budget = sum(len(json.dumps(m, default=str)) for m in mentions[-10:])
+    store = RetentionStore(window_hours=0, max_items=10**6, max_bytes=budget, archive=archive)
+    store.add(mentions)
+    assert store.bytes <= budget and len(store) == 10
+    _assert_consistent(store)
+
+
+def test_repeat_replaces_stored_copy(archive):
+    store = RetentionStore(window_hours=0, max_items=100, max_bytes=10**9, archive=archive)
+    mentions = _mentions(20, time.time() - 3600)
+    store.add(mentions)
+    rescored = [{**m, "sentiment_score": -m["sentiment_score"], "likes": m["likes"] + 10} for m in mentions[:5]]
+    store.add(rescored)
+    assert len(store) == 20
+    # Replaced in place: first-seen order (oldest at the end) is kept
+    assert store.mentions()[-5:] == list(reversed(rescored))
+    assert store.mentions()[-1] is rescored[0]
+    _assert_consistent(store)
+
+
+def test_rescraped_post_keeps_first_sighting_and_ages_out(archive):
+    store = RetentionStore(window_hours=1, max_items=100, max_bytes=10**9, archive=archive)
+    start = time.time() - 3000
+    post = {**_mentions(1, start)[0], "id": "live-1", "likes": 3}
+    other = _mentions(2, start + 600)[1]
+    store.add([post, other], now=start + 600)
+    # Every cycle re-scrapes it with a fresh id, created_at and engagement
+    for minutes in (20, 40, 55):
+        again = {**post, "id": f"live-{minutes}", "likes": 3 + minutes,
+                 "created_at": datetime.fromtimestamp(start + minutes * 60).isoformat()}
+        store.add([again], now=start + minutes * 60)
+    kept = store.mentions()
+    assert kept[-1]["id"] == "live-1" and kept[-1]["created_at"] == post["created_at"]
+    assert kept[-1]["likes"] == 58
+    _assert_consistent(store)
+    # An hour after it was first seen it leaves, however often it was re-scraped
+    assert store.add([], now=start + 3700) == 1
+    assert [m["source_url"] for m in store.mentions()] == [other["source_url"]]
@@ -0,0 +1,71 @@
+import time
+
+import pytest
+
+import alerts
+import reach
+import retention
+import scheduler
+import storage
+import trends
+from keys import mention_key
+from scheduler import AdaptiveScheduler
+from scrapers.base import Source
+
+
+class _Src(Source):
+    def __init__(self, name: str, interval: int = 10, lo: int = 5, hi: int = 40):
+        self.name = self.label = name
+        self.interval_minutes, self.min_interval_minutes, self.max_interval_minutes = interval, lo, hi
+
+
+def _m(i: int, priority: str = "NEUTRAL") -> dict:
+    return {"platform": "Reddit", "source_url": f"https://reddit.com/{i}", "content": "x", "priority": priority}
+
+
+@pytest.fixture(autouse=True)
+def no_jitter(monkeypatch):
+    monkeypatch.setattr(scheduler, "SCHEDULE_JITTER", 0)
+
+
+def test_mention_key_prefers_url_then_content():
+    assert mention_key({"platform": "Reddit", "source_url": "u", "content": "a"}) == "Reddit|u"
+    assert mention_key({"platform": "Twitter", "content": "y" * 200}) == "Twitter|" + "y" * 120
+    # The one key everything dedupes on: a scheduler repeat is an alert / reach repeat too
+    assert all(mod.mention_key is mention_key for mod in (alerts, reach, retention, scheduler, storage, trends))
+
+
+def test_new_mentions_speed_up_and_repeats_back_off():
+    src = _Src("a")
+    s = AdaptiveScheduler([src])
+    assert s.due() == [src]
+    assert len(s.record(src, [_m(1), _m(2)])) == 2
+    assert s.schedules["a"].interval == pytest.approx(7.5 * 60)
+    assert s.record(src, [_m(1), _m(2)]) == []
+    assert s.schedules["a"].interval == pytest.approx(11.25 * 60)
+    for _ in range(10):
+        s.record(src, [])
+    assert s.schedules["a"].interval == 40 * 60
+    assert s.due() == []
+    assert 39 * 60 < s.seconds_until_next() <= 40 * 60
+
+
+def test_streamed_batches_count_as_one_run():
+    src = _Src("a")
+    s = AdaptiveScheduler([src])
+    assert len(s.observe(src, [_m(1), _m(2)])) == 2
+    assert len(s.observe(src, [_m(2), _m(3)])) == 1
+    assert s.finish(src) == 3
+    assert s.schedules["a"].last_yield == 3
+    assert s.finish(src) == 0
+
+
+def test_critical_alert_pulls_every_source_to_its_floor():
+    busy, quiet = _Src("busy"), _Src("quiet", interval=60, lo=15, hi=120)
+    s = AdaptiveScheduler([busy, quiet])
+    s.record(quiet, [])
+    assert s.schedules["quiet"].next_run > time.time() + 60 * 60
+    s.record(busy, [_m(1, "CRITICAL ALERT")])
+    assert s.in_crisis
+    assert s.schedules["quiet"].next_run <= time.time() + 15 * 60
+    assert s.schedules["busy"].next_run <= time.time() + 5 * 60
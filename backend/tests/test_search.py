@@ -0,0 +1,56 @@
+import pytest
+
+from search import SearchIndex, to_fts_query
+
+
+def _m(i: int, content: str, platform: str = "Reddit", priority: str = "NEUTRAL", likes: int = 0) -> dict:
+    return {
+        "platform": platform,
+        "content": content,
+        "author": f"u/user{i}",
+        "likes": likes,
+        "source_url": f"https://example.com/{i}",
+        "priority": priority,
+    }
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = SearchIndex(str(tmp_path / "search.db"))
+    idx.add([
+        _m(1, "LeapScholar visa delay for three weeks, counsellor silent"),
+        _m(2, "The delay in my visa appointment was not their fault", "Twitter"),
+        _m(3, "Counselling session with LeapScholar was helpful", "YouTube", "MARKETING GOLD"),
+        _m(4, "Visa approved, no delay at all", "Reddit", "NEUTRAL", likes=5000),
+    ])
+    return idx
+
+
+def _urls(result: dict) -> list[str]:
+    return [r["source_url"].rsplit("/", 1)[-1] for r in result["results"]]
+
+
+def test_query_syntax_is_sanitised():
+    assert to_fts_query('visa "hidden fees" counsel*') == '"visa" "hidden fees" "counsel"*'
+    assert to_fts_query('NEAR( OR -) "unterminated') == '"NEAR(" "OR" "-)" "unterminated"'
+    assert to_fts_query('  "" * ') == ""
+
+
+def test_words_phrases_and_prefixes(index):
+    assert set(_urls(index.search("visa delay"))) == {"1", "2", "4"}
+    assert _urls(index.search('"visa delay"')) == ["1"]
+    assert set(_urls(index.search("counsel*"))) == {"1", "3"}
+    assert index.search("   ")["results"] == []
+
+
+def test_filters_and_engagement_boost(index):
+    assert _urls(index.search("visa", platform="Twitter")) == ["2"]
+    assert _urls(index.search("leapscholar", priority="MARKETING GOLD")) == ["3"]
+    # Equal text relevance, so the post with engagement ranks first
+    assert _urls(index.search("visa delay"))[0] == "4"
+    assert "<mark>" in index.search("silent")["results"][0]["snippet"]
+
+
+def test_rescraped_posts_are_indexed_once(index):
+    assert index.add([_m(1, "LeapScholar visa delay for three weeks, counsellor silent")]) == 0
+    assert index.count() == 4
@@ -0,0 +1,53 @@
+import pytest
+
+import sentiment
+from sentiment import cascade_sentiment, compute_priority_contextual, lexicon_sentiment, textblob_sentiment
+
+COMPLAINTS = [
+    "LeapScholar is the worst company I have dealt with",
+    "counsellor was rude and useless, horrible experience",
+    "LeapScholar hidden fees were never mentioned, feels misleading",
+    "Still no response from LeapScholar support after three weeks, so frustrated",
+    "Terrible counselling, they delayed my application and missed the deadline",
+    "Poor guidance from Leap Scholar, I would avoid them",
+    "Very disappointing service, complete waste of money",
+    "LeapScholar is a scam, they took my fee and vanished",
+]
+PRAISE = [
+    "amazing, superb, brilliant team",
+    "LeapScholar helped me get into my dream university, thank you!",
+    "Excellent counsellors, the whole process was seamless",
+    "I love how smooth the visa process was with LeapScholar",
+    "Best decision I made was going with Leap Scholar",
+    "Got admitted to UBC, highly recommend LeapScholar",
+    "The LeapScholar counsellor was helpful",
+    "Would recommend their IELTS classes, the mock tests were helpful",
+]
+
+
+@pytest.fixture(autouse=True)
+def cascade_on(monkeypatch):
+    monkeypatch.setattr(sentiment, "SENTIMENT_CASCADE", True)
+
+
+@pytest.mark.parametrize("text", COMPLAINTS + PRAISE)
+@pytest.mark.parametrize("likes", [0, 100])
+def test_cascade_keeps_full_scorer_priority(text, likes):
+    full = compute_priority_contextual(textblob_sentiment(text), likes, text)
+    cascaded = compute_priority_contextual(cascade_sentiment(text, likes), likes, text)
+    assert cascaded == full
+
+
+@pytest.mark.parametrize("text", COMPLAINTS)
+def test_complaints_always_escalate(text):
+    assert lexicon_sentiment(text) is None
+
+
+def test_mild_praise_settles_below_priority_thresholds():
+    score = lexicon_sentiment("The LeapScholar counsellor was helpful")
+    assert score is not None and 0.15 < score < 0.2
+
+
+def test_cascade_off_escalates_everything(monkeypatch):
+    monkeypatch.setattr(sentiment, "SENTIMENT_CASCADE", False)
+    assert lexicon_sentiment("The LeapScholar counsellor was helpful") is None
@@ -0,0 +1,33 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import profiling
+import server
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling, "PROFILE_MODE", "sample")
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+    # No context manager: the lifespan (leader election, warm-up) doesn't run
+    return TestClient(server.app)
+
+
+def test_profile_hidden_while_profiling_is_off(client, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_MODE", "off")
+    assert client.get("/api/admin/profile").status_code == 404
+
+
+def test_profile_refused_without_admin_token(client, monkeypatch):
+    monkeypatch.setattr(server, "ADMIN_TOKEN", "")
+    resp = client.get("/api/admin/profile", headers={"Origin": "https://evil.example"})
+    assert resp.status_code == 403
+    assert client.get("/api/admin/profile?raw=true").status_code == 403
+
+
+def test_profile_needs_the_token_once_set(client, monkeypatch):
+    monkeypatch.setattr(server, "ADMIN_TOKEN", "s3cret")
+    assert client.get("/api/admin/profile").status_code == 401
+    assert client.get("/api/admin/profile", headers={"X-Admin-Token": "wrong"}).status_code == 401
+    resp = client.get("/api/admin/profile", headers={"X-Admin-Token": "s3cret"})
+    assert resp.status_code == 200 and resp.json()["mode"] == "sample"
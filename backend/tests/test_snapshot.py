@@ -0,0 +1,55 @@
+import struct
+
+import snapshot
+from snapshot import SNAPSHOT_KEYS, SnapshotStore, decode_snapshot, encode_snapshot
+
+
+def _payload() -> dict:
+    payload = {key: [] for key in SNAPSHOT_KEYS}
+    payload["mentions"] = [
+        {"platform": "Reddit", "content": "LeapScholar review — ñ, हिंदी", "sentiment_score": 0.42, "likes": 3},
+    ]
+    payload["dashboard_metrics"] = {"net_sentiment": 71, "total_mentions": 1}
+    payload["source_freshness"] = {"reddit": {"status": "fresh", "count": 1}}
+    return payload
+
+
+def test_round_trip():
+    assert decode_snapshot(encode_snapshot(_payload())) == _payload()
+
+
+def test_decodes_from_memoryview():
+    assert decode_snapshot(memoryview(encode_snapshot(_payload()))) == _payload()
+
+
+def test_schema_version_mismatch_is_ignored(monkeypatch):
+    old = encode_snapshot(_payload())
+    monkeypatch.setattr(snapshot, "SNAPSHOT_SCHEMA_VERSION", snapshot.SNAPSHOT_SCHEMA_VERSION + 1)
+    assert decode_snapshot(old) is None
+
+
+def test_corrupt_buffers_are_ignored():
+    buf = encode_snapshot(_payload())
+    assert decode_snapshot(buf[:10]) is None                 # shorter than the header
+    assert decode_snapshot(buf[:-5]) is None                 # truncated body
+    assert decode_snapshot(b"XXXXXX" + buf[6:]) is None      # wrong magic
+
+
+def test_unknown_codec_is_ignored():
+    buf = bytearray(encode_snapshot(_payload()))
+    struct.pack_into("c", buf, 8, b"z")
+    assert decode_snapshot(bytes(buf)) is None
+
+
+def test_missing_keys_are_ignored():
+    payload = _payload()
+    del payload["weekly_trend"]
+    assert decode_snapshot(encode_snapshot(payload)) is None
+
+
+def test_store_publish_and_reload(tmp_path):
+    path = str(tmp_path / "snap.bin")
+    writer, reader = SnapshotStore(path), SnapshotStore(path)
+    writer.publish(_payload())
+    assert reader.load_if_changed() == _payload()
+    assert reader.load_if_changed() is None   # unchanged file
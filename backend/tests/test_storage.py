@@ -0,0 +1,78 @@
+import sqlite3
+
+import pytest
+
+from storage import SQLiteStorage
+
+
+def _mention(i: int, platform: str = "Reddit", priority: str = "NEUTRAL", scraped_at: str | None = None) -> dict:
+    m = {
+        "platform": platform,
+        "content": f"LeapScholar post {i}",
+        "sentiment_score": 0.5,
+        "likes": i,
+        "shares": 0,
+        "comments": 1,
+        "author": "u/someone",
+        "source_url": f"https://example.com/{platform}/{i}",
+        "priority": priority,
+    }
+    if scraped_at:
+        m["scraped_at"] = scraped_at
+    return m
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SQLiteStorage(str(tmp_path / "leappulse.db"))
+
+
+def test_rescraped_mentions_are_ignored(store):
+    store.insert("social_mentions", [_mention(1), _mention(2)])
+    store.insert("social_mentions", [{**_mention(1), "likes": 99}, _mention(3)])
+    rows = store.recent_mentions()
+    assert sorted(r["source_url"] for r in rows) == [f"https://example.com/Reddit/{i}" for i in (1, 2, 3)]
+    assert next(r for r in rows if r["source_url"].endswith("/1"))["likes"] == 1
+
+
+def test_recent_mentions_filters_and_orders(store):
+    store.insert("social_mentions", [
+        _mention(1, "Reddit", "CRITICAL ALERT", "2026-10-01T10:00:00+00:00"),
+        _mention(2, "YouTube", "NEUTRAL", "2026-10-02T10:00:00+00:00"),
+        _mention(3, "Reddit", "NEUTRAL", "2026-10-03T10:00:00+00:00"),
+    ])
+    assert [r["likes"] for r in store.recent_mentions()] == [3, 2, 1]
+    assert [r["likes"] for r in store.recent_mentions(platform="Reddit")] == [3, 1]
+    assert [r["likes"] for r in store.recent_mentions(priority="CRITICAL ALERT")] == [1]
+    assert [r["likes"] for r in store.recent_mentions(since="2026-10-02T00:00:00+00:00", limit=1)] == [3]
+
+
+def test_latest_returns_only_the_newest_snapshot(store):
+    store.insert("trending_topics", [{"tag": "#old", "mentions": 1, "trend": "up", "recorded_at": "2026-10-01T00:00:00+00:00"}])
+    store.insert("trending_topics", [
+        {"tag": "#visa", "mentions": 4, "trend": "up", "recorded_at": "2026-10-02T00:00:00+00:00"},
+        {"tag": "#ielts", "mentions": 2, "trend": "stable", "recorded_at": "2026-10-02T00:00:00+00:00"},
+    ])
+    assert sorted(r["tag"] for r in store.latest("trending_topics")) == ["#ielts", "#visa"]
+
+
+def test_legacy_database_is_deduplicated_on_open(tmp_path):
+    path = str(tmp_path / "old.db")
+    SQLiteStorage(path)
+    conn = sqlite3.connect(path)
+    # A database from before mention_key: the same post stored twice
+    conn.execute("DROP INDEX idx_mentions_key")
+    for i, when in enumerate(("2026-10-01T00:00:00+00:00", "2026-10-02T00:00:00+00:00")):
+        conn.execute(
+            "INSERT INTO social_mentions (id, platform, content, source_url, scraped_at, created_at) "
+            "VALUES (?, 'Reddit', 'LeapScholar post', 'https://example.com/x', ?, ?)",
+            (f"row{i}", when, when),
+        )
+    conn.commit()
+    conn.close()
+
+    store = SQLiteStorage(path)
+    rows = store.recent_mentions()
+    assert [r["id"] for r in rows] == ["row0"]
+    assert rows[0]["mention_key"] == "Reddit|https://example.com/x"
+    assert sum(r["mentions"] for r in store.rollups("day", "2026-09-30T00:00:00+00:00", "2026-10-03T00:00:00+00:00")) == 1
@@ -0,0 +1,63 @@
+import time
+from datetime import datetime
+
+from trends import BurstDetector, mention_terms
+
+
+def _mention(i: int, content: str, at: float) -> dict:
+    return {
+        "platform": "Reddit",
+        "content": content,
+        "source_url": f"https://reddit.com/{i}",
+        "created_at": datetime.fromtimestamp(at).isoformat(),
+    }
+
+
+_BASELINE = [
+    "LeapScholar counsellor helped with my visa file",
+    "Loan process with LeapScholar took two weeks",
+    "Anyone used LeapScholar for Canada admissions",
+    "LeapScholar IELTS classes on weekends",
+]
+
+
+def _history(now: float) -> list[dict]:
+    """Three quiet days of assorted posts, then a burst about a GRE waiver."""
+    out = [
+        _mention(i, _BASELINE[i % len(_BASELINE)], now - 3 * 86400 + i * 1800)
+        for i in range(144)
+    ]
+    out += [
+        _mention(1000 + i, "LeapScholar says GRE waiver for fall intake #grewaiver", now - 3600 + i * 60)
+        for i in range(20)
+    ]
+    return out
+
+
+def test_burst_ranks_first():
+    now = time.time()
+    d = BurstDetector(short_half_life_hours=2, long_half_life_hours=48, min_count=2, burst_ratio=2)
+    d.observe(_history(now), now=now)
+    top = d.top(5, now=now)
+    assert top[0]["trend"] == "up"
+    assert "gre" in top[0]["tag"] or "waiver" in top[0]["tag"]
+
+
+def test_reobserving_does_not_inflate_counts():
+    now = time.time()
+    history = _history(now)
+    once = BurstDetector(short_half_life_hours=2, long_half_life_hours=48, min_count=2, burst_ratio=2)
+    once.observe(history, now=now)
+    twice = BurstDetector(short_half_life_hours=2, long_half_life_hours=48, min_count=2, burst_ratio=2)
+    twice.observe(history, now=now)
+    twice.observe(history, now=now)
+    assert twice.mentions == once.mentions == len(history)
+    assert twice.top(5, now=now) == once.top(5, now=now)
+
+
+def test_terms_skip_brand_and_filler():
+    explicit, derived = mention_terms({"content": "LeapScholar tips thread: best GRE waiver #StudyAbroad"})
+    assert "#studyabroad" in explicit
+    assert "leapscholar" not in derived
+    assert "#grewaiver" in derived
+    assert not any(w in term for term in derived for w in ("tips", "thread", "best"))
@@ -0,0 +1,341 @@
+"""
+LeapPulse — Trending-topic burst detection
+Finds what people are suddenly talking about, without a fixed keyword
+list and in bounded memory however many mentions flow through:
+
+  - Every mention contributes its hashtags, domain topics (see
+    aggregator.mention_topics) and word uni/bigrams as candidate terms,
+    once: re-scrapes of a post already seen are skipped, and stopwords
+    and post filler ("tips post") never become terms.
+  - Two count-min sketches count every term with exponential decay: a
+    short window (TRENDS_SHORT_HALF_LIFE_HOURS) and a long baseline
+    (TRENDS_LONG_HALF_LIFE_HOURS).
+  - A space-saving summary keeps the TRENDS_CAPACITY heaviest terms of
+    the short window, which are the only candidates ranked.
+
+A term's burst is its share of the short window over its share of the
+long one. Bursting topics rank first, then the rest by recent volume
+weighted by burst; each is labelled up / stable / down from the ratio.
+"""
+
+import hashlib
+import heapq
+import re
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from datetime import datetime
+
+from aggregator import _TAG_ALIASES, mention_topics
+from config import (
+    BRAND_NAME,
+    TRENDS_BURST_RATIO,
+    TRENDS_CAPACITY,
+    TRENDS_LONG_HALF_LIFE_HOURS,
+    TRENDS_MIN_COUNT,
+    TRENDS_SHORT_HALF_LIFE_HOURS,
+    get_search_queries,
+)
+from keys import mention_key
+from metrics import timed
+
+_WORD_RE = re.compile(r"[a-z][a-z0-9']{2,}")
+_URL_RE = re.compile(r"https?://\S+|www\.\S+|[@#]\w+")
+
+_STOPWORDS = frozenset("""
+a about above after again against all also am an and any are aren't as at be because been
+before being below between both but by can can't cannot could couldn't did didn't do does
+doesn't doing don't down during each even ever every few for from further get got had
+hadn't has hasn't have haven't having he her here hers herself him himself his how i i'm
+i've if in into is isn't it it's its itself just know let's like made make many me more
+most much must my myself need never no nor not now of off on once one only or other our
+ours ourselves out over own really same say said see she should shouldn't so some still
+such than that that's the their theirs them themselves then there there's these they
+they're this those through to too under until up us very via was wasn't way we we're
+we've well were weren't what what's when where which while who whom why will with won't
+would wouldn't yes yet you you're you've your yours yourself yourselves anyone anything
+someone something going want wants think thing things time lot guys one's also amp
+""".split())
+
+# Words about the post rather than its subject ("tips post", "thoughts on
+# …", "part 2"): never a topic, and they make any bigram around them junk
+_FILLER = frozenset("""
+post posts thread threads part thoughts tips tip update updates question questions
+share shared sharing check experience story video link comment comments reply replies
+edit pls please anyone guide list read help today week day new best good
+""".split())
+
+# Mention keys remembered so a re-scraped post is only counted once
+_MAX_SEEN = 100_000
+
+
+def _brand_words() -> frozenset[str]:
+    words: set[str] = set()
+    for q in get_search_queries(BRAND_NAME):
+        words.update(q.lower().split())
+        words.add(q.lower().replace(" ", ""))
+    return frozenset(words)
+
+
+_BRAND_WORDS = _brand_words()
+
+
+def _as_tag(term: str) -> str:
+    tag = term if term.startswith("#") else "#" + term.replace(" ", "")
+    return _TAG_ALIASES.get(tag, tag)
+
+
+def mention_terms(m: dict) -> tuple[set[str], set[str]]:
+    """
+    Candidate topic tags in one mention, each counted once: (explicit
+    hashtags and domain topics, tags derived from word uni/bigrams).
+    """
+    explicit = set(mention_topics(m))
+    terms: set[str] = set()
+    text = _URL_RE.sub(" ", m.get("content", "").lower())
+    words = [w.strip("'") for w in _WORD_RE.findall(text)]
+    keep = [w not in _STOPWORDS and w not in _FILLER and w not in _BRAND_WORDS and len(w) > 2 for w in words]
+    for i, w in enumerate(words):
+        if not keep[i]:
+            continue
+        terms.add(_as_tag(w))
+        if i + 1 < len(words) and keep[i + 1]:
+            terms.add(_as_tag(f"{w} {words[i + 1]}"))
+    return explicit, terms - explicit
+
+
+class DecayedCountMin:
+    """
+    Count-min sketch whose counts halve every `half_life` seconds. Counts
+    are stored scaled by 2^(t / half_life) so decay costs nothing per
+    update; the scale is folded back in before it overflows.
+    """
+
+    def __init__(self, half_life: float, width: int = 2048, depth: int = 4):
+        self.half_life = half_life
+        self.width = width
+        self.depth = depth
+        self.rows = [array("d", bytes(8 * width)) for _ in range(depth)]
+        self.total = 0.0
+        self.origin = time.time()
+
+    def _scale(self, now: float) -> float:
+        exponent = (now - self.origin) / self.half_life
+        if exponent > 60:
+            self._rebase(now)
+            exponent = 0.0
+        return 2.0 ** exponent
+
+    def _rebase(self, now: float) -> None:
+        factor = 2.0 ** -((now - self.origin) / self.half_life)
+        for row in self.rows:
+            for j in range(self.width):
+                row[j] *= factor
+        self.total *= factor
+        self.origin = now
+
+    def _cells(self, term: str) -> list[int]:
+        digest = hashlib.blake2b(term.encode(), digest_size=8).digest()
+        h1 = int.from_bytes(digest[:4], "little")
+        h2 = int.from_bytes(digest[4:], "little") | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add(self, term: str, now: float, weight: float = 1.0) -> None:
+        w = weight * self._scale(now)
+        for row, j in zip(self.rows, self._cells(term)):
+            row[j] += w
+        self.total += w
+
+    def estimate(self, term: str, now: float) -> float:
+        raw = min(row[j] for row, j in zip(self.rows, self._cells(term)))
+        return raw / self._scale(now)
+
+    def size(self, now: float) -> float:
+        """Decayed total of everything added."""
+        return self.total / self._scale(now)
+
+
+class SpaceSaving:
+    """
+    Space-saving heavy hitters over scaled (decayed) weights: at most
+    `capacity` terms; a new term evicts the smallest and inherits its
+    count as the error bound.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts: dict[str, float] = {}
+        self._heap: list[tuple[float, str]] = []
+
+    def add(self, term: str, weight: float) -> None:
+        if term in self.counts:
+            self.counts[term] += weight
+            heapq.heappush(self._heap, (self.counts[term], term))
+        elif len(self.counts) < self.capacity:
+            self.counts[term] = weight
+            heapq.heappush(self._heap, (weight, term))
+        else:
+            # Pop stale heap entries until the top is a live minimum
+            while True:
+                count, victim = heapq.heappop(self._heap)
+                if self.counts.get(victim) == count:
+                    break
+            del self.counts[victim]
+            self.counts[term] = count + weight
+            heapq.heappush(self._heap, (self.counts[term], term))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c, t) for t, c in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def rescale(self, factor: float) -> None:
+        self.counts = {t: c * factor for t, c in self.counts.items()}
+        self._heap = [(c, t) for t, c in self.counts.items()]
+        heapq.heapify(self._heap)
+
+
+class BurstDetector:
+    def __init__(
+        self,
+        short_half_life_hours: float = TRENDS_SHORT_HALF_LIFE_HOURS,
+        long_half_life_hours: float = TRENDS_LONG_HALF_LIFE_HOURS,
+        capacity: int = TRENDS_CAPACITY,
+        min_count: float = TRENDS_MIN_COUNT,
+        burst_ratio: float = TRENDS_BURST_RATIO,
+    ):
+        self.short = DecayedCountMin(short_half_life_hours * 3600)
+        self.long = DecayedCountMin(long_half_life_hours * 3600)
+        self.heavy = SpaceSaving(capacity)
+        self.min_count = min_count
+        self.burst_ratio = burst_ratio
+        self.mentions = 0
+        # Which tracked terms were written as hashtags or domain topics
+        self._explicit: set[str] = set()
+        self._seen: OrderedDict[str, None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _when(m: dict, default: float) -> float:
+        created = m.get("created_at")
+        if not created:
+            return default
+        try:
+            dt = datetime.fromisoformat(created)
+        except ValueError:
+            return default
+        return dt.timestamp()
+
+    def observe(self, mentions: list[dict], now: float | None = None) -> None:
+        """Count mentions not observed before (every cycle re-scrapes the same posts)."""
+        now = now or time.time()
+        with self._lock:
+            for m in mentions:
+                key = mention_key(m)
+                if key in self._seen:
+                    continue
+                self._seen[key] = None
+                if len(self._seen) > _MAX_SEEN:
+                    self._seen.popitem(last=False)
+                t = self._when(m, now)
+                explicit, derived = mention_terms(m)
+                self._explicit |= explicit
+                for term in explicit | derived:
+                    origin = self.short.origin
+                    self.short.add(term, t)
+                    self.long.add(term, t)
+                    if self.short.origin != origin:
+                        # The short sketch re-based: bring the summary along
+                        self.heavy.rescale(2.0 ** -((self.short.origin - origin) / self.short.half_life))
+                    # Same scaled units as the short sketch
+                    self.heavy.add(term, 2.0 ** ((t - self.short.origin) / self.short.half_life))
+                self.mentions += 1
+            self._explicit &= self.heavy.counts.keys()
+
+    def burst(self, term: str, now: float) -> tuple[float, float]:
+        """(recent decayed count, short-vs-long share ratio) for one term."""
+        short = self.short.estimate(term, now)
+        short_size = self.short.size(now)
+        long_size = self.long.size(now)
+        if short_size <= 0 or long_size <= 0:
+            return short, 1.0
+        expected = self.long.estimate(term, now) / long_size * short_size
+        # +1 smoothing so a handful of brand-new mentions can't look infinite
+        return short, (short + 1) / (expected + 1)
+
+    @timed("leappulse_aggregate_seconds", stage="burst_topics")
+    def top(self, n: int = 8, now: float | None = None) -> list[dict]:
+        """Trending topics in the dashboard's {tag, mentions, trend} shape."""
+        now = now or time.time()
+        with self._lock:
+            scored = []
+            for term in self.heavy.counts:
+                count, ratio = self.burst(term, now)
+                if count < self.min_count:
+                    continue
+                # Bursting topics first, then by recent volume weighted by burst
+                scored.append((ratio >= self.burst_ratio, count * max(ratio, 0.5), term, count, ratio))
+        scored.sort(reverse=True)
+
+        out: list[dict] = []
+        for _, _, term, count, ratio in scored:
+            # Bursts moving in lockstep with one already listed come from
+            # the same posts ("#gre", "#waiver", "#grewaiver"): keep one,
+            # preferring what people actually wrote as a hashtag
+            twin = next(
+                (o for o in out
+                 if ratio >= self.burst_ratio and o["_ratio"] >= self.burst_ratio
+                 and abs(count - o["_count"]) <= 0.1 * o["_count"] and abs(ratio - o["_ratio"]) <= 0.1 * o["_ratio"]),
+                None,
+            )
+            # A word that mostly appears inside a phrase already listed adds nothing
+            if twin is None and any(term != o["tag"] and term in o["tag"] and count <= o["_count"] * 1.25 for o in out):
+                continue
+            if twin is not None:
+                if term in self._explicit and twin["tag"] not in self._explicit:
+                    twin["tag"] = term
+                continue
+            if ratio >= self.burst_ratio:
+                trend = "up"
+            elif ratio <= 1 / self.burst_ratio:
+                trend = "down"
+            else:
+                trend = "stable"
+            out.append({
+                "tag": term,
+                "mentions": max(1, round(count)),
+                "trend": trend,
+                "_count": count,
+                "_ratio": ratio,
+            })
+            if len(out) == n:
+                break
+        for o in out:
+            del o["_count"], o["_ratio"]
+        return out
+
+    def status(self, limit: int = 25) -> dict:
+        """Heaviest recent candidates with their burst ratios, for /api/trends."""
+        now = time.time()
+        with self._lock:
+            rows = [(term, *self.burst(term, now)) for term in self.heavy.counts]
+        rows.sort(key=lambda r: r[1], reverse=True)
+        return {
+            "mentions_observed": self.mentions,
+            "tracked_terms": len(self.heavy.counts),
+            "capacity": self.heavy.capacity,
+            "candidates": [
+                {"tag": t, "recent": round(c, 2), "burst": round(r, 2)} for t, c, r in rows[:limit]
+            ],
+        }
+
+
+_detector: BurstDetector | None = None
+_detector_lock = threading.Lock()
+
+
+def get_detector() -> BurstDetector:
+    global _detector
+    with _detector_lock:
+        if _detector is None:
+            _detector = BurstDetector()
+        return _detector
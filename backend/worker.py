@@ -0,0 +1,191 @@
+"""
+LeapPulse — Scrape workers
+Runs scraping outside the API process, spread over as many processes
+(and cores) as you like:
+
+  dispatcher  every SCRAPE_INTERVAL (or when the API forwards a refresh)
+              enqueues one job per source × query into the durable queue;
+              once every job of a cycle has finished it publishes the
+              cycle — database, search index and the snapshot file the
+              API serves. It also owns the alert bus: workers offer
+              CRITICAL / GOLD mentions through the queue, the dispatcher
+              dedupes, rate-limits and sends webhooks, and records what
+              it published for the API's /api/alerts
+  workers     processes that claim jobs from the queue and run them
+              through the pipeline in parallel
+
+Every process reports its breaker states and metrics into the queue
+file, which the API merges into /api/health and /metrics.
+
+Usage:
+  python worker.py                     # dispatcher + SCRAPE_WORKERS workers
+  python worker.py --workers 8
+  python worker.py --role workers      # extra workers on the same queue file
+
+Run the API with SCRAPE_MODE=workers so it never scrapes itself.
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import socket
+import sys
+import time
+
+from config import BRAND_NAME, SCRAPE_INTERVAL, SCRAPE_WORKERS
+from jobqueue import JobQueue
+from keys import mention_key
+
+_POLL_SECONDS = 1.0
+# How often an idle process refreshes its breaker / metrics report
+_REPORT_SECONDS = 10.0
+
+
+def _report(queue: JobQueue, name: str, role: str) -> None:
+    """Publish this process's breakers and metrics for the API's /api/health and /metrics."""
+    import metrics
+    from scrapers.breaker import snapshot as breaker_status
+
+    try:
+        queue.report_process(name, role, breaker_status(), metrics.export())
+    except Exception as e:
+        print(f"[{role}] ✗ Could not report state: {e}")
+
+
+def run_worker(index: int) -> None:
+    """Claim and run jobs until killed."""
+    import alerts
+    from pipeline import run_job
+
+    queue = JobQueue()
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    # Alerts are rate-limited and delivered once, by the dispatcher
+    alerts.set_relay(queue.offer_alert)
+    print(f"[worker {index}] {worker_id} ready")
+    reported = 0.0
+    while True:
+        job = queue.claim(worker_id)
+        if job is None:
+            if time.monotonic() - reported >= _REPORT_SECONDS:
+                _report(queue, worker_id, "worker")
+                reported = time.monotonic()
+            time.sleep(_POLL_SECONDS)
+            continue
+        try:
+            mentions = run_job(job["source"], job["job"], BRAND_NAME)
+        except Exception as e:
+            queue.fail(job, str(e))
+            print(f"[worker {index}] ✗ {job['source']} {job['job']}: {e}")
+        else:
+            queue.complete(job, mentions)
+            print(f"[worker {index}] ✓ {job['source']} {job['job']}: {len(mentions)} mentions")
+        _report(queue, worker_id, "worker")
+        reported = time.monotonic()
+
+
+def enqueue_cycle(queue: JobQueue, sources) -> str:
+    jobs = [(s.name, job) for s in sources for job in s.jobs(BRAND_NAME)]
+    cycle_id = queue.enqueue_cycle(jobs)
+    print(f"\n[dispatcher] Cycle {cycle_id}: {len(jobs)} jobs queued")
+    return cycle_id
+
+
+def publish(queue: JobQueue, cycle_id: str, sources=()) -> None:
+    from main import publish_cycle
+    from snapshot import mark_source
+
+    results = queue.cycle_results(cycle_id)
+    jobs = queue.source_status(cycle_id)
+    for s in sources:
+        # Jobs only finish "done" when their fetch worked (pipeline.JobError
+        # otherwise), so a source with none done had every job fail
+        status = "fresh" if jobs.get(s.name, {}).get("done") else "failed"
+        mark_source(s.name, s.label, status, len(results.get(s.name, [])))
+    seen: set[str] = set()
+    all_mentions: list[dict] = []
+    for source, mentions in results.items():
+        # Jobs of one source can overlap (e.g. global search vs subreddit)
+        fresh = 0
+        for m in mentions:
+            key = mention_key(m)
+            if key not in seen:
+                seen.add(key)
+                all_mentions.append(m)
+                fresh += 1
+        print(f"  ✓ {source}: {fresh} mentions")
+
+    status = queue.cycle_status(cycle_id)
+    if status.get("failed"):
+        print(f"  ⚠ {status['failed']} job(s) failed after retries")
+    publish_cycle(all_mentions)
+    queue.mark_published(cycle_id)
+
+
+def relay_alerts(queue: JobQueue, bus) -> None:
+    """Run the workers' offered mentions through the alert bus; keep what it published."""
+    for mention in queue.take_alert_offers():
+        alert = bus.publish(mention)
+        if alert is not None:
+            queue.add_alert(alert)
+
+
+def run_dispatcher(interval_seconds: float) -> None:
+    import alerts
+    from scrapers.registry import all_sources
+    from snapshot import SnapshotStore
+
+    queue = JobQueue()
+    snapshots = SnapshotStore()
+    sources = all_sources()
+    bus = alerts.get_bus()
+    bus.start()
+    name = f"{socket.gethostname()}:{os.getpid()}"
+    next_cycle = 0.0
+    reported = 0.0
+    while True:
+        try:
+            relay_alerts(queue, bus)
+        except Exception as e:
+            print(f"[dispatcher] ✗ Alert relay failed: {e}")
+        if time.monotonic() - reported >= _REPORT_SECONDS:
+            _report(queue, name, "dispatcher")
+            reported = time.monotonic()
+        cycle_id = queue.open_cycle()
+        if cycle_id is None:
+            if time.time() >= next_cycle or snapshots.take_refresh_request():
+                enqueue_cycle(queue, sources)
+                next_cycle = time.time() + interval_seconds
+        elif queue.cycle_finished(cycle_id):
+            publish(queue, cycle_id, sources)
+            queue.prune()
+        time.sleep(_POLL_SECONDS)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="LeapPulse scrape workers")
+    parser.add_argument("--workers", type=int, default=SCRAPE_WORKERS)
+    parser.add_argument("--role", choices=["all", "dispatcher", "workers"], default="all")
+    parser.add_argument("--interval", type=float, default=SCRAPE_INTERVAL, help="minutes between cycles")
+    args = parser.parse_args(argv)
+
+    procs: list[mp.Process] = []
+    if args.role in ("all", "workers"):
+        for i in range(args.workers):
+            p = mp.Process(target=run_worker, args=(i,), name=f"scrape-worker-{i}", daemon=True)
+            p.start()
+            procs.append(p)
+    try:
+        if args.role in ("all", "dispatcher"):
+            run_dispatcher(args.interval * 60)
+        else:
+            for p in procs:
+                p.join()
+    except KeyboardInterrupt:
+        print("\nStopping workers...")
+    finally:
+        for p in procs:
+            p.terminate()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
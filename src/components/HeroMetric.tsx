@@ -187,8 +187,8 @@ export default function HeroMetric({
       />
       <StatCard
         label="Avg. Engagement"
-        value={`${avgEngagement}K`}
-        sub="Per mention"
+        value={avgEngagement >= 1 ? `${avgEngagement.toFixed(1)}K` : Math.round(avgEngagement * 1000).toLocaleString()}
+        sub="Median per mention"
         icon={<Users className="h-5 w-5 text-violet-400" />}
         accent="bg-violet-500/15"
       />